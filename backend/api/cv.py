@@ -1,39 +1,97 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+from typing import BinaryIO
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 
-from backend.database import get_db
-from backend.models.db_models import CV, CVSection, Report
-from backend.models.schemas import CVUploadResponse, CVDetailResponse, CVSectionOut, CVAnalysisResponse
-from backend.services.parser import extract_text
+from backend.config import settings
+from backend.database import AsyncSessionLocal, ReadSessionLocal, get_db, get_read_db
+from backend.models.db_models import CV, CVSection, JobDescription, Report
+from backend.models.schemas import (
+    CVUploadResponse, CVDetailResponse, CVSectionOut, CVSectionsResponse, CVSectionsUpdate, CVAnalysisResponse,
+    JobMatch, JobResponse, TopJobsResponse,
+)
+from backend.api.jobs import job_accepted
+from backend.services.extraction_pool import extraction_pool, ExtractionQueueFull, ExtractionTimeout
 from backend.services.segmenter import segment_cv
-from backend.services.cv_analyzer import analyze_cv
-from backend.utils.file_utils import save_upload, delete_file
+from backend.services.batch_ingest import ingest, iter_zip
+from backend.services.candidate_index import candidate_index
+from backend.services.job_index import job_index
+from backend.services.job_queue import PRIORITY_BULK, job_queue
+from backend.services.semantic_index import semantic_index
+from backend.services.skill_matcher import cv_terms, match_terms
+from backend.services.cv_analyzer import analysis_fingerprint, analyze_cv, analyze_cv_stream, parse_analysis
+from backend.services.json_stream import JSONItemStream
+from backend.services import repository
+from backend.services.report_cache import report_cache
+from backend.utils.file_utils import CHUNK_SIZE, save_upload, settle_file, delete_file
+from backend.utils.json_codec import model_response
+from backend.utils.sse import format_sse, sse_response, stream_json_events
 
 router = APIRouter(prefix="/api/cv", tags=["cv"])
 
 
-@router.post("/upload", response_model=CVUploadResponse)
-async def upload_cv(
-    file: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db),
-):
-    # Save file to disk (validation happens inside save_upload)
-    file_path = await save_upload(file)
+async def _clone_existing_cv(
+    content_hash: str, file_path: str, db: AsyncSession
+) -> tuple[CV, dict[str, str]] | None:
+    """
+    Reuse the extracted text of a previous upload with identical bytes instead
+    of re-extracting. Sections are segmented again: the earlier CV's may have
+    been edited (PUT /sections).
+    """
+    raw_text = await db.scalar(
+        select(CV.raw_text).where(CV.content_hash == content_hash).order_by(CV.id).limit(1)
+    )
+    if raw_text is None:
+        return None
+
+    sections = segment_cv(raw_text)
+    cv = CV(file_path=file_path, raw_text=raw_text, content_hash=content_hash)
+    db.add(cv)
+    await db.flush()
+    db.add_all(CVSection(cv_id=cv.id, section_name=name, content=content) for name, content in sections.items())
+    return cv, sections
+
+
+async def _index_cvs(cvs: dict[int, dict[str, str]]) -> None:
+    """Add committed CVs to the search indexes."""
+    for cv_id, sections in cvs.items():
+        candidate_index.add(cv_id, sections)
+    await semantic_index.add_cvs(cvs)
+
+
+async def _store_cv(file_path: str, content_hash: str, db: AsyncSession) -> CVUploadResponse:
+    """Parse a saved upload into a CV row and its sections; the caller indexes it."""
+    cloned = await _clone_existing_cv(content_hash, file_path, db)
+    if cloned is not None:
+        cv, _ = cloned
+        await db.commit()
+        return CVUploadResponse(cv_id=cv.id, message="CV uploaded. Reused the parse of an identical file.")
 
     try:
-        raw_text = extract_text(file_path)
+        raw_text = await extraction_pool.extract(file_path)
+    except ExtractionQueueFull:
+        raise HTTPException(status_code=503, detail="Text extraction is busy. Please retry shortly.")
+    except ExtractionTimeout:
+        raise HTTPException(status_code=422, detail="Text extraction timed out.")
     except Exception as e:
-        delete_file(file_path)
         raise HTTPException(status_code=422, detail=f"Could not extract text: {e}")
 
     if not raw_text.strip():
-        delete_file(file_path)
         raise HTTPException(status_code=422, detail="Extracted text is empty. Is the file a scanned image?")
 
     sections = segment_cv(raw_text)
 
-    cv = CV(file_path=file_path, raw_text=raw_text)
+    cv = CV(file_path=file_path, raw_text=raw_text, content_hash=content_hash)
     db.add(cv)
     await db.flush()
 
@@ -41,24 +99,130 @@ async def upload_cv(
         db.add(CVSection(cv_id=cv.id, section_name=name, content=content))
 
     await db.commit()
-    await db.refresh(cv)
-
     return CVUploadResponse(cv_id=cv.id, message="CV uploaded and parsed successfully.")
 
 
-@router.get("/{cv_id}", response_model=CVDetailResponse)
-async def get_cv(cv_id: int, db: AsyncSession = Depends(get_db)):
-    cv = await db.get(CV, cv_id)
+async def _index_uploaded_cv(payload: dict, result: dict | None) -> None:
+    async with ReadSessionLocal() as db:
+        sections = await _analysis_input(result["cv_id"], db)
+    await _index_cvs({result["cv_id"]: sections})
+
+
+async def _upload_failed(payload: dict, error: str, db: AsyncSession) -> None:
+    await repository.release_file(db, payload["file_path"])
+
+
+@job_queue.handler(
+    "cv_upload",
+    on_failure=_upload_failed,
+    on_success=_index_uploaded_cv,
+    no_retry="The uploaded file was deleted when the job failed; upload the CV again",
+)
+async def _upload_job(payload: dict, db: AsyncSession) -> dict:
+    return (await _store_cv(payload["file_path"], payload["content_hash"], db)).model_dump()
+
+
+@router.post("/upload", response_model=CVUploadResponse, responses={202: {"model": JobResponse}})
+async def upload_cv(
+    file: UploadFile = File(...),
+    run_async: bool = Query(False, alias="async", description="Save the file, queue a cv_upload job and return 202"),
+    idempotency_key: str | None = Header(None, max_length=200),
+    db: AsyncSession = Depends(get_db),
+):
+    # Save file to disk (validation happens inside save_upload); held until a row refers to it
+    file_path, content_hash = await save_upload(file)
+    try:
+        if run_async:
+            job = await job_queue.enqueue(
+                db, "cv_upload", {"file_path": file_path, "content_hash": content_hash}, idempotency_key
+            )
+        else:
+            response = await _store_cv(file_path, content_hash, db)
+    except Exception:
+        await db.rollback()
+        settle_file(file_path)
+        await repository.release_file(db, file_path)
+        raise
+    settle_file(file_path)
+
+    if run_async:
+        if job.payload["file_path"] != file_path:
+            # Idempotency-Key of an earlier upload: that job has its own file
+            await repository.release_file(db, file_path)
+        return job_accepted(job)
+    await _index_cvs({response.cv_id: await _analysis_input(response.cv_id, db)})
+    return response
+
+
+def _open_archive(source: BinaryIO) -> tuple[str, zipfile.ZipFile]:
+    """Copy an uploaded zip to a temp file and open it (blocking)."""
+    fd, archive_path = tempfile.mkstemp(suffix=".zip")
+    with os.fdopen(fd, "wb") as out:
+        shutil.copyfileobj(source, out, CHUNK_SIZE)
+    try:
+        return archive_path, zipfile.ZipFile(archive_path)
+    except zipfile.BadZipFile:
+        delete_file(archive_path)
+        raise
+
+
+@router.post("/batch")
+async def batch_upload_cvs(file: UploadFile = File(...)):
+    """Ingest a zip of CVs; progress and per-file errors are streamed as NDJSON."""
+    if not file.filename.lower().endswith(".zip"):
+        raise HTTPException(status_code=400, detail="Batch upload expects a .zip archive")
+    if file.size is not None and file.size > settings.max_batch_size_mb * 1024 * 1024:
+        raise HTTPException(status_code=400, detail=f"Archive too large. Max {settings.max_batch_size_mb} MB allowed.")
+
+    # Archives run to gigabytes: copy and open them off the event loop
+    try:
+        archive_path, archive = await asyncio.to_thread(_open_archive, file.file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="File is not a valid zip archive")
+
+    async def events():
+        try:
+            async for event in ingest(
+                iter_zip(archive), extraction_pool, settings.batch_insert_size, on_insert=_index_cvs
+            ):
+                yield json.dumps(event) + "\n"
+        finally:
+            archive.close()
+            await asyncio.to_thread(delete_file, archive_path)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+CV_FIELDS = ("raw_text", "sections")
+
+
+@router.get("/{cv_id}", response_model=CVDetailResponse, response_model_exclude_none=True)
+async def get_cv(
+    cv_id: int,
+    fields: str | None = Query(None, description="Comma-separated fields to return: raw_text, sections"),
+    include_raw: bool = Query(True, description="False leaves out raw_text (it repeats the sections)"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    wanted = set(CV_FIELDS) if fields is None else {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = wanted - set(CV_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown))}; allowed: {', '.join(CV_FIELDS)}"
+        )
+    if not include_raw:
+        wanted.discard("raw_text")
+
+    cv = await repository.cv_with_sections(db, cv_id, raw_text="raw_text" in wanted, sections="sections" in wanted)
     if not cv:
         raise HTTPException(status_code=404, detail="CV not found")
 
-    result = await db.execute(select(CVSection).where(CVSection.cv_id == cv_id))
-    sections = result.scalars().all()
-
     return CVDetailResponse(
         cv_id=cv.id,
-        raw_text=cv.raw_text,
-        sections=[CVSectionOut(section_name=s.section_name, content=s.content) for s in sections],
+        raw_text=cv.raw_text if "raw_text" in wanted else None,
+        sections=(
+            [CVSectionOut(section_name=s.section_name, content=s.content) for s in cv.sections]
+            if "sections" in wanted else None
+        ),
     )
 
 
@@ -67,24 +231,107 @@ async def delete_cv(cv_id: int, db: AsyncSession = Depends(get_db)):
     cv = await db.get(CV, cv_id)
     if not cv:
         raise HTTPException(status_code=404, detail="CV not found")
-    delete_file(cv.file_path)
     await db.delete(cv)
+    # SQLite may give the id to the next CV, which must not inherit these reports
+    await db.execute(delete(Report).where(Report.entity_type.in_(("cv", "match")), Report.entity_id == cv_id))
     await db.commit()
+    candidate_index.remove(cv_id)
+    semantic_index.remove_cv(cv_id)
+    await repository.release_file(db, cv.file_path)
     return {"message": "CV deleted successfully"}
 
 
-@router.post("/{cv_id}/analyze", response_model=CVAnalysisResponse)
-async def analyze_cv_endpoint(cv_id: int, db: AsyncSession = Depends(get_db)):
-    cv = await db.get(CV, cv_id)
-    if not cv:
+async def _analysis_input(cv_id: int, db: AsyncSession) -> dict[str, str]:
+    sections = await repository.cv_sections(db, cv_id)
+    if sections is None:
         raise HTTPException(status_code=404, detail="CV not found")
+    return sections
+
+
+async def _replace_sections(cv_id: int, sections: dict[str, str], db: AsyncSession) -> CVSectionsResponse:
+    """Store new sections, stop reusing reports made from the old ones, reindex."""
+    await db.execute(delete(CVSection).where(CVSection.cv_id == cv_id))
+    await db.execute(
+        insert(CVSection), [{"cv_id": cv_id, "section_name": name, "content": c} for name, c in sections.items()]
+    )
+    invalidated = await report_cache.invalidate(db, cv_id)
+    await db.commit()
+    await _index_cvs({cv_id: sections})
+    return CVSectionsResponse(
+        cv_id=cv_id,
+        sections=[CVSectionOut(section_name=name, content=content) for name, content in sections.items()],
+        invalidated_reports=invalidated,
+    )
+
+
+@router.put("/{cv_id}/sections", response_model=CVSectionsResponse)
+async def update_sections(cv_id: int, req: CVSectionsUpdate, db: AsyncSession = Depends(get_db)):
+    """Replace the sections of a CV (manual edits); raw_text keeps the extracted text."""
+    if not req.sections:
+        raise HTTPException(status_code=400, detail="Sections cannot be empty")
+    sections = {s.section_name: s.content for s in req.sections}
+    if len(sections) < len(req.sections):
+        raise HTTPException(status_code=422, detail="Duplicate section names")
+    if not await repository.exists(db, CV, cv_id):
+        raise HTTPException(status_code=404, detail="CV not found")
+    return await _replace_sections(cv_id, sections, db)
+
+
+@router.post("/{cv_id}/resegment", response_model=CVSectionsResponse)
+async def resegment_cv(cv_id: int, db: AsyncSession = Depends(get_db)):
+    """Split raw_text into sections again, e.g. after segmenter changes; manual edits are lost."""
+    raw_text = await db.scalar(select(CV.raw_text).where(CV.id == cv_id))
+    if raw_text is None:
+        raise HTTPException(status_code=404, detail="CV not found")
+    return await _replace_sections(cv_id, segment_cv(raw_text), db)
+
 
-    result = await db.execute(select(CVSection).where(CVSection.cv_id == cv_id))
-    sections = result.scalars().all()
-    sections_dict = {s.section_name: s.content for s in sections}
+JD_EXCERPT_CHARS = 200
 
-    if not sections_dict:
-        sections_dict = {"full_cv": cv.raw_text}
+
+@router.get("/{cv_id}/top-jobs", response_model=TopJobsResponse)
+async def top_jobs(
+    cv_id: int,
+    k: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Stored JDs ranked by how much of their hard skills and keywords the CV covers; no LLM call."""
+    sections_dict = await _analysis_input(cv_id, db)
+
+    started = time.perf_counter()
+    page, total = job_index.search(sections_dict, k, offset, created_after, created_before)
+    took_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    jds = {}
+    if page:
+        result = await db.execute(select(JobDescription).where(JobDescription.id.in_([jd_id for jd_id, _ in page])))
+        jds = {jd.id: jd for jd in result.scalars().all()}
+    terms = cv_terms(sections_dict)
+    jobs = []
+    for jd_id, score in page:
+        jd = jds.get(jd_id)
+        if jd is None:
+            continue
+        overlap = match_terms(terms, jd.extracted_requirements or {})
+        jobs.append(JobMatch(
+            jd_id=jd_id,
+            score=round(score * 100),
+            created_at=jd.created_at,
+            excerpt=" ".join(jd.text.split())[:JD_EXCERPT_CHARS],
+            matched_skills=overlap["matched_skills"],
+            missing_skills=overlap["missing_skills"],
+        ))
+    return TopJobsResponse(cv_id=cv_id, total=total, offset=offset, took_ms=took_ms, jobs=jobs)
+
+
+async def _run_analysis(
+    cv_id: int, db: AsyncSession, sections_dict: dict[str, str] | None = None
+) -> tuple[dict, Report]:
+    if sections_dict is None:
+        sections_dict = await _analysis_input(cv_id, db)
 
     analysis = await analyze_cv(sections_dict)
 
@@ -92,8 +339,76 @@ async def analyze_cv_endpoint(cv_id: int, db: AsyncSession = Depends(get_db)):
         entity_type="cv",
         entity_id=cv_id,
         report_json=analysis,
+        input_fingerprint=analysis_fingerprint(sections_dict),
     )
     db.add(report)
     await db.commit()
+    return analysis, report
+
+
+@job_queue.handler("cv_analysis", priority=PRIORITY_BULK)
+async def _analysis_job(payload: dict, db: AsyncSession) -> dict:
+    analysis, report = await _run_analysis(payload["cv_id"], db)
+    return {"cv_id": payload["cv_id"], "report_id": report.id, **analysis}
+
+
+@router.post("/{cv_id}/analyze", response_model=CVAnalysisResponse, responses={202: {"model": JobResponse}})
+async def analyze_cv_endpoint(
+    cv_id: int,
+    run_async: bool = Query(False, alias="async", description="Queue a cv_analysis job and return 202"),
+    reuse: bool = Query(True, description="Return the stored analysis of the same sections, prompt and model"),
+    idempotency_key: str | None = Header(None, max_length=200),
+    db: AsyncSession = Depends(get_db),
+):
+    sections_dict = None
+    if reuse:
+        sections_dict = await _analysis_input(cv_id, db)
+        report = await report_cache.lookup(db, "cv", cv_id, analysis_fingerprint(sections_dict))
+        if report:
+            return model_response(
+                CVAnalysisResponse(cv_id=cv_id, report_id=report.id, reused=True, **report.report_json)
+            )
+
+    if run_async:
+        if sections_dict is None and not await repository.exists(db, CV, cv_id):
+            raise HTTPException(status_code=404, detail="CV not found")
+        job = await job_queue.enqueue(db, "cv_analysis", {"cv_id": cv_id}, idempotency_key)
+        return job_accepted(job)
+
+    analysis, report = await _run_analysis(cv_id, db, sections_dict)
+    return model_response(CVAnalysisResponse(cv_id=cv_id, report_id=report.id, **analysis))
+
+
+@router.post("/{cv_id}/analyze/stream")
+async def analyze_cv_stream_endpoint(
+    cv_id: int,
+    reuse: bool = Query(True, description="Send the stored analysis of the same inputs as a single done event"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Same analysis as /analyze as server-sent events: token, item, done (with report_id) or error."""
+    sections_dict = await _analysis_input(cv_id, db)
+    input_fingerprint = analysis_fingerprint(sections_dict)
+    cached = await report_cache.lookup(db, "cv", cv_id, input_fingerprint) if reuse else None
+
+    async def events():
+        if cached:
+            yield format_sse("done", {"report_id": cached.id, "cv_id": cv_id, "reused": True, **cached.report_json})
+            return
+        parser = JSONItemStream()
+        try:
+            async for chunk in stream_json_events(analyze_cv_stream(sections_dict), parser):
+                yield chunk
+            analysis = parse_analysis(parser.text)
+            # The request's session is closed once the response starts streaming
+            async with AsyncSessionLocal() as session:
+                report = Report(
+                    entity_type="cv", entity_id=cv_id, report_json=analysis, input_fingerprint=input_fingerprint
+                )
+                session.add(report)
+                await session.commit()
+        except Exception as e:
+            yield format_sse("error", {"detail": f"Analysis failed: {e}"})
+            return
+        yield format_sse("done", {"report_id": report.id, "cv_id": cv_id, **analysis})
 
-    return CVAnalysisResponse(cv_id=cv_id, **analysis)
+    return sse_response(events())
@@ -1,40 +1,59 @@
+import asyncio
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from backend.database import get_db
-from backend.models.db_models import CV, CVSection, JobDescription, Interview, Message, Report
+from backend.database import AsyncSessionLocal, get_db, get_read_db
+from backend.models.db_models import AnswerEvaluation, CV, JobDescription, Interview, Message, Report
 from backend.models.schemas import (
     InterviewStartRequest,
     InterviewStartResponse,
     InterviewMessageRequest,
     InterviewMessageResponse,
+    InterviewMessageOut,
+    InterviewStateResponse,
     InterviewFinishResponse,
+    InterviewFeedbackItem,
+    InterviewFeedbackResponse,
+    JobResponse,
 )
+from backend.api.jobs import job_accepted
 from backend.services.interview_service import (
     generate_interview_plan,
     evaluate_answer,
     generate_final_report,
+    generate_final_report_stream,
+    parse_final_report,
 )
+from backend.services.interview_scoring import (
+    build_report_summary,
+    record_evaluation,
+)
+from backend.services.feedback_pipeline import (
+    FEEDBACK_PREFIX,
+    PENDING_FEEDBACK,
+    feedback_pipeline,
+    load_messages,
+)
+from backend.services.job_queue import PRIORITY_INTERACTIVE, job_queue
+from backend.services.json_stream import JSONItemStream
+from backend.services import repository
+from backend.utils.sse import format_sse, sse_response, stream_json_events
+from backend.utils.json_codec import model_response
 
 router = APIRouter(prefix="/api/interview", tags=["interview"])
 
 
 async def _get_cv_sections(cv_id: int, db: AsyncSession) -> dict[str, str]:
-    cv = await db.get(CV, cv_id)
-    if not cv:
+    sections = await repository.cv_sections(db, cv_id)
+    if sections is None:
         raise HTTPException(status_code=404, detail="CV not found")
-    result = await db.execute(select(CVSection).where(CVSection.cv_id == cv_id))
-    sections = result.scalars().all()
-    if sections:
-        return {s.section_name: s.content for s in sections}
-    return {"full_cv": cv.raw_text}
+    return sections
 
 
-@router.post("/start", response_model=InterviewStartResponse)
-async def start_interview(req: InterviewStartRequest, db: AsyncSession = Depends(get_db)):
+async def _start(req: InterviewStartRequest, db: AsyncSession) -> InterviewStartResponse:
     cv_sections = await _get_cv_sections(req.cv_id, db)
 
     jd_text = None
@@ -71,7 +90,6 @@ async def start_interview(req: InterviewStartRequest, db: AsyncSession = Depends
     db.add(Message(interview_id=interview.id, role="assistant", text=first_q))
 
     await db.commit()
-    await db.refresh(interview)
 
     return InterviewStartResponse(
         session_id=interview.id,
@@ -81,31 +99,61 @@ async def start_interview(req: InterviewStartRequest, db: AsyncSession = Depends
     )
 
 
-@router.post("/{session_id}/message", response_model=InterviewMessageResponse)
-async def send_message(
-    session_id: int,
-    req: InterviewMessageRequest,
+@job_queue.handler("interview_start", priority=PRIORITY_INTERACTIVE)
+async def _start_job(payload: dict, db: AsyncSession) -> dict:
+    return (await _start(InterviewStartRequest(**payload), db)).model_dump()
+
+
+@router.post("/start", response_model=InterviewStartResponse, responses={202: {"model": JobResponse}})
+async def start_interview(
+    req: InterviewStartRequest,
+    run_async: bool = Query(False, alias="async", description="Queue an interview_start job and return 202"),
+    idempotency_key: str | None = Header(None, max_length=200),
     db: AsyncSession = Depends(get_db),
 ):
+    if run_async:
+        if not await repository.exists(db, CV, req.cv_id):
+            raise HTTPException(status_code=404, detail="CV not found")
+        if req.jd_id and not await repository.exists(db, JobDescription, req.jd_id):
+            raise HTTPException(status_code=404, detail="Job description not found")
+        job = await job_queue.enqueue(db, "interview_start", req.model_dump(), idempotency_key)
+        return job_accepted(job)
+
+    return await _start(req, db)
+
+
+async def _answer(
+    session_id: int, answer: str, pipelined: bool, db: AsyncSession, question_index: int | None = None
+) -> InterviewMessageResponse:
     interview = await db.get(Interview, session_id)
     if not interview:
         raise HTTPException(status_code=404, detail="Interview session not found")
     if interview.status == "finished":
         raise HTTPException(status_code=400, detail="Interview is already finished")
+    # A queued answer is for the question that was current when it was submitted
+    if question_index is not None and interview.current_question_index != question_index:
+        raise HTTPException(status_code=409, detail="This question has already been answered")
 
     questions = interview.plan.get("questions", [])
     current_idx = interview.current_question_index
     current_question = questions[current_idx]["text"]
 
     # Store user answer
-    db.add(Message(interview_id=session_id, role="user", text=req.answer))
-
-    # Evaluate the answer
-    eval_result = await evaluate_answer(current_question, req.answer)
-    feedback = eval_result["feedback"]
-
-    # Store feedback message
-    db.add(Message(interview_id=session_id, role="assistant", text=f"[Feedback] {feedback}"))
+    db.add(Message(interview_id=session_id, role="user", text=answer))
+
+    if pipelined:
+        # Placeholder keeps the feedback ahead of the next question; filled in by feedback_pipeline
+        feedback = None
+        placeholder = Message(interview_id=session_id, role="assistant", text=PENDING_FEEDBACK)
+        db.add(placeholder)
+        await db.flush()
+    else:
+        # Evaluate the answer
+        eval_result = await evaluate_answer(current_question, answer)
+        feedback = eval_result["feedback"]
+
+        # Store feedback message
+        db.add(Message(interview_id=session_id, role="assistant", text=f"{FEEDBACK_PREFIX}{feedback}"))
 
     # Move to next question
     next_idx = current_idx + 1
@@ -119,67 +167,167 @@ async def send_message(
 
     await db.commit()
 
+    if pipelined:
+        # Only after commit, so the background update always finds the row
+        feedback_pipeline.submit(session_id, placeholder.id, current_idx, current_question, answer)
+    else:
+        await record_evaluation(session_id, current_idx, answer, eval_result)
+
     return InterviewMessageResponse(
         feedback=feedback,
         next_question=next_question,
         question_number=next_idx + 1 if not is_last else len(questions),
         total_questions=len(questions),
         is_last=is_last,
+        feedback_message_id=placeholder.id if pipelined else None,
     )
 
 
-@router.post("/{session_id}/finish", response_model=InterviewFinishResponse)
-async def finish_interview(session_id: int, db: AsyncSession = Depends(get_db)):
-    interview = await db.get(Interview, session_id)
+@job_queue.handler("interview_message", priority=PRIORITY_INTERACTIVE)
+async def _answer_job(payload: dict, db: AsyncSession) -> dict:
+    # Evaluated inline: pipelined feedback would outlive the job in the worker process
+    response = await _answer(payload["session_id"], payload["answer"], False, db, payload["question_index"])
+    return response.model_dump()
+
+
+@router.post(
+    "/{session_id}/message", response_model=InterviewMessageResponse, responses={202: {"model": JobResponse}}
+)
+async def send_message(
+    session_id: int,
+    req: InterviewMessageRequest,
+    pipelined: bool = False,
+    run_async: bool = Query(False, alias="async", description="Queue an interview_message job and return 202"),
+    idempotency_key: str | None = Header(None, max_length=200),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    With pipelined=true the next question is returned right away and the answer
+    is evaluated in the background; fetch the feedback from GET /{session_id}/feedback.
+    With async=true the whole turn runs as a job; its result is this response.
+    """
+    if run_async:
+        question_index = await db.scalar(
+            select(Interview.current_question_index).where(Interview.id == session_id)
+        )
+        if question_index is None:
+            raise HTTPException(status_code=404, detail="Interview session not found")
+        payload = {"session_id": session_id, "answer": req.answer, "question_index": question_index}
+        job = await job_queue.enqueue(
+            db, "interview_message", payload, idempotency_key, serial_key=f"interview:{session_id}"
+        )
+        return job_accepted(job)
+
+    return await _answer(session_id, req.answer, pipelined, db)
+
+
+@router.get("/{session_id}", response_model=InterviewStateResponse)
+async def get_interview(
+    session_id: int,
+    messages: int = Query(20, ge=0, le=500, description="How many of the latest messages to return"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Where the session stands and the end of its transcript, e.g. to restore the chat after a reload."""
+    interview, recent = await repository.interview_with_messages(db, session_id, last_messages=messages)
     if not interview:
         raise HTTPException(status_code=404, detail="Interview session not found")
 
-    result = await db.execute(
-        select(Message)
-        .where(Message.interview_id == session_id)
-        .order_by(Message.id)
+    questions = interview.plan.get("questions", []) if interview.plan else []
+    current = interview.current_question_index
+    current_question = None
+    if interview.status != "finished" and current < len(questions):
+        current_question = questions[current]["text"]
+    return InterviewStateResponse(
+        session_id=session_id,
+        status=interview.status,
+        level=interview.level,
+        question_number=min(current + 1, len(questions)),
+        total_questions=len(questions),
+        current_question=current_question,
+        messages=[
+            InterviewMessageOut(message_id=m.id, role=m.role, text=m.text, created_at=m.created_at) for m in recent
+        ],
     )
-    messages = result.scalars().all()
 
-    # Build transcript: pair questions with answers
-    questions = interview.plan.get("questions", [])
-    transcript = []
-    q_idx = 0
-    i = 0
-    msg_list = list(messages)
-
-    while i < len(msg_list) and q_idx < len(questions):
-        msg = msg_list[i]
-        if msg.role == "assistant" and not msg.text.startswith("[Feedback]"):
-            # This is a question
-            question_text = msg.text
-            answer_text = ""
-            feedback_text = ""
-            # Look ahead for user answer
-            if i + 1 < len(msg_list) and msg_list[i + 1].role == "user":
-                answer_text = msg_list[i + 1].text
-                i += 1
-            # Look ahead for feedback
-            if i + 1 < len(msg_list) and msg_list[i + 1].text.startswith("[Feedback]"):
-                feedback_text = msg_list[i + 1].text.replace("[Feedback] ", "")
-                i += 1
-            transcript.append({
-                "question": question_text,
-                "answer": answer_text,
-                "feedback": feedback_text,
-                "type": questions[q_idx].get("type", "general") if q_idx < len(questions) else "general",
-                "category": questions[q_idx].get("category", "") if q_idx < len(questions) else "",
-            })
-            q_idx += 1
-        i += 1
-
-    if not transcript:
+
+@router.get("/{session_id}/feedback", response_model=InterviewFeedbackResponse)
+async def get_feedback(
+    session_id: int,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for pending evaluations"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Feedback for every answer so far, in question order; pending ones have feedback=None."""
+    interview, messages = await repository.interview_with_messages(db, session_id)
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview session not found")
+
+    await feedback_pipeline.resume(interview, db, messages)
+    if wait and feedback_pipeline.pending(session_id):
+        await feedback_pipeline.wait(session_id, timeout=wait)
+        messages = await load_messages(session_id, db)
+
+    items = []
+    for msg in messages:
+        pending = msg.text == PENDING_FEEDBACK
+        if msg.role != "assistant" or not (pending or msg.text.startswith(FEEDBACK_PREFIX)):
+            continue
+        items.append(InterviewFeedbackItem(
+            message_id=msg.id,
+            question_number=len(items) + 1,
+            feedback=None if pending else msg.text[len(FEEDBACK_PREFIX):],
+            pending=pending,
+        ))
+
+    return InterviewFeedbackResponse(
+        session_id=session_id,
+        items=items,
+        pending=sum(item.pending for item in items),
+    )
+
+
+async def _report_summary(session_id: int, db: AsyncSession) -> dict:
+    interview = await db.get(Interview, session_id)
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview session not found")
+
+    # Pipelined answers may still be under evaluation; they update score_stats from other sessions
+    await feedback_pipeline.resume(interview, db)
+    if feedback_pipeline.pending(session_id):
+        await feedback_pipeline.wait(session_id)
+        await db.refresh(interview)
+
+    recorded = (interview.score_stats or {}).get("answers", 0)
+    if not recorded or recorded < interview.current_question_index:
+        # Answers given before the schema upgrade have no evaluation (nor score_stats) yet
+        if await _evaluate_unrecorded_answers(interview, db):
+            await db.refresh(interview)
+    if not interview.score_stats or not interview.score_stats["answers"]:
         raise HTTPException(status_code=400, detail="No answers recorded yet")
+    return await build_report_summary(interview, db)
+
+
+async def _evaluate_unrecorded_answers(interview: Interview, db: AsyncSession) -> int:
+    """Evaluate and record the answers that have no answer_evaluations row. Returns how many."""
+    recorded = set((await db.scalars(
+        select(AnswerEvaluation.question_index).where(AnswerEvaluation.interview_id == interview.id)
+    )).all())
+    answers = [msg.text for msg in await load_messages(interview.id, db) if msg.role == "user"]
+    missing = [(index, answer) for index, answer in enumerate(answers) if index not in recorded]
+    questions = interview.plan["questions"]
+    results = await asyncio.gather(
+        *(evaluate_answer(questions[index]["text"], answer) for index, answer in missing), return_exceptions=True
+    )
+    for (index, answer), result in zip(missing, results):
+        await record_evaluation(interview.id, index, answer, None if isinstance(result, BaseException) else result)
+    return len(missing)
 
-    report_data = await generate_final_report(transcript)
 
-    interview.status = "finished"
-    interview.finished_at = datetime.now(timezone.utc)
+async def _save_final_report(session_id: int, report_data: dict, db: AsyncSession) -> Report:
+    await db.execute(
+        update(Interview)
+        .where(Interview.id == session_id)
+        .values(status="finished", finished_at=datetime.now(timezone.utc))
+    )
 
     report = Report(
         entity_type="interview",
@@ -189,5 +337,63 @@ async def finish_interview(session_id: int, db: AsyncSession = Depends(get_db)):
     )
     db.add(report)
     await db.commit()
+    return report
+
 
-    return InterviewFinishResponse(session_id=session_id, report=report_data)
+@job_queue.handler("interview_report", priority=PRIORITY_INTERACTIVE)
+async def _final_report_job(payload: dict, db: AsyncSession) -> dict:
+    session_id = payload["session_id"]
+    summary = await _report_summary(session_id, db)
+    report_data = await generate_final_report(summary)
+    report = await _save_final_report(session_id, report_data, db)
+    return {"session_id": session_id, "report_id": report.id, "report": report_data}
+
+
+@router.post(
+    "/{session_id}/finish", response_model=InterviewFinishResponse, responses={202: {"model": JobResponse}}
+)
+async def finish_interview(
+    session_id: int,
+    run_async: bool = Query(False, alias="async", description="Queue an interview_report job and return 202"),
+    idempotency_key: str | None = Header(None, max_length=200),
+    db: AsyncSession = Depends(get_db),
+):
+    if run_async:
+        if not await repository.exists(db, Interview, session_id):
+            raise HTTPException(status_code=404, detail="Interview session not found")
+        job = await job_queue.enqueue(
+            db, "interview_report", {"session_id": session_id}, idempotency_key, serial_key=f"interview:{session_id}"
+        )
+        return job_accepted(job)
+
+    summary = await _report_summary(session_id, db)
+
+    report_data = await generate_final_report(summary)
+    await _save_final_report(session_id, report_data, db)
+
+    return model_response(InterviewFinishResponse(session_id=session_id, report=report_data))
+
+
+@router.post("/{session_id}/finish/stream")
+async def finish_interview_stream(session_id: int, db: AsyncSession = Depends(get_db)):
+    """Same report as /finish as server-sent events: field, token, item, done (with report_id) or error."""
+    summary = await _report_summary(session_id, db)
+
+    async def events():
+        # Scores are computed locally, so they go out before the model starts
+        for key, value in summary["scores"].items():
+            yield format_sse("field", {"key": key, "value": value})
+        parser = JSONItemStream()
+        try:
+            async for chunk in stream_json_events(generate_final_report_stream(summary), parser):
+                yield chunk
+            report_data = parse_final_report(parser.text, summary["scores"])
+            # The request's session is closed once the response starts streaming
+            async with AsyncSessionLocal() as session:
+                report = await _save_final_report(session_id, report_data, session)
+        except Exception as e:
+            yield format_sse("error", {"detail": f"Failed to generate report: {e}"})
+            return
+        yield format_sse("done", {"report_id": report.id, "session_id": session_id, "report": report_data})
+
+    return sse_response(events())
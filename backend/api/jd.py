@@ -1,54 +1,245 @@
-from fastapi import APIRouter, Depends, HTTPException
+import time
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from backend.database import get_db
-from backend.models.db_models import CV, CVSection, JobDescription, Report
-from backend.models.schemas import JDCreateRequest, JDCreateResponse, MatchRequest, MatchResponse
-from backend.services.jd_matcher import extract_jd_requirements, match_cv_to_jd
+from backend.config import settings
+from backend.database import ReadSessionLocal, get_db, get_read_db
+from backend.models.db_models import CV, JobDescription, Report
+from backend.models.schemas import (
+    CandidateMatch, JDCreateRequest, JDCreateResponse, JDDetailResponse, JobResponse, MatchRequest,
+    MatchResponse, TopCandidatesResponse,
+)
+from backend.api.jobs import job_accepted
+from backend.services.candidate_index import candidate_index
+from backend.services.job_index import job_index
+from backend.services.job_queue import FINISHED_STATUSES, PRIORITY_BULK, job_queue
+from backend.services.jd_matcher import (
+    MATCH_PROMPT_VERSION, MODEL, extract_jd_requirements, match_cv_to_jd, recommend_improvements,
+)
+from backend.services.semantic_index import semantic_index
+from backend.services import repository
+from backend.services.report_cache import digest, fingerprint, report_cache, sections_hash
+from backend.services.skill_matcher import cv_terms, local_recommendations, match_cv_locally, match_terms
+from backend.utils.json_codec import model_response
 
 router = APIRouter(prefix="/api", tags=["jd"])
 
 
+async def _jd_extraction_failed(payload: dict, error: str, db: AsyncSession) -> None:
+    jd = await db.get(JobDescription, payload["jd_id"])
+    if jd:
+        jd.status = "failed"
+
+
+async def _index_jd(payload: dict, result: dict | None) -> None:
+    async with ReadSessionLocal() as db:
+        jd = await db.get(JobDescription, payload["jd_id"])
+    if jd and jd.extracted_requirements is not None:
+        job_index.add(jd.id, jd.extracted_requirements, jd.created_at)
+
+
+@job_queue.handler("jd_extract", on_failure=_jd_extraction_failed, on_success=_index_jd)
+async def _extract_requirements(payload: dict, db: AsyncSession) -> dict:
+    jd = await db.get(JobDescription, payload["jd_id"])
+    if not jd:
+        raise HTTPException(status_code=404, detail="Job description not found")
+
+    jd.extracted_requirements = await extract_jd_requirements(jd.text)
+    jd.status = "ready"
+    await db.commit()
+    return {"jd_id": jd.id}
+
+
+def _check_ready(status: str | None) -> None:
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    if status == "pending":
+        raise HTTPException(status_code=409, detail="Job description requirements are still being extracted")
+    if status == "failed":
+        raise HTTPException(status_code=409, detail="Requirement extraction failed for this job description")
+
+
+async def _get_ready_jd(jd_id: int, db: AsyncSession) -> JobDescription:
+    jd = await db.get(JobDescription, jd_id)
+    _check_ready(jd.status if jd else None)
+    return jd
+
+
 @router.post("/jd", response_model=JDCreateResponse)
-async def create_jd(req: JDCreateRequest, db: AsyncSession = Depends(get_db)):
+async def create_jd(
+    req: JDCreateRequest,
+    wait: float = Query(0, ge=0, le=60, description="Seconds to wait for the requirements"),
+    idempotency_key: str | None = Header(None, max_length=200),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Stores the JD as pending and queues requirement extraction (jd_extract job);
+    poll GET /api/jd/{jd_id} or GET /api/jobs/{job_id} until it is ready.
+    """
     if not req.text.strip():
         raise HTTPException(status_code=400, detail="Job description text cannot be empty")
 
-    requirements = await extract_jd_requirements(req.text)
+    job = await job_queue.find(db, "jd_extract", idempotency_key) if idempotency_key else None
+    if job is None:
+        jd = JobDescription(text=req.text, status="pending")
+        db.add(jd)
+        await db.flush()
+        jd_id = jd.id
+        job = await job_queue.enqueue(db, "jd_extract", {"jd_id": jd_id}, idempotency_key)
+        if job.payload["jd_id"] == jd_id:
+            semantic_index.add_jd(jd_id, req.text)
 
-    jd = JobDescription(text=req.text, extracted_requirements=requirements)
-    db.add(jd)
-    await db.commit()
-    await db.refresh(jd)
+    if wait and job.status not in FINISHED_STATUSES:
+        await job_queue.wait(job.id, wait)
+    jd_id = job.payload["jd_id"]
+    status, requirements = (await db.execute(
+        select(JobDescription.status, JobDescription.extracted_requirements).where(JobDescription.id == jd_id)
+    )).one()
+    return model_response(
+        JDCreateResponse(jd_id=jd_id, status=status, job_id=job.id, extracted_requirements=requirements)
+    )
 
-    return JDCreateResponse(jd_id=jd.id, extracted_requirements=requirements)
 
+@router.get("/jd/{jd_id}", response_model=JDDetailResponse)
+async def get_jd(jd_id: int, db: AsyncSession = Depends(get_read_db)):
+    # Everything but the text, which can be long
+    jd = (await db.execute(
+        select(JobDescription.status, JobDescription.extracted_requirements, JobDescription.created_at)
+        .where(JobDescription.id == jd_id)
+    )).one_or_none()
+    if not jd:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return model_response(JDDetailResponse(
+        jd_id=jd_id, status=jd.status, extracted_requirements=jd.extracted_requirements, created_at=jd.created_at,
+    ))
+
+
+def _match_fingerprint(req: MatchRequest, sections_dict: dict[str, str], requirements: dict) -> str:
+    return fingerprint(
+        sections=sections_hash(sections_dict),
+        requirements=digest(requirements),
+        prompt=MATCH_PROMPT_VERSION,
+        model=MODEL,
+        mode=req.mode,
+        llm_recommendations=req.mode == "fast" and req.llm_recommendations,
+        embeddings=settings.embedding_backend,  # semantic_score
+    )
 
-@router.post("/match", response_model=MatchResponse)
-async def match_cv_jd(req: MatchRequest, db: AsyncSession = Depends(get_db)):
-    cv = await db.get(CV, req.cv_id)
-    if not cv:
+
+async def _match_input(req: MatchRequest, db: AsyncSession) -> tuple[dict[str, str], JobDescription]:
+    sections_dict = await repository.cv_sections(db, req.cv_id)
+    if sections_dict is None:
         raise HTTPException(status_code=404, detail="CV not found")
+    return sections_dict, await _get_ready_jd(req.jd_id, db)
 
-    jd = await db.get(JobDescription, req.jd_id)
-    if not jd:
-        raise HTTPException(status_code=404, detail="Job description not found")
 
-    result = await db.execute(select(CVSection).where(CVSection.cv_id == req.cv_id))
-    sections = result.scalars().all()
-    sections_dict = {s.section_name: s.content for s in sections}
-    if not sections_dict:
-        sections_dict = {"full_cv": cv.raw_text}
+async def _run_match(
+    req: MatchRequest, db: AsyncSession, inputs: tuple[dict[str, str], JobDescription] | None = None
+) -> tuple[dict, Report]:
+    sections_dict, jd = inputs or await _match_input(req, db)
 
-    match_result = await match_cv_to_jd(sections_dict, jd.extracted_requirements or {})
+    requirements = jd.extracted_requirements or {}
+    if req.mode == "fast":
+        match_result = match_cv_locally(sections_dict, requirements)
+        if req.llm_recommendations:
+            recommendations = await recommend_improvements(sections_dict, requirements, match_result)
+        else:
+            recommendations = local_recommendations(match_result["missing_skills"])
+        match_result["recommendations"] = recommendations
+        match_result["llm_recommendations"] = req.llm_recommendations
+    else:
+        match_result = await match_cv_to_jd(sections_dict, requirements)
+    match_result["mode"] = req.mode
+    match_result["semantic_score"] = round(semantic_index.similarity(sections_dict, req.jd_id, jd.text) * 100)
 
     report = Report(
         entity_type="match",
         entity_id=req.cv_id,
+        jd_id=req.jd_id,
         report_json={**match_result, "jd_id": req.jd_id},
+        input_fingerprint=_match_fingerprint(req, sections_dict, requirements),
     )
     db.add(report)
     await db.commit()
+    return match_result, report
+
 
-    return MatchResponse(**match_result)
+@job_queue.handler("cv_jd_match", priority=PRIORITY_BULK)
+async def _match_job(payload: dict, db: AsyncSession) -> dict:
+    match_result, report = await _run_match(MatchRequest(**payload), db)
+    return {**match_result, "report_id": report.id}
+
+
+@router.post("/match", response_model=MatchResponse, responses={202: {"model": JobResponse}})
+async def match_cv_jd(
+    req: MatchRequest,
+    run_async: bool = Query(False, alias="async", description="Queue a cv_jd_match job and return 202"),
+    reuse: bool = Query(True, description="Return the stored match of the same CV sections, requirements and options"),
+    idempotency_key: str | None = Header(None, max_length=200),
+    db: AsyncSession = Depends(get_db),
+):
+    inputs = None
+    if reuse:
+        inputs = await _match_input(req, db)
+        sections_dict, jd = inputs
+        report = await report_cache.lookup(
+            db, "match", req.cv_id, _match_fingerprint(req, sections_dict, jd.extracted_requirements or {}),
+            Report.jd_id == req.jd_id,
+        )
+        if report:
+            return model_response(MatchResponse(**report.report_json, report_id=report.id, reused=True))
+
+    if run_async:
+        if inputs is None:
+            if not await repository.exists(db, CV, req.cv_id):
+                raise HTTPException(status_code=404, detail="CV not found")
+            _check_ready(await db.scalar(select(JobDescription.status).where(JobDescription.id == req.jd_id)))
+        job = await job_queue.enqueue(db, "cv_jd_match", req.model_dump(), idempotency_key)
+        return job_accepted(job)
+
+    match_result, report = await _run_match(req, db, inputs)
+    return model_response(MatchResponse(**match_result, report_id=report.id))
+
+
+@router.get("/jd/{jd_id}/top-candidates", response_model=TopCandidatesResponse)
+async def top_candidates(
+    jd_id: int,
+    k: int = Query(10, ge=1, le=100),
+    method: Literal["bm25", "semantic"] = "bm25",
+    approximate: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Rank every stored CV against the JD locally, no LLM call: by BM25 over the
+    extracted skills, or by embedding similarity of the JD text to CV sections.
+    """
+    jd = await _get_ready_jd(jd_id, db)
+
+    requirements = jd.extracted_requirements or {}
+    started = time.perf_counter()
+    if method == "bm25":
+        candidates = candidate_index.search(requirements, k)
+        took_ms = round((time.perf_counter() - started) * 1000, 2)
+        return TopCandidatesResponse(
+            jd_id=jd_id, method=method, indexed_cvs=len(candidate_index), took_ms=took_ms, candidates=candidates,
+        )
+
+    hits = semantic_index.rank_cvs(semantic_index.jd_vector(jd_id, jd.text), k, approximate)
+    took_ms = round((time.perf_counter() - started) * 1000, 2)
+    sections = await repository.sections_by_cv(db, [cv_id for cv_id, _, _ in hits]) if hits else {}
+    candidates = []
+    for cv_id, score, section in hits:
+        overlap = match_terms(cv_terms(sections.get(cv_id, {})), requirements)
+        candidates.append(CandidateMatch(
+            cv_id=cv_id,
+            score=round(score, 4),
+            matched_skills=overlap["matched_skills"],
+            missing_skills=overlap["missing_skills"],
+            best_section=section,
+        ))
+    return TopCandidatesResponse(
+        jd_id=jd_id, method=method, indexed_cvs=len(semantic_index.cv_sections), took_ms=took_ms, candidates=candidates,
+    )
@@ -0,0 +1,82 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette.responses import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import get_db, get_read_db
+from backend.models.db_models import Job
+from backend.models.schemas import JobResponse
+from backend.services.job_queue import FINISHED_STATUSES, job_queue
+from backend.utils.json_codec import model_response
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+def job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        priority=job.priority,
+        attempts=job.attempts,
+        max_attempts=job.max_attempts,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def job_accepted(job: Job) -> Response:
+    """202 with the job handle, for endpoints called with async=true."""
+    return model_response(job_response(job), status_code=202)
+
+
+@router.get("", response_model=list[JobResponse])
+async def list_jobs(
+    status: Literal["queued", "running", "succeeded", "failed", "dead"] | None = None,
+    kind: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Newest jobs first; status=dead lists the dead-letter queue."""
+    query = select(Job).order_by(Job.id.desc()).limit(limit)
+    if status:
+        query = query.where(Job.status == status)
+    if kind:
+        query = query.where(Job.kind == kind)
+    result = await db.execute(query)
+    return [job_response(job) for job in result.scalars().all()]
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for the job to finish"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if wait and job.status not in FINISHED_STATUSES:
+        await job_queue.wait(job_id, wait)
+        await db.refresh(job)
+    return job_response(job)
+
+
+@router.post("/{job_id}/retry", response_model=JobResponse)
+async def retry_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """Requeue a failed or dead-lettered job with a fresh set of attempts."""
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in ("failed", "dead"):
+        raise HTTPException(status_code=409, detail=f"Only failed or dead jobs can be retried (job is {job.status})")
+    no_retry = job_queue.no_retry_reason(job.kind)
+    if no_retry:
+        raise HTTPException(status_code=409, detail=no_retry)
+    await job_queue.requeue(db, job)
+    return job_response(job)
@@ -0,0 +1,96 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import get_read_db
+from backend.models.db_models import Report
+from backend.models.schemas import ReportOut, ReportPage
+from backend.services import repository
+from backend.utils.json_codec import model_response
+
+router = APIRouter(prefix="/api/reports", tags=["reports"])
+
+EntityType = Literal["cv", "match", "interview"]
+
+
+def report_out(report: Report) -> ReportOut:
+    return ReportOut(
+        report_id=report.id,
+        entity_type=report.entity_type,
+        entity_id=report.entity_id,
+        jd_id=report.jd_id,
+        interview_id=report.interview_id,
+        created_at=report.created_at,
+        input_fingerprint=report.input_fingerprint,
+        report=report.report_json,
+    )
+
+
+def encode_cursor(report: Report) -> str:
+    """Position after `report` in (created_at, id) order, opaque to clients."""
+    raw = f"{report.created_at.isoformat()}|{report.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, report_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(report_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("", response_model=ReportPage)
+async def list_reports(
+    entity_type: EntityType,
+    entity_id: int,
+    jd_id: int | None = Query(None, description="Match reports against this JD only"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Reports of a CV (cv, match) or an interview, newest first. Keyset
+    pagination: each page continues after the (created_at, id) of the last
+    one, so reports added meanwhile neither shift nor repeat items.
+    """
+    criteria = [] if jd_id is None else [Report.jd_id == jd_id]
+    if cursor:
+        criteria.append(tuple_(Report.created_at, Report.id) < tuple_(*decode_cursor(cursor)))
+    query = repository.reports_newest_first(entity_type, entity_id, *criteria).limit(limit + 1)
+    reports = (await db.scalars(query)).all()
+    more = len(reports) > limit
+    reports = reports[:limit]
+    return model_response(ReportPage(
+        items=[report_out(r) for r in reports],
+        next_cursor=encode_cursor(reports[-1]) if more else None,
+    ))
+
+
+@router.get("/latest", response_model=ReportOut)
+async def latest_report(
+    entity_type: EntityType,
+    entity_id: int,
+    jd_id: int | None = Query(None, description="Match reports against this JD only"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Newest report of an entity: one index lookup."""
+    criteria = [] if jd_id is None else [Report.jd_id == jd_id]
+    report = await repository.latest_report(db, entity_type, entity_id, *criteria)
+    if not report:
+        raise HTTPException(status_code=404, detail="No report for this entity")
+    return model_response(report_out(report))
+
+
+@router.get("/{report_id}", response_model=ReportOut)
+async def get_report(report_id: int, db: AsyncSession = Depends(get_read_db)):
+    report = await db.get(Report, report_id)
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return model_response(report_out(report))
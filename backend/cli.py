@@ -0,0 +1,163 @@
+"""
+Command-line entry points.
+
+    python -m backend.cli ingest PATH [--batch-size 500] [--workers 4]
+    python -m backend.cli worker [--processes 2] [--concurrency 2]
+    python -m backend.cli compress [--batch-size 500] [--vacuum]
+
+ingest: PATH is a directory (searched recursively) or a .zip archive of CV
+files. Progress and per-file errors are printed as one JSON object per line.
+
+worker: runs queued jobs (see services/job_queue.py) in --processes processes
+with --concurrency jobs at a time each, until interrupted.
+
+compress: rewrites CV raw text stored before COMPRESS_RAW_TEXT was on in
+compressed form (SQLite); --vacuum then returns the freed pages to the disk.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import zipfile
+
+from sqlalchemy import func, select, text, update
+
+from backend.config import settings
+from backend.database import AsyncSessionLocal, create_tables, dispose_engines, engine
+from backend.models.db_models import CV
+from backend.services.batch_ingest import ingest, iter_directory, iter_zip
+from backend.services.extraction_pool import ExtractionPool
+
+
+async def _ingest(args: argparse.Namespace) -> None:
+    await create_tables()
+    pool = ExtractionPool(
+        workers=args.workers,
+        max_queue=args.workers,
+        timeout_seconds=settings.extraction_timeout_seconds,
+        char_budget=settings.pdf_char_budget,
+    )
+    try:
+        if zipfile.is_zipfile(args.path):
+            with zipfile.ZipFile(args.path) as archive:
+                async for event in ingest(iter_zip(archive), pool, args.batch_size):
+                    print(json.dumps(event), flush=True)
+        else:
+            async for event in ingest(iter_directory(args.path), pool, args.batch_size):
+                print(json.dumps(event), flush=True)
+    finally:
+        pool.shutdown()
+        await dispose_engines()
+
+
+async def _work(concurrency: int) -> None:
+    # The API modules register the job handlers
+    from backend.api import cv, interview, jd  # noqa: F401
+    from backend.services.extraction_pool import extraction_pool
+    from backend.services.job_queue import job_queue
+    from backend.services.llm_gateway import llm_gateway
+
+    await create_tables()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    # Index updates are the API process's job (it follows finished jobs)
+    await job_queue.start(concurrency, follow=False)
+    print(json.dumps({"event": "worker_started", "worker_id": job_queue.worker_id}), flush=True)
+    await stop.wait()
+    await job_queue.stop(timeout=settings.job_lease_seconds)
+    extraction_pool.shutdown()
+    await llm_gateway.aclose()
+    await dispose_engines()
+    print(json.dumps({"event": "worker_stopped", **job_queue.stats()}), flush=True)
+
+
+async def _compress(args: argparse.Namespace) -> None:
+    await create_tables()
+    rewritten = 0
+    last_id = 0
+    try:
+        while True:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(CV.id, CV.raw_text)
+                    .where(CV.id > last_id, func.typeof(CV.raw_text) == "text")
+                    .order_by(CV.id)
+                    .limit(args.batch_size)
+                )
+                rows = result.all()
+                if not rows:
+                    break
+                await db.execute(update(CV), [{"id": cv_id, "raw_text": raw_text} for cv_id, raw_text in rows])
+                await db.commit()
+            last_id = rows[-1][0]
+            rewritten += len(rows)
+            print(json.dumps({"event": "batch", "rewritten": rewritten}), flush=True)
+        if args.vacuum:
+            async with engine.connect() as conn:
+                await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.execute(text("VACUUM"))
+        print(json.dumps({"event": "done", "rewritten": rewritten}), flush=True)
+    finally:
+        await dispose_engines()
+
+
+def _worker_process(concurrency: int) -> None:
+    asyncio.run(_work(concurrency))
+
+
+def _worker(args: argparse.Namespace) -> None:
+    if args.processes == 1:
+        _worker_process(args.concurrency)
+        return
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_worker_process, args=(args.concurrency,)) for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    # Ctrl+C reaches the whole process group; SIGTERM only this process
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, lambda signum, frame: None)
+    for process in processes:
+        process.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_cmd = commands.add_parser("ingest", help="bulk-import a directory or zip of CVs")
+    ingest_cmd.add_argument("path")
+    ingest_cmd.add_argument("--batch-size", type=int, default=settings.batch_insert_size)
+    ingest_cmd.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    worker_cmd = commands.add_parser("worker", help="run queued background jobs")
+    worker_cmd.add_argument("--processes", type=int, default=settings.job_worker_processes)
+    worker_cmd.add_argument("--concurrency", type=int, default=max(1, settings.job_workers))
+
+    compress_cmd = commands.add_parser("compress", help="compress CV raw text stored uncompressed")
+    compress_cmd.add_argument("--batch-size", type=int, default=settings.batch_insert_size)
+    compress_cmd.add_argument("--vacuum", action="store_true")
+
+    args = parser.parse_args()
+    if args.command == "ingest":
+        asyncio.run(_ingest(args))
+    elif args.command == "worker":
+        _worker(args)
+    elif args.command == "compress":
+        if not settings.compress_raw_text:
+            sys.exit("COMPRESS_RAW_TEXT is off")
+        asyncio.run(_compress(args))
+
+
+if __name__ == "__main__":
+    main()
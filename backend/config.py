@@ -8,7 +8,77 @@ class Settings(BaseSettings):
     database_url: str = "sqlite+aiosqlite:///./cv_helper.db"
     upload_dir: str = "./uploads"
     max_file_size_mb: int = 20
+    max_batch_size_mb: int = 2048
+    batch_insert_size: int = 500
     backend_url: str = "http://localhost:8000"
 
+    # OpenAI gateway: connection pool, concurrency caps, rate limits (0 = off), retries.
+    # openai_base_url points the client at a compatible server, e.g. benchmarks/fake_openai.py
+    openai_base_url: str = ""
+    llm_max_connections: int = 32
+    llm_max_concurrency: int = 16
+    llm_route_concurrency: int = 8
+    llm_requests_per_minute: int = 500
+    llm_tokens_per_minute: int = 300_000
+    llm_timeout_seconds: float = 60.0
+    llm_deadline_seconds: float = 120.0
+    llm_max_retries: int = 4
+
+    # LLM response cache: memory / sqlite / disk / none
+    llm_cache_backend: str = "memory"
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_cache_max_entries: int = 10_000
+    llm_cache_path: str = "./llm_cache"
+
+    # Text extraction process pool (0 workers = run in a background thread)
+    extraction_workers: int = 2
+    extraction_max_queue: int = 16
+    extraction_timeout_seconds: float = 60.0
+
+    # Background job queue (jobs table). job_workers run inside the API process (0 = none);
+    # `python -m backend.cli worker` starts job_worker_processes more. Running jobs hold a
+    # lease renewed by heartbeat; failures retry with exponential backoff, then dead-letter
+    job_workers: int = 2
+    job_worker_processes: int = 2
+    job_lease_seconds: float = 30.0
+    job_max_attempts: int = 3
+    job_retry_base_seconds: float = 2.0
+    job_poll_seconds: float = 1.0
+
+    # Local embeddings for semantic CV / JD similarity (memory-mapped under embedding_dir).
+    # embedding_nprobe: inverted lists scanned by approximate search
+    embedding_backend: str = "hashing"
+    embedding_dim: int = 512
+    embedding_dir: str = "./embeddings"
+    embedding_nprobe: int = 16
+
+    # Database engines. Reads go through a separate pool (database_read_url, e.g. a replica;
+    # empty = same database). SQLite connections get the pragmas below on connect
+    database_read_url: str = ""
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_read_pool_size: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 3600
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kb: int = 64_000
+    sqlite_mmap_size_mb: int = 256
+    sqlite_temp_store: str = "memory"
+
+    # Response compression (brotli when installed and accepted, else gzip) above a minimum size;
+    # CV raw text is stored zlib-compressed (rows written before stay readable)
+    compress_responses: bool = True
+    compression_minimum_size: int = 1000
+    gzip_level: int = 6
+    brotli_quality: int = 5
+    compress_raw_text: bool = True
+    raw_text_compression_level: int = 6
+
+    # Spread pages of long PDFs over the extraction pool; stop after N chars (0 = no limit)
+    pdf_parallel_pages: bool = True
+    pdf_char_budget: int = 0
+
 
 settings = Settings()
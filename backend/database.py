@@ -1,10 +1,77 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from backend.config import settings
 
-engine = create_async_engine(settings.database_url, echo=False)
+
+def sqlite_pragmas(read_only: bool = False) -> dict[str, str | int]:
+    """
+    WAL lets readers run alongside the single writer; synchronous=NORMAL drops
+    the fsync per commit (in WAL mode a crash of the app loses nothing, a power
+    cut may lose the last commits); busy_timeout makes a second writer wait
+    instead of failing with "database is locked".
+    """
+    pragmas = {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "cache_size": -settings.sqlite_cache_size_kb,
+        "mmap_size": settings.sqlite_mmap_size_mb * 1024 * 1024,
+        "temp_store": settings.sqlite_temp_store,
+    }
+    if read_only:
+        pragmas["query_only"] = "on"
+    return pragmas
+
+
+def _in_memory(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def make_engine(url: str, pragmas: dict[str, str | int] | None = None, pool_size: int | None = None) -> AsyncEngine:
+    """
+    Engine with a real connection pool (aiosqlite defaults to a new connection,
+    and thread, per session) and `pragmas` run on every new SQLite connection.
+    """
+    sqlite = make_url(url).get_backend_name() == "sqlite"
+    kwargs = {}
+    if not _in_memory(url):
+        kwargs = dict(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=pool_size or settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_pre_ping=not sqlite,
+        )
+    new_engine = create_async_engine(url, echo=False, **kwargs)
+    if sqlite and pragmas:
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+            cursor.close()
+    return new_engine
+
+
+engine = make_engine(settings.database_url, sqlite_pragmas())
+if settings.database_read_url or not _in_memory(settings.database_url):
+    read_engine = make_engine(
+        settings.database_read_url or settings.database_url,
+        sqlite_pragmas(read_only=True),
+        pool_size=settings.db_read_pool_size,
+    )
+else:
+    # Every connection to an in-memory SQLite database is a separate database
+    read_engine = engine
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+# For code that only reads: a separate pool, so reads never queue behind writers for a connection
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
@@ -16,6 +83,53 @@ async def get_db() -> AsyncSession:
         yield session
 
 
+async def get_read_db() -> AsyncSession:
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+def pool_stats() -> dict:
+    stats = {}
+    for name, pool_engine in (("write", engine), ("read", read_engine)):
+        pool = pool_engine.pool
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats[name] = {"size": pool.size(), "checked_out": pool.checkedout(), "overflow": pool.overflow()}
+    return stats
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+
+def _upgrade_schema(conn) -> None:
+    """create_all() skips existing tables, so add columns and indexes introduced since."""
+    inspector = inspect(conn)
+    created_indexes = False
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=conn.dialect)
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                if column.server_default is not None:
+                    default = str(column.server_default.arg).replace("'", "''")
+                    ddl += f" DEFAULT '{default}'"
+                conn.execute(text(ddl))
+        existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(conn)
+                created_indexes = True
+    if created_indexes and conn.dialect.name == "sqlite":
+        # Row statistics let the planner pick between the new indexes and the old ones
+        conn.execute(text("ANALYZE"))
+
+
 async def create_tables():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_schema)
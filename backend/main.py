@@ -3,16 +3,42 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.database import create_tables
+from backend.config import settings
+from backend.database import create_tables, dispose_engines, pool_stats
 from backend.api.cv import router as cv_router
 from backend.api.jd import router as jd_router
 from backend.api.interview import router as interview_router
+from backend.api.jobs import router as jobs_router
+from backend.api.reports import router as reports_router
+from backend.services.candidate_index import candidate_index
+from backend.services.job_index import job_index
+from backend.services.semantic_index import semantic_index
+from backend.services.llm_cache import cache_stats
+from backend.services.llm_gateway import llm_gateway
+from backend.services.extraction_pool import extraction_pool
+from backend.services.feedback_pipeline import feedback_pipeline
+from backend.services.report_cache import report_cache
+from backend.services.job_queue import job_queue
+from backend.utils.compression import CompressionMiddleware
+from backend.utils.json_codec import DefaultResponse
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await create_tables()
+    await candidate_index.load()
+    await job_index.load()
+    # This process owns the embedding files; workers map them read-only
+    semantic_index.open_for_writing()
+    await semantic_index.sync()
+    await job_queue.start(settings.job_workers)
     yield
+    await job_queue.stop(timeout=10)
+    # Unfinished evaluations keep their placeholder and are resubmitted on the next poll
+    await feedback_pipeline.wait_all(timeout=10)
+    extraction_pool.shutdown()
+    await llm_gateway.aclose()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -20,6 +46,7 @@ app = FastAPI(
     description="API for CV analysis, JD matching, and interview preparation",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
 )
 
 app.add_middleware(
@@ -29,12 +56,37 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.compress_responses:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.gzip_level,
+        brotli_quality=settings.brotli_quality,
+    )
 
 app.include_router(cv_router)
 app.include_router(jd_router)
 app.include_router(interview_router)
+app.include_router(jobs_router)
+app.include_router(reports_router)
 
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "llm_cache": cache_stats(),
+        "llm": llm_gateway.stats(),
+        "extraction": extraction_pool.stats(),
+        "feedback": feedback_pipeline.stats(),
+        "report_cache": report_cache.stats(),
+        "jobs": job_queue.stats(),
+        "db_pools": pool_stats(),
+        "candidate_index": candidate_index.stats(),
+        "job_index": job_index.stats(),
+        "semantic_index": semantic_index.stats(),
+    }
@@ -1,22 +1,66 @@
 import json
+import zlib
 from datetime import datetime, timezone
 
-from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Boolean, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import TypeDecorator
 
+from backend.config import settings
 from backend.database import Base
+from backend.utils import json_codec
 
 
 def _now():
     return datetime.now(timezone.utc)
 
 
+class CompressedText(TypeDecorator):
+    """
+    Text stored zlib-compressed when settings.compress_raw_text is on; SQLite
+    keeps the bytes as a BLOB in the TEXT column. Values read back as str come
+    from rows written uncompressed and are returned as they are.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not settings.compress_raw_text:
+            return value
+        return zlib.compress(value.encode("utf-8"), settings.raw_text_compression_level)
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, bytes):
+            return zlib.decompress(value).decode("utf-8")
+        return value
+
+
+class FastJSON(TypeDecorator):
+    """
+    JSON document in a TEXT column, encoded and decoded with orjson when it is
+    installed (backend.utils.json_codec) instead of the stdlib encoder of the
+    generic JSON type. None is stored as SQL NULL; rows written by the JSON
+    type read back the same.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else json_codec.dumps(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else json_codec.loads(value)
+
+
 class CV(Base):
     __tablename__ = "cvs"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    file_path: Mapped[str] = mapped_column(String(512), nullable=True)
-    raw_text: Mapped[str] = mapped_column(Text, nullable=False)
+    file_path: Mapped[str] = mapped_column(String(512), nullable=True, index=True)  # shared by duplicate uploads
+    raw_text: Mapped[str] = mapped_column(CompressedText, nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)  # sha256 of file
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
 
     sections: Mapped[list["CVSection"]] = relationship(
@@ -27,6 +71,7 @@ class CV(Base):
 
 class CVSection(Base):
     __tablename__ = "cv_sections"
+    __table_args__ = (Index("ix_cv_sections_cv_id", "cv_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     cv_id: Mapped[int] = mapped_column(Integer, ForeignKey("cvs.id"), nullable=False)
@@ -41,7 +86,9 @@ class JobDescription(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     text: Mapped[str] = mapped_column(Text, nullable=False)
-    extracted_requirements: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    extracted_requirements: Mapped[dict | None] = mapped_column(FastJSON, nullable=True)
+    # pending until the jd_extract job fills extracted_requirements, then ready (or failed)
+    status: Mapped[str] = mapped_column(String(20), default="ready", server_default="ready")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
 
     interviews: Mapped[list["Interview"]] = relationship("Interview", back_populates="jd")
@@ -49,6 +96,7 @@ class JobDescription(Base):
 
 class Interview(Base):
     __tablename__ = "interviews"
+    __table_args__ = (Index("ix_interviews_cv_id", "cv_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     cv_id: Mapped[int] = mapped_column(Integer, ForeignKey("cvs.id"), nullable=False)
@@ -56,10 +104,12 @@ class Interview(Base):
     status: Mapped[str] = mapped_column(String(20), default="created")  # created/in_progress/finished
     level: Mapped[str] = mapped_column(String(20), default="junior")
     num_questions: Mapped[int] = mapped_column(Integer, default=10)
-    plan: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    plan: Mapped[dict | None] = mapped_column(FastJSON, nullable=True)
     current_question_index: Mapped[int] = mapped_column(Integer, default=0)
     started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Running score totals, updated with every evaluated answer (see interview_scoring)
+    score_stats: Mapped[dict | None] = mapped_column(FastJSON, nullable=True)
 
     cv: Mapped["CV"] = relationship("CV", back_populates="interviews")
     jd: Mapped["JobDescription"] = relationship("JobDescription", back_populates="interviews")
@@ -67,10 +117,36 @@ class Interview(Base):
         "Message", back_populates="interview", cascade="all, delete-orphan", order_by="Message.id"
     )
     reports: Mapped[list["Report"]] = relationship("Report", back_populates="interview")
+    evaluations: Mapped[list["AnswerEvaluation"]] = relationship(
+        "AnswerEvaluation", back_populates="interview", cascade="all, delete-orphan"
+    )
+
+
+class AnswerEvaluation(Base):
+    __tablename__ = "answer_evaluations"
+    __table_args__ = (
+        Index("ix_answer_evaluations_interview_question", "interview_id", "question_index", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    interview_id: Mapped[int] = mapped_column(Integer, ForeignKey("interviews.id"), nullable=False)
+    question_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    question: Mapped[str] = mapped_column(Text, nullable=False)
+    answer: Mapped[str] = mapped_column(Text, nullable=False)
+    category: Mapped[str] = mapped_column(String(100), default="")
+    question_type: Mapped[str] = mapped_column(String(20), default="general")
+    score: Mapped[int | None] = mapped_column(Integer, nullable=True)  # None if the evaluation failed
+    criteria_scores: Mapped[dict | None] = mapped_column(FastJSON, nullable=True)
+    feedback: Mapped[str] = mapped_column(Text, default="")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
+
+    interview: Mapped["Interview"] = relationship("Interview", back_populates="evaluations")
 
 
 class Message(Base):
     __tablename__ = "messages"
+    # Transcripts are read per interview in id order
+    __table_args__ = (Index("ix_messages_interview_id_id", "interview_id", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     interview_id: Mapped[int] = mapped_column(Integer, ForeignKey("interviews.id"), nullable=False)
@@ -83,12 +159,57 @@ class Message(Base):
 
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        Index("ix_reports_entity", "entity_type", "entity_id", "created_at"),
+        Index("ix_reports_interview_id", "interview_id"),
+        Index("ix_reports_match", "jd_id", "entity_id", "created_at"),
+        Index("ix_reports_fingerprint", "entity_type", "entity_id", "input_fingerprint", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     entity_type: Mapped[str] = mapped_column(String(20), nullable=False)  # cv/match/interview
     entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
-    report_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    report_json: Mapped[dict] = mapped_column(FastJSON, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
 
     interview_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("interviews.id"), nullable=True)
     interview: Mapped["Interview | None"] = relationship("Interview", back_populates="reports")
+    # Match reports: the JD the CV (entity_id) was matched against
+    jd_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("job_descriptions.id"), nullable=True)
+    # cv/match reports: hash of the inputs (services/report_cache.py); NULL = never reused
+    input_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+
+class Job(Base):
+    """Durable background work item, run by services/job_queue.py."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_priority", "status", "priority", "id"),
+        Index("ix_jobs_status_hooks_done", "status", "hooks_done"),
+        Index("ix_jobs_serial_key", "serial_key", "status"),
+        Index("ix_jobs_kind_idempotency_key", "kind", "idempotency_key", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[dict] = mapped_column(FastJSON, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default="queued")  # queued/running/succeeded/failed/dead
+    priority: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    result: Mapped[dict | None] = mapped_column(FastJSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    idempotency_key: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    # Jobs sharing a serial key (e.g. one interview's turns) run one at a time, oldest first
+    serial_key: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
+    # Worker holding a running job, until the lease runs out without a heartbeat
+    worker_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # The API process has run the kind's on_success hook (or there is none).
+    # Rows from before the column existed count as done
+    hooks_done: Mapped[bool] = mapped_column(Boolean, default=False, server_default="1")
@@ -1,5 +1,7 @@
+from datetime import datetime
+
 from pydantic import BaseModel
-from typing import Any
+from typing import Any, Literal
 
 
 # ── CV ──────────────────────────────────────────────────────────────────────
@@ -14,17 +16,35 @@ class CVSectionOut(BaseModel):
     content: str
 
 
-class CVDetailResponse(BaseModel):
+class CVSectionsUpdate(BaseModel):
+    sections: list[CVSectionOut]
+
+
+class CVSectionsResponse(BaseModel):
     cv_id: int
-    raw_text: str
     sections: list[CVSectionOut]
+    invalidated_reports: int  # analysis and match reports no longer reused
+
+
+class CVDetailResponse(BaseModel):
+    cv_id: int
+    # Left out of the response when not requested (?fields= / ?include_raw=false)
+    raw_text: str | None = None
+    sections: list[CVSectionOut] | None = None
+
+
+class Rewrite(BaseModel):
+    original: str = ""
+    improved: str = ""
 
 
 class CVAnalysisResponse(BaseModel):
     cv_id: int
     issues: list[str]
     tips: list[str]
-    rewrites: list[dict[str, str]]
+    rewrites: list[Rewrite]
+    report_id: int | None = None
+    reused: bool = False  # a stored report with the same input fingerprint
 
 
 # ── Job Description ──────────────────────────────────────────────────────────
@@ -33,14 +53,34 @@ class JDCreateRequest(BaseModel):
     text: str
 
 
+class JDRequirements(BaseModel):
+    hard_skills: list[str] = []
+    soft_skills: list[str] = []
+    responsibilities: list[str] = []
+    keywords: list[str] = []
+
+
 class JDCreateResponse(BaseModel):
     jd_id: int
-    extracted_requirements: dict[str, Any]
+    status: str  # pending/ready/failed
+    job_id: int
+    extracted_requirements: JDRequirements | None = None
+
+
+class JDDetailResponse(BaseModel):
+    jd_id: int
+    status: str
+    extracted_requirements: JDRequirements | None
+    created_at: datetime
 
 
 class MatchRequest(BaseModel):
     cv_id: int
     jd_id: int
+    # fast: skills scored locally; full: everything from GPT-4o
+    mode: Literal["fast", "full"] = "full"
+    # fast mode only: ask GPT-4o for the recommendations instead of using templates
+    llm_recommendations: bool = False
 
 
 class MatchResponse(BaseModel):
@@ -48,6 +88,43 @@ class MatchResponse(BaseModel):
     matched_skills: list[str]
     missing_skills: list[str]
     recommendations: list[str]
+    mode: str = "full"
+    semantic_score: int | None = None
+    report_id: int | None = None
+    reused: bool = False  # a stored report with the same input fingerprint
+
+
+class CandidateMatch(BaseModel):
+    cv_id: int
+    score: float
+    matched_skills: list[str]
+    missing_skills: list[str]
+    best_section: str | None = None
+
+
+class TopCandidatesResponse(BaseModel):
+    jd_id: int
+    method: str = "bm25"
+    indexed_cvs: int
+    took_ms: float
+    candidates: list[CandidateMatch]
+
+
+class JobMatch(BaseModel):
+    jd_id: int
+    score: int
+    created_at: datetime
+    excerpt: str
+    matched_skills: list[str]
+    missing_skills: list[str]
+
+
+class TopJobsResponse(BaseModel):
+    cv_id: int
+    total: int
+    offset: int
+    took_ms: float
+    jobs: list[JobMatch]
 
 
 # ── Interview ────────────────────────────────────────────────────────────────
@@ -72,13 +149,95 @@ class InterviewMessageRequest(BaseModel):
 
 
 class InterviewMessageResponse(BaseModel):
-    feedback: str
+    feedback: str | None  # None while a pipelined evaluation is still running
     next_question: str | None
     question_number: int
     total_questions: int
     is_last: bool
+    feedback_message_id: int | None = None
+
+
+class InterviewFeedbackItem(BaseModel):
+    message_id: int
+    question_number: int
+    feedback: str | None
+    pending: bool
+
+
+class InterviewFeedbackResponse(BaseModel):
+    session_id: int
+    items: list[InterviewFeedbackItem]
+    pending: int
+
+
+class InterviewMessageOut(BaseModel):
+    message_id: int
+    role: str
+    text: str
+    created_at: datetime
+
+
+class InterviewStateResponse(BaseModel):
+    session_id: int
+    status: str
+    level: str
+    question_number: int
+    total_questions: int
+    current_question: str | None  # None once finished
+    messages: list[InterviewMessageOut]  # the last `messages` of the transcript
+
+
+class ImprovedAnswer(BaseModel):
+    question: str = ""
+    original: str = ""
+    improved: str = ""
+
+
+class InterviewReport(BaseModel):
+    # Scores are computed locally (interview_scoring), the rest comes from the model
+    overall_score: float
+    criteria_scores: dict[str, float]
+    category_scores: dict[str, float]
+    strengths: list[str] = []
+    weaknesses: list[str] = []
+    recommendations: list[str] = []
+    improved_answers: list[ImprovedAnswer] = []
 
 
 class InterviewFinishResponse(BaseModel):
     session_id: int
+    report: InterviewReport
+
+
+# ── Reports ──────────────────────────────────────────────────────────────────
+
+class ReportOut(BaseModel):
+    report_id: int
+    entity_type: str  # cv/match/interview
+    entity_id: int
+    jd_id: int | None = None
+    interview_id: int | None = None
+    created_at: datetime
+    input_fingerprint: str | None = None  # set while the report can still be reused
     report: dict[str, Any]
+
+
+class ReportPage(BaseModel):
+    items: list[ReportOut]
+    next_cursor: str | None  # pass as ?cursor= for the next page; None on the last one
+
+
+# ── Jobs ─────────────────────────────────────────────────────────────────────
+
+class JobResponse(BaseModel):
+    job_id: int
+    kind: str
+    status: str  # queued/running/succeeded/failed/dead
+    priority: int = 0
+    attempts: int
+    max_attempts: int
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
@@ -0,0 +1,185 @@
+import asyncio
+import time
+import zipfile
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+
+from backend.database import AsyncSessionLocal
+from backend.models.db_models import CV, CVSection
+from backend.services.extraction_pool import ExtractionPool
+from backend.services import repository
+from backend.services.segmenter import segment_cv
+from backend.utils.file_utils import ALLOWED_EXTENSIONS, settle_file, store_file
+
+# (display name, callable that opens the file for binary reading)
+Source = tuple[str, Callable[[], BinaryIO]]
+
+
+def iter_directory(root: str) -> Iterator[Source]:
+    for path in sorted(Path(root).rglob("*")):
+        if path.is_file() and path.suffix.lower() in ALLOWED_EXTENSIONS:
+            yield str(path.relative_to(root)), (lambda p=path: p.open("rb"))
+
+
+def iter_zip(archive: zipfile.ZipFile) -> Iterator[Source]:
+    for info in archive.infolist():
+        if info.is_dir() or Path(info.filename).suffix.lower() not in ALLOWED_EXTENSIONS:
+            continue
+        yield info.filename, (lambda i=info: archive.open(i))
+
+
+def _batches(sources: Iterable[Source], size: int) -> Iterator[list[Source]]:
+    batch: list[Source] = []
+    for source in sources:
+        batch.append(source)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _store_source(name: str, open_source: Callable[[], BinaryIO]) -> tuple[str, str]:
+    with open_source() as fh:
+        return store_file(fh, name)
+
+
+async def _load_known(db, hashes: set[str]) -> dict[str, tuple[str, dict[str, str]]]:
+    """
+    Text already extracted, by content hash, with fresh sections: stored ones
+    may have been edited by hand.
+    """
+    if not hashes:
+        return {}
+    result = await db.execute(
+        select(CV.content_hash, CV.raw_text)
+        .where(CV.content_hash.in_(hashes))
+        .order_by(CV.id)
+    )
+    known: dict[str, tuple[str, dict[str, str]]] = {}
+    for content_hash, raw_text in result.all():
+        if content_hash not in known:
+            known[content_hash] = (raw_text, segment_cv(raw_text))
+    return known
+
+
+async def ingest(
+    sources: Iterable[Source],
+    pool: ExtractionPool,
+    batch_size: int = 500,
+    on_insert: Callable[[dict[int, dict[str, str]]], Awaitable[None]] | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Store, extract, segment and bulk-insert CVs, one transaction per batch.
+    Yields one event per file plus a progress event after every batch.
+    Identical files (by content hash) are extracted once and cloned.
+    on_insert({cv_id: sections}) is awaited after every committed batch.
+    """
+    started = time.perf_counter()
+    done = failed = 0
+    # Stay within the pool's worker count so interactive uploads still find queue slots
+    slots = asyncio.Semaphore(max(pool.workers, 1))
+
+    async def parse(path: str) -> tuple[str, dict[str, str]]:
+        async with slots:
+            raw_text = await pool.extract(path)
+        if not raw_text.strip():
+            raise ValueError("Extracted text is empty. Is the file a scanned image?")
+        return raw_text, segment_cv(raw_text)
+
+    async with AsyncSessionLocal() as db:
+        for batch in _batches(sources, batch_size):
+            events: list[dict] = []
+            stored: list[tuple[str, str, str]] = []
+            for name, open_source in batch:
+                try:
+                    # Decompressing, hashing and writing a member is blocking work
+                    path, content_hash = await asyncio.to_thread(_store_source, name, open_source)
+                    stored.append((name, path, content_hash))
+                except HTTPException as e:
+                    events.append({"event": "error", "file": name, "detail": e.detail})
+                except Exception as e:
+                    events.append({"event": "error", "file": name, "detail": str(e)})
+
+            errors: dict[str, BaseException] = {}
+            rows, names, cv_ids = [], [], []
+            try:
+                parsed = await _load_known(db, {h for _, _, h in stored})
+                pending = {h: p for _, p, h in stored if h not in parsed}
+                results = await asyncio.gather(*(parse(p) for p in pending.values()), return_exceptions=True)
+                for content_hash, result in zip(pending, results):
+                    if isinstance(result, BaseException):
+                        errors[content_hash] = result
+                    else:
+                        parsed[content_hash] = result
+
+                for name, path, content_hash in stored:
+                    if content_hash in errors:
+                        detail = f"Could not extract text: {errors[content_hash]}"
+                        events.append({"event": "error", "file": name, "detail": detail})
+                        continue
+                    raw_text, _ = parsed[content_hash]
+                    rows.append({"file_path": path, "raw_text": raw_text, "content_hash": content_hash})
+                    names.append(name)
+
+                if rows:
+                    result = await db.execute(
+                        insert(CV).returning(CV.id, sort_by_parameter_order=True), rows
+                    )
+                    cv_ids = result.scalars().all()
+                    section_rows = [
+                        {"cv_id": cv_id, "section_name": section_name, "content": content}
+                        for cv_id, row in zip(cv_ids, rows)
+                        for section_name, content in parsed[row["content_hash"]][1].items()
+                    ]
+                    if section_rows:
+                        await db.execute(insert(CVSection), section_rows)
+                    await db.commit()
+            except BaseException:
+                # No row of this batch was committed, so none refers to its files
+                await db.rollback()
+                for _, path, _ in stored:
+                    settle_file(path)
+                for path in {path for _, path, _ in stored}:
+                    await repository.release_file(db, path)
+                raise
+            # Stored files are held from store_file until their rows are committed
+            for _, path, _ in stored:
+                settle_file(path)
+            # Files that failed to extract, unless other CVs or uploads share them
+            for path in {path for _, path, content_hash in stored if content_hash in errors}:
+                await repository.release_file(db, path)
+
+            if rows:
+                if on_insert is not None:
+                    await on_insert({
+                        cv_id: parsed[row["content_hash"]][1] or {"full_cv": row["raw_text"]}
+                        for cv_id, row in zip(cv_ids, rows)
+                    })
+                events.extend(
+                    {"event": "file", "file": name, "cv_id": cv_id}
+                    for name, cv_id in zip(names, cv_ids)
+                )
+
+            done += len(rows)
+            failed += len(batch) - len(rows)
+            for event in events:
+                yield event
+            yield _progress("progress", done, failed, started)
+
+    yield _progress("done", done, failed, started)
+
+
+def _progress(event: str, done: int, failed: int, started: float) -> dict:
+    elapsed = time.perf_counter() - started
+    return {
+        "event": event,
+        "ingested": done,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 2),
+        "cvs_per_s": round(done / elapsed, 1) if elapsed else 0.0,
+    }
@@ -0,0 +1,256 @@
+import asyncio
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy import select
+
+from backend.database import ReadSessionLocal
+from backend.models.db_models import CV, CVSection
+from backend.services.skill_matcher import GROUP_WEIGHTS, skill_terms, term_counts
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Sections that say nothing about skills
+SKIPPED_SECTIONS = frozenset({"contacts"})
+LOAD_BATCH_SIZE = 1000
+# Pending additions are turned into a segment at this size, or before the next search
+FLUSH_SIZE = 256
+# A segment is merged into the one before it once that one is at most this many times larger
+MERGE_FACTOR = 2
+
+
+class _Segment:
+    """An immutable block of documents: a CSC matrix (documents x terms) of term counts."""
+
+    def __init__(self, matrix: sp.csc_matrix, cv_ids: np.ndarray):
+        self.matrix = matrix
+        self.cv_ids = cv_ids
+        self.lengths = np.asarray(matrix.sum(axis=1), dtype=np.float32).ravel()
+        # Per-term document frequency. Deleted documents still count until the next merge.
+        self.df = np.diff(matrix.indptr).astype(np.int32)
+        self.alive = np.ones(len(cv_ids), dtype=bool)
+
+    @property
+    def size(self) -> int:
+        return int(self.alive.sum())
+
+
+def _widen(matrix: sp.csc_matrix, n_terms: int) -> sp.csc_matrix:
+    """Add empty columns for terms that entered the vocabulary after the segment was built."""
+    extra = n_terms - matrix.shape[1]
+    if extra <= 0:
+        return matrix
+    indptr = np.concatenate([matrix.indptr, np.full(extra, matrix.indptr[-1], dtype=matrix.indptr.dtype)])
+    return sp.csc_matrix((matrix.data, matrix.indices, indptr), shape=(matrix.shape[0], n_terms))
+
+
+class CandidateIndex:
+    """
+    In-memory BM25 index of CV terms (see skill_matcher.term_counts) for ranking
+    every stored CV against a JD. Built from the database at startup and kept up
+    to date on upload / delete. New documents go into small segments that are
+    merged log-structured style, so an update never rewrites the whole index.
+    """
+
+    def __init__(self):
+        self._vocabulary: dict[str, int] = {}
+        self._segments: list[_Segment] = []
+        self._where: dict[int, tuple[_Segment, int]] = {}
+        self._pending: dict[int, dict[int, int]] = {}
+        self._total_length = 0
+        self._doc_lengths: dict[int, int] = {}
+        self.loaded = False
+        self.load_seconds = 0.0
+        self.searches = 0
+        self.last_search_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def _term_ids(self, counts: dict[str, int]) -> dict[int, int]:
+        ids = {}
+        for term, count in counts.items():
+            term_id = self._vocabulary.setdefault(term, len(self._vocabulary))
+            ids[term_id] = count
+        return ids
+
+    def add(self, cv_id: int, cv_sections: dict[str, str]) -> None:
+        counts = term_counts({n: c for n, c in cv_sections.items() if n not in SKIPPED_SECTIONS})
+        self._add_counts(cv_id, self._term_ids(counts))
+
+    def _add_counts(self, cv_id: int, counts: dict[int, int]) -> None:
+        self.remove(cv_id)
+        self._pending[cv_id] = counts
+        length = sum(counts.values())
+        self._doc_lengths[cv_id] = length
+        self._total_length += length
+        if len(self._pending) >= FLUSH_SIZE:
+            self._flush()
+
+    def remove(self, cv_id: int) -> None:
+        length = self._doc_lengths.pop(cv_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        if self._pending.pop(cv_id, None) is None:
+            segment, row = self._where.pop(cv_id)
+            segment.alive[row] = False
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        rows, cols, data = [], [], []
+        cv_ids = list(self._pending)
+        for row, cv_id in enumerate(cv_ids):
+            counts = self._pending[cv_id]
+            rows.extend([row] * len(counts))
+            cols.extend(counts)
+            data.extend(counts.values())
+        matrix = sp.csc_matrix(
+            (np.asarray(data, dtype=np.float32), (rows, cols)),
+            shape=(len(cv_ids), len(self._vocabulary)),
+        )
+        self._pending.clear()
+        self._append(_Segment(matrix, np.asarray(cv_ids, dtype=np.int64)))
+        while len(self._segments) >= 2 and self._segments[-2].size <= MERGE_FACTOR * self._segments[-1].size:
+            newer = self._segments.pop()
+            older = self._segments.pop()
+            self._append(self._merge(older, newer))
+
+    def _append(self, segment: _Segment) -> None:
+        self._segments.append(segment)
+        for row, cv_id in enumerate(segment.cv_ids.tolist()):
+            self._where[cv_id] = (segment, row)
+
+    def _merge(self, older: _Segment, newer: _Segment) -> _Segment:
+        n_terms = len(self._vocabulary)
+        matrix = sp.vstack([_widen(older.matrix, n_terms), _widen(newer.matrix, n_terms)], format="csc")
+        alive = np.concatenate([older.alive, newer.alive])
+        cv_ids = np.concatenate([older.cv_ids, newer.cv_ids])
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            matrix, cv_ids = matrix[keep].tocsc(), cv_ids[keep]
+        return _Segment(matrix, cv_ids)
+
+    def _query(self, jd_requirements: dict) -> tuple[np.ndarray, np.ndarray, list[tuple[str, list[int]]]]:
+        """Term ids and weights for a JD, plus each skill with the query positions it needs."""
+        weights: dict[int, float] = {}
+        skills: list[tuple[str, list[int]]] = []
+        for group, weight in GROUP_WEIGHTS.items():
+            for skill in jd_requirements.get(group) or []:
+                term_ids = [self._vocabulary.get(t) for t in skill_terms(skill)]
+                if not term_ids or None in term_ids:
+                    # A term no CV has ever contained: the skill cannot match
+                    if group != "keywords":
+                        skills.append((skill, []))
+                    continue
+                for term_id in term_ids:
+                    weights[term_id] = max(weights.get(term_id, 0.0), weight)
+                if group != "keywords":
+                    skills.append((skill, term_ids))
+        term_ids = np.fromiter(weights, dtype=np.int64, count=len(weights))
+        position = {t: i for i, t in enumerate(weights)}
+        skills = [(skill, [position[t] for t in ids]) for skill, ids in skills]
+        return term_ids, np.fromiter(weights.values(), dtype=np.float32, count=len(weights)), skills
+
+    def search(self, jd_requirements: dict, k: int = 10) -> list[dict]:
+        """Top-k CVs by BM25 over the JD's skills and keywords (weighted by GROUP_WEIGHTS)."""
+        started = time.perf_counter()
+        self._flush()
+        n_docs = len(self._doc_lengths)
+        term_ids, weights, skills = self._query(jd_requirements)
+        if not n_docs or not len(term_ids):
+            return []
+
+        df = np.zeros(len(term_ids), dtype=np.float32)
+        for segment in self._segments:
+            in_segment = term_ids < segment.matrix.shape[1]
+            df[in_segment] += segment.df[term_ids[in_segment]]
+        idf = np.log1p((np.maximum(n_docs - df, 0) + 0.5) / (df + 0.5)).astype(np.float32) * weights
+        avg_length = self._total_length / n_docs
+
+        candidates: list[tuple[float, int, np.ndarray]] = []
+        for segment in self._segments:
+            in_segment = np.flatnonzero(term_ids < segment.matrix.shape[1])
+            if not len(in_segment) or not segment.matrix.shape[0]:
+                continue
+            hits = segment.matrix[:, term_ids[in_segment]].tocoo()
+            tf = hits.data
+            norm = K1 * (1 - B + B * segment.lengths[hits.row] / avg_length)
+            contributions = idf[in_segment][hits.col] * tf * (K1 + 1) / (tf + norm)
+            scores = np.bincount(hits.row, weights=contributions, minlength=segment.matrix.shape[0])
+            scores[~segment.alive] = 0.0
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+            top = top[scores[top] > 0]
+            if not len(top):
+                continue
+            in_top = np.isin(hits.row, top)
+            top_rows, top_cols = hits.row[in_top], hits.col[in_top]
+            for row in top.tolist():
+                # Query positions present in this CV
+                present = in_segment[top_cols[top_rows == row]]
+                candidates.append((float(scores[row]), int(segment.cv_ids[row]), present))
+
+        candidates.sort(key=lambda c: -c[0])
+        results = []
+        for score, cv_id, present in candidates[:k]:
+            present = set(present.tolist())
+            results.append({
+                "cv_id": cv_id,
+                "score": round(score, 4),
+                "matched_skills": [s for s, positions in skills if positions and present.issuperset(positions)],
+                "missing_skills": [s for s, positions in skills if not positions or not present.issuperset(positions)],
+            })
+        self.searches += 1
+        self.last_search_ms = round((time.perf_counter() - started) * 1000, 2)
+        return results
+
+    async def load(self) -> None:
+        """Index every stored CV; tokenizing runs in a thread, one batch at a time."""
+        started = time.perf_counter()
+        async with ReadSessionLocal() as db:
+            last_id = 0
+            while True:
+                result = await db.execute(
+                    select(CV.id, CV.raw_text).where(CV.id > last_id).order_by(CV.id).limit(LOAD_BATCH_SIZE)
+                )
+                batch = result.all()
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                sections: dict[int, dict[str, str]] = {cv_id: {} for cv_id, _ in batch}
+                result = await db.execute(
+                    select(CVSection.cv_id, CVSection.section_name, CVSection.content)
+                    .where(CVSection.cv_id.in_(sections))
+                )
+                for cv_id, name, content in result.all():
+                    sections[cv_id][name] = content
+                for cv_id, raw_text in batch:
+                    sections[cv_id] = sections[cv_id] or {"full_cv": raw_text}
+                counts = await asyncio.to_thread(
+                    lambda: {
+                        cv_id: term_counts({n: c for n, c in s.items() if n not in SKIPPED_SECTIONS})
+                        for cv_id, s in sections.items()
+                    }
+                )
+                for cv_id, doc_counts in counts.items():
+                    self._add_counts(cv_id, self._term_ids(doc_counts))
+        self._flush()
+        self.loaded = True
+        self.load_seconds = round(time.perf_counter() - started, 2)
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._doc_lengths),
+            "terms": len(self._vocabulary),
+            "segments": len(self._segments),
+            "nonzeros": sum(s.matrix.nnz for s in self._segments),
+            "load_seconds": self.load_seconds,
+            "searches": self.searches,
+            "last_search_ms": self.last_search_ms,
+        }
+
+
+candidate_index = CandidateIndex()
@@ -1,9 +1,10 @@
 import json
-from openai import AsyncOpenAI
+from collections.abc import AsyncIterator
 
-from backend.config import settings
+from backend.services.llm_gateway import llm_gateway
+from backend.services.report_cache import fingerprint, prompt_version, sections_hash
 
-_client = AsyncOpenAI(api_key=settings.openai_api_key)
+MODEL = "gpt-4o"
 
 SYSTEM_PROMPT = """You are an expert career coach and CV reviewer.
 Analyze the given CV and return ONLY valid JSON with this exact structure:
@@ -26,27 +27,52 @@ Focus on:
 
 Provide at least 5 issues and 5 tips. Return ONLY the JSON, no extra text."""
 
+PROMPT_VERSION = prompt_version(1, SYSTEM_PROMPT)
 
-async def analyze_cv(cv_sections: dict[str, str]) -> dict:
+
+def _build_messages(cv_sections: dict[str, str]) -> list[dict]:
     sections_text = "\n\n".join(
         f"=== {name.upper()} ===\n{content}"
         for name, content in cv_sections.items()
     )
     user_message = f"Please analyze this CV:\n\n{sections_text}"
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_message},
+    ]
 
-    response = await _client.chat.completions.create(
-        model="gpt-4o",
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_message},
-        ],
-        temperature=0.3,
-    )
 
-    result = json.loads(response.choices[0].message.content)
+def parse_analysis(content: str) -> dict:
+    result = json.loads(content)
     return {
         "issues": result.get("issues", []),
         "tips": result.get("tips", []),
         "rewrites": result.get("rewrites", []),
     }
+
+
+def analysis_fingerprint(cv_sections: dict[str, str]) -> str:
+    """Inputs of analyze_cv(): a stored analysis with the same fingerprint is still valid."""
+    return fingerprint(sections=sections_hash(cv_sections), prompt=PROMPT_VERSION, model=MODEL)
+
+
+async def analyze_cv(cv_sections: dict[str, str]) -> dict:
+    content = await llm_gateway.complete(
+        "cv_analysis",
+        model=MODEL,
+        response_format={"type": "json_object"},
+        messages=_build_messages(cv_sections),
+        temperature=0.3,
+    )
+    return parse_analysis(content)
+
+
+def analyze_cv_stream(cv_sections: dict[str, str]) -> AsyncIterator[str]:
+    """Raw JSON text of the analysis, chunk by chunk; finish with parse_analysis()."""
+    return llm_gateway.stream(
+        "cv_analysis",
+        model=MODEL,
+        response_format={"type": "json_object"},
+        messages=_build_messages(cv_sections),
+        temperature=0.3,
+    )
@@ -0,0 +1,71 @@
+import re
+import zlib
+
+import numpy as np
+
+from backend.config import settings
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_CHAR_NGRAM = 3
+# Words carry the meaning; character n-grams catch inflections and typos
+_CHAR_WEIGHT = 0.5
+
+
+class Embedder:
+    """Turns texts into L2-normalized float32 vectors of a fixed dimension."""
+
+    name = "base"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            vectors[i] = self._embed_one(text)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """
+    Signed feature hashing of words, word bigrams and character trigrams
+    (crc32, so vectors are identical across processes). No model, no network.
+    """
+
+    name = "hashing"
+
+    def _features(self, text: str) -> tuple[list[str], list[str]]:
+        words = _WORD_RE.findall(text.lower())
+        word_features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        char_features = []
+        for word in set(words):
+            padded = f"<{word}>"
+            char_features.extend(padded[i:i + _CHAR_NGRAM] for i in range(len(padded) - _CHAR_NGRAM + 1))
+        return word_features, char_features
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        word_features, char_features = self._features(text)
+        hashes = np.fromiter(
+            (zlib.crc32(f.encode()) for f in word_features + char_features),
+            dtype=np.uint32,
+            count=len(word_features) + len(char_features),
+        )
+        weights = np.where(hashes & 0x80000000, 1.0, -1.0)
+        weights[len(word_features):] *= _CHAR_WEIGHT
+        vector = np.bincount(hashes % self.dim, weights=weights, minlength=self.dim)
+        # Dampen repeated terms
+        return np.sign(vector) * np.log1p(np.abs(vector))
+
+
+def _build_embedder() -> Embedder:
+    backend = settings.embedding_backend.lower()
+    if backend == "hashing":
+        return HashingEmbedder(settings.embedding_dim)
+    raise ValueError(f"Unknown embedding backend: {settings.embedding_backend}")
+
+
+embedder = _build_embedder()
@@ -0,0 +1,198 @@
+import asyncio
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from backend.config import settings
+from backend.services.parser import (
+    extract_pdf_page_range,
+    extract_short_pdf,
+    extract_text,
+    normalize_text,
+    pdf_page_chunks,
+    take_pages,
+)
+
+
+class ExtractionQueueFull(Exception):
+    pass
+
+
+class ExtractionTimeout(Exception):
+    pass
+
+
+class ExtractionPool:
+    """
+    Runs the blocking pdfplumber / python-docx extraction outside the event loop.
+    Jobs beyond `workers + max_queue` are rejected instead of piling up.
+    Long PDFs are split into page ranges that run on several workers at once;
+    each range beyond the first takes a free slot of its own.
+    A job keeps its slots until its calls have left the workers, also after a
+    timeout: the awaiting request gives up, the worker does not.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        timeout_seconds: float,
+        parallel_pages: bool = False,
+        char_budget: int = 0,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self.parallel_pages = parallel_pages
+        self.char_budget = char_budget
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._abandoned: set[asyncio.Task] = set()
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self._total_duration = 0.0
+        self._max_duration = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.workers > 0:
+                # spawn: never fork a process that is running an event loop
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+        return self._executor
+
+    @property
+    def capacity(self) -> int:
+        return max(self.workers, 1) + self.max_queue
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - max(self.workers, 1))
+
+    async def extract(self, path: str) -> str:
+        if self._in_flight >= self.capacity:
+            self.rejected += 1
+            raise ExtractionQueueFull()
+
+        self._in_flight += 1
+        calls: list[Future] = []
+        started = time.perf_counter()
+        try:
+            text = await asyncio.wait_for(self._extract(path, calls), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise ExtractionTimeout()
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge PDF); start a fresh pool for the next job
+            self.failed += 1
+            self.shutdown()
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._release(calls)
+            duration = time.perf_counter() - started
+            self._total_duration += duration
+            self._max_duration = max(self._max_duration, duration)
+
+        self.completed += 1
+        return text
+
+    def _release(self, calls: list[Future], slots: int = 1) -> None:
+        """Free `slots` now, or once the calls still running in a worker finish."""
+        running = [call for call in calls if not call.done() and not call.cancel()]
+        if not running:
+            self._in_flight -= slots
+            return
+        task = asyncio.ensure_future(asyncio.wait([asyncio.wrap_future(call) for call in running]))
+        self._abandoned.add(task)
+        task.add_done_callback(lambda task: self._abandoned_done(task, slots))
+
+    def _abandoned_done(self, task: asyncio.Task, slots: int) -> None:
+        self._abandoned.discard(task)
+        self._in_flight -= slots
+
+    async def _run(self, calls: list[Future], fn, *args):
+        call = self._get_executor().submit(fn, *args)
+        calls.append(call)
+        return await asyncio.wrap_future(call)
+
+    async def _extract(self, path: str, calls: list[Future]) -> str:
+        if self.parallel_pages and self.workers > 1 and Path(path).suffix.lower() == ".pdf":
+            # Short PDFs are read in this one call; longer ones only yield their page count
+            text, page_count = await self._run(calls, extract_short_pdf, path, self.char_budget)
+            if text is None:
+                return await self._extract_pdf_pages(path, page_count, calls)
+            return text
+        return await self._run(calls, extract_text, path, self.char_budget)
+
+    async def _extract_pdf_pages(self, path: str, page_count: int, calls: list[Future]) -> str:
+        chunks = deque(pdf_page_chunks(page_count, self.workers))
+        # Besides the job's own slot, take the free ones, up to one per worker;
+        # no more chunks than slots are in the executor at a time
+        extra = min(self.workers, len(chunks), 1 + self.capacity - self._in_flight) - 1
+        self._in_flight += extra
+        first_call = len(calls)
+        running: deque[asyncio.Future] = deque()
+
+        def submit_next() -> None:
+            if chunks:
+                start, stop = chunks.popleft()
+                running.append(asyncio.ensure_future(self._run(calls, extract_pdf_page_range, path, start, stop)))
+
+        for _ in range(extra + 1):
+            submit_next()
+        pages: list[str] = []
+        try:
+            while running:
+                pages.extend(await running.popleft())
+                if self.char_budget and sum(len(p) for p in pages) >= self.char_budget:
+                    break
+                submit_next()
+        finally:
+            # Chunks not yet in a worker are dropped on early stop or timeout
+            for future in running:
+                future.cancel()
+            if extra:
+                self._release(calls[first_call:], extra)
+        return normalize_text("\n".join(take_pages(pages, self.char_budget)))
+
+    def stats(self) -> dict:
+        finished = self.completed + self.failed + self.timeouts
+        return {
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "abandoned": len(self._abandoned),  # timed-out jobs still running in a worker
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "avg_duration_ms": round(self._total_duration / finished * 1000, 1) if finished else 0.0,
+            "max_duration_ms": round(self._max_duration * 1000, 1),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+extraction_pool = ExtractionPool(
+    workers=settings.extraction_workers,
+    max_queue=settings.extraction_max_queue,
+    timeout_seconds=settings.extraction_timeout_seconds,
+    parallel_pages=settings.pdf_parallel_pages,
+    char_budget=settings.pdf_char_budget,
+)
@@ -0,0 +1,116 @@
+import asyncio
+
+from sqlalchemy import select
+
+from backend.models.db_models import Interview, Message
+from backend.services.interview_scoring import record_evaluation
+from backend.services.interview_service import evaluate_answer
+
+FEEDBACK_PREFIX = "[Feedback] "
+# Text of a feedback row whose evaluation has not landed yet. Finished rows always
+# start with FEEDBACK_PREFIX (even with empty feedback), so they never match it
+PENDING_FEEDBACK = "[Feedback pending]"
+FEEDBACK_UNAVAILABLE = "Feedback could not be generated for this answer."
+
+
+class FeedbackPipeline:
+    """
+    Evaluates interview answers in the background so the next question can be
+    returned immediately. The [Feedback] row is inserted up front as a
+    placeholder, so message order is fixed before the evaluation starts;
+    the evaluation only fills in its text.
+    """
+
+    def __init__(self):
+        self._tasks: dict[int, dict[int, asyncio.Task]] = {}
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, session_id: int, message_id: int, question_index: int, question: str, answer: str) -> None:
+        session_tasks = self._tasks.setdefault(session_id, {})
+        if message_id in session_tasks:
+            return
+        self.submitted += 1
+        task = asyncio.create_task(self._evaluate(session_id, message_id, question_index, question, answer))
+        session_tasks[message_id] = task
+        task.add_done_callback(lambda _: self._forget(session_id, message_id))
+
+    def _forget(self, session_id: int, message_id: int) -> None:
+        session_tasks = self._tasks.get(session_id, {})
+        session_tasks.pop(message_id, None)
+        if not session_tasks:
+            self._tasks.pop(session_id, None)
+
+    async def _evaluate(
+        self, session_id: int, message_id: int, question_index: int, question: str, answer: str
+    ) -> None:
+        try:
+            result = await evaluate_answer(question, answer)
+            self.completed += 1
+        except Exception:
+            result = None
+            self.failed += 1
+        feedback = (result and result["feedback"]) or FEEDBACK_UNAVAILABLE
+        # The request that submitted this has already returned; record_evaluation uses its own session
+        await record_evaluation(
+            session_id, question_index, answer, result,
+            feedback_message=(message_id, FEEDBACK_PREFIX + feedback),
+        )
+
+    def pending(self, session_id: int) -> int:
+        return len(self._tasks.get(session_id, {}))
+
+    async def resume(self, interview: Interview, db, messages: list[Message] | None = None) -> None:
+        """
+        Resubmit placeholders left behind by a restart (nothing is evaluating them).
+        Works on the transcript in memory: `messages` if the caller has loaded it.
+        """
+        if messages is None:
+            messages = await load_messages(interview.id, db)
+        running = self._tasks.get(interview.id, {})
+        answer = None
+        answered = 0
+        for msg in messages:
+            if msg.role == "user":
+                answer = msg
+                answered += 1
+            elif msg.text == PENDING_FEEDBACK and msg.id not in running and answer is not None:
+                question_index = answered - 1
+                question = interview.plan["questions"][question_index]["text"]
+                self.submit(interview.id, msg.id, question_index, question, answer.text)
+
+    async def wait(self, session_id: int, timeout: float | None = None) -> bool:
+        """Wait for the session's evaluations; False if some are still running after `timeout`."""
+        tasks = list(self._tasks.get(session_id, {}).values())
+        if not tasks:
+            return True
+        _, still_running = await asyncio.wait(tasks, timeout=timeout)
+        return not still_running
+
+    async def wait_all(self, timeout: float | None = None) -> None:
+        tasks = [t for session_tasks in self._tasks.values() for t in session_tasks.values()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": sum(len(t) for t in self._tasks.values()),
+        }
+
+
+async def load_messages(session_id: int, db) -> list[Message]:
+    # populate_existing: pick up feedback written by the background sessions
+    result = await db.execute(
+        select(Message)
+        .where(Message.interview_id == session_id)
+        .order_by(Message.id)
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars().all())
+
+
+feedback_pipeline = FeedbackPipeline()
@@ -0,0 +1,154 @@
+import copy
+
+from sqlalchemy import select, update
+
+from backend.database import AsyncSessionLocal
+from backend.models.db_models import AnswerEvaluation, Interview, Message
+from backend.services.interview_service import CRITERIA
+
+# What the final-report prompt gets, regardless of interview length
+WEAKEST_ANSWERS = 3
+STRONGEST_ANSWERS = 2
+ANSWER_EXCERPT_CHARS = 800
+
+
+def _empty_stats() -> dict:
+    # criteria / categories map a name to [sum, count]
+    return {"answers": 0, "scored": 0, "score_sum": 0, "criteria": {}, "categories": {}}
+
+
+def add_score(stats: dict | None, score: int | None, criteria: dict[str, int], category: str) -> dict:
+    """Fold one answer into the running totals. Returns a new dict so the JSON column is flagged as changed."""
+    stats = copy.deepcopy(stats) if stats else _empty_stats()
+    stats["answers"] += 1
+    if score is None:
+        return stats
+    stats["scored"] += 1
+    stats["score_sum"] += score
+    for name, value in criteria.items():
+        total, count = stats["criteria"].get(name, (0, 0))
+        stats["criteria"][name] = [total + value, count + 1]
+    if category:
+        total, count = stats["categories"].get(category, (0, 0))
+        stats["categories"][category] = [total + score, count + 1]
+    return stats
+
+
+def scores_from_stats(stats: dict | None) -> dict:
+    stats = stats or _empty_stats()
+
+    def mean(total: int, count: int) -> float:
+        return round(total / count, 1) if count else 0.0
+
+    return {
+        "overall_score": mean(stats["score_sum"], stats["scored"]),
+        "criteria_scores": {
+            name: mean(*stats["criteria"][name]) for name in CRITERIA if name in stats["criteria"]
+        },
+        "category_scores": {name: mean(*totals) for name, totals in stats["categories"].items()},
+    }
+
+
+async def record_evaluation(
+    session_id: int,
+    question_index: int,
+    answer: str,
+    result: dict | None,
+    feedback_message: tuple[int, str] | None = None,
+) -> None:
+    """
+    Persist one evaluated answer and update the interview's running totals.
+    result=None records the answer as unscored (the evaluation failed).
+    feedback_message=(message_id, text) fills in a pipelined placeholder in the same commit.
+
+    Answers of one interview may be evaluated in several processes at once, so
+    the totals are rebuilt from the answer_evaluations rows after the insert:
+    the insert takes SQLite's write lock, which is held until the commit, so
+    the rebuild sees every answer committed before it.
+    """
+    async with AsyncSessionLocal() as db:
+        recorded = (
+            select(AnswerEvaluation.id)
+            .where(
+                AnswerEvaluation.interview_id == session_id,
+                AnswerEvaluation.question_index == question_index,
+            )
+            .exists()
+        )
+        plan, exists = (await db.execute(
+            select(Interview.plan, recorded).where(Interview.id == session_id)
+        )).one()
+        if not exists:
+            question = plan["questions"][question_index]
+            db.add(AnswerEvaluation(
+                interview_id=session_id,
+                question_index=question_index,
+                question=question["text"],
+                answer=answer,
+                category=question.get("category", ""),
+                question_type=question.get("type", "general"),
+                score=result["score"] if result else None,
+                criteria_scores=result.get("criteria", {}) if result else {},
+                feedback=result["feedback"] if result else "",
+            ))
+            await db.flush()
+            await db.execute(
+                update(Interview)
+                .where(Interview.id == session_id)
+                .values(score_stats=await _stats_from_rows(db, session_id))
+            )
+        if feedback_message is not None:
+            message_id, text = feedback_message
+            await db.execute(update(Message).where(Message.id == message_id).values(text=text))
+        await db.commit()
+
+
+async def _stats_from_rows(db, session_id: int) -> dict:
+    """Totals of all recorded answers of the interview (bounded by the plan length)."""
+    result = await db.execute(
+        select(AnswerEvaluation.score, AnswerEvaluation.criteria_scores, AnswerEvaluation.category)
+        .where(AnswerEvaluation.interview_id == session_id)
+    )
+    stats = _empty_stats()
+    for score, criteria, category in result:
+        stats = add_score(stats, score, criteria or {}, category)
+    return stats
+
+
+def _excerpt(evaluation: AnswerEvaluation, with_answer: bool) -> dict:
+    item = {
+        "question": evaluation.question,
+        "category": evaluation.category,
+        "score": evaluation.score,
+        "feedback": evaluation.feedback,
+    }
+    if with_answer:
+        item["answer"] = evaluation.answer[:ANSWER_EXCERPT_CHARS]
+    return item
+
+
+async def build_report_summary(interview: Interview, db) -> dict:
+    """Locally computed scores plus a fixed number of answer excerpts for the final-report prompt."""
+    scored = select(AnswerEvaluation).where(
+        AnswerEvaluation.interview_id == interview.id,
+        AnswerEvaluation.score.is_not(None),
+    )
+    result = await db.execute(
+        scored.order_by(AnswerEvaluation.score, AnswerEvaluation.id).limit(WEAKEST_ANSWERS)
+    )
+    weakest = result.scalars().all()
+    result = await db.execute(
+        scored.where(AnswerEvaluation.id.not_in([e.id for e in weakest]))
+        .order_by(AnswerEvaluation.score.desc(), AnswerEvaluation.id)
+        .limit(STRONGEST_ANSWERS)
+    )
+    strongest = result.scalars().all()
+
+    stats = interview.score_stats or _empty_stats()
+    return {
+        "level": interview.level,
+        "answers": stats["answers"],
+        "scores": scores_from_stats(stats),
+        "weakest_answers": [_excerpt(e, with_answer=True) for e in weakest],
+        "strongest_answers": [_excerpt(e, with_answer=False) for e in strongest],
+    }
@@ -1,9 +1,7 @@
 import json
-from openai import AsyncOpenAI
+from collections.abc import AsyncIterator
 
-from backend.config import settings
-
-_client = AsyncOpenAI(api_key=settings.openai_api_key)
+from backend.services.llm_gateway import llm_gateway
 
 PLAN_SYSTEM = """You are an experienced interviewer preparing a structured interview.
 Given a candidate's CV and job description, generate interview questions.
@@ -23,7 +21,7 @@ Return ONLY the JSON."""
 
 EVAL_SYSTEM = """You are an interviewer evaluating a candidate's answer.
 Given the question and the candidate's answer, provide a brief feedback (2-3 sentences).
-Also score the answer from 1 to 5:
+Also score the answer from 1 to 5, overall and on each criterion:
   1 = very poor (no relevant answer)
   2 = poor (barely relevant)
   3 = acceptable (relevant but missing depth)
@@ -32,21 +30,22 @@ Also score the answer from 1 to 5:
 Return ONLY valid JSON:
 {
   "feedback": "brief constructive feedback",
-  "score": <1-5>
-}"""
-
-FINAL_REPORT_SYSTEM = """You are a senior interviewer generating a final interview assessment report.
-Given the full interview transcript (questions and answers with scores), generate a comprehensive report.
-Return ONLY valid JSON:
-{
-  "overall_score": <float 1.0-5.0>,
-  "criteria_scores": {
+  "score": <1-5>,
+  "criteria": {
     "relevance": <1-5>,
     "clarity": <1-5>,
     "structure": <1-5>,
     "technical_depth": <1-5>,
     "communication": <1-5>
-  },
+  }
+}"""
+
+CRITERIA = ("relevance", "clarity", "structure", "technical_depth", "communication")
+
+FINAL_REPORT_SYSTEM = """You are a senior interviewer writing the final assessment of a mock interview.
+The scores are already computed. You get them together with the weakest and strongest answers.
+Return ONLY valid JSON:
+{
   "strengths": ["3-5 specific strengths demonstrated"],
   "weaknesses": ["3-5 areas that need improvement"],
   "recommendations": ["actionable recommendations for improvement"],
@@ -58,7 +57,7 @@ Return ONLY valid JSON:
     }
   ]
 }
-Include 2-3 improved answer examples for the weakest responses.
+Include an improved answer example for each of the weakest answers.
 Return ONLY the JSON."""
 
 
@@ -80,7 +79,8 @@ async def generate_interview_plan(
         context += f"\nCompany Info:\n{company_info}\n"
     context += f"\nLevel: {level}\nNumber of questions: {num_questions}"
 
-    response = await _client.chat.completions.create(
+    content = await llm_gateway.complete(
+        "interview_plan",
         model="gpt-4o",
         response_format={"type": "json_object"},
         messages=[
@@ -89,13 +89,14 @@ async def generate_interview_plan(
         ],
         temperature=0.6,
     )
-    result = json.loads(response.choices[0].message.content)
+    result = json.loads(content)
     questions = result.get("questions", [])
     return questions[:num_questions]
 
 
 async def evaluate_answer(question: str, answer: str) -> dict:
-    response = await _client.chat.completions.create(
+    content = await llm_gateway.complete(
+        "answer_eval",
         model="gpt-4o",
         response_format={"type": "json_object"},
         messages=[
@@ -107,34 +108,66 @@ async def evaluate_answer(question: str, answer: str) -> dict:
         ],
         temperature=0.3,
     )
-    result = json.loads(response.choices[0].message.content)
+    result = json.loads(content)
+    criteria = result.get("criteria")
+    criteria = criteria if isinstance(criteria, dict) else {}
+    scores = {name: _score(criteria.get(name)) for name in CRITERIA}
+    overall = _score(result.get("score"))
     return {
         "feedback": result.get("feedback", ""),
-        "score": int(result.get("score", 3)),
+        "score": 3 if overall is None else overall,
+        "criteria": {name: value for name, value in scores.items() if value is not None},
     }
 
 
-async def generate_final_report(transcript: list[dict]) -> dict:
-    transcript_text = json.dumps(transcript, ensure_ascii=False, indent=2)
+def _score(value) -> int | None:
+    """A 1-5 score from whatever the model returned (4, 4.5, "4"); None if it is not a number."""
+    try:
+        return min(5, max(1, int(float(value))))
+    except (TypeError, ValueError, OverflowError):
+        return None
 
-    response = await _client.chat.completions.create(
-        model="gpt-4o",
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": FINAL_REPORT_SYSTEM},
-            {
-                "role": "user",
-                "content": f"Interview Transcript:\n{transcript_text}",
-            },
-        ],
-        temperature=0.3,
-    )
-    result = json.loads(response.choices[0].message.content)
+
+def _final_report_messages(summary: dict) -> list[dict]:
+    summary_text = json.dumps(summary, ensure_ascii=False, indent=2)
+    return [
+        {"role": "system", "content": FINAL_REPORT_SYSTEM},
+        {
+            "role": "user",
+            "content": f"Interview Summary:\n{summary_text}",
+        },
+    ]
+
+
+def parse_final_report(content: str, scores: dict) -> dict:
+    """Merge the model's qualitative assessment with the locally computed scores."""
+    result = json.loads(content)
     return {
-        "overall_score": float(result.get("overall_score", 3.0)),
-        "criteria_scores": result.get("criteria_scores", {}),
+        **scores,
         "strengths": result.get("strengths", []),
         "weaknesses": result.get("weaknesses", []),
         "recommendations": result.get("recommendations", []),
         "improved_answers": result.get("improved_answers", []),
     }
+
+
+async def generate_final_report(summary: dict) -> dict:
+    content = await llm_gateway.complete(
+        "final_report",
+        model="gpt-4o",
+        response_format={"type": "json_object"},
+        messages=_final_report_messages(summary),
+        temperature=0.3,
+    )
+    return parse_final_report(content, summary["scores"])
+
+
+def generate_final_report_stream(summary: dict) -> AsyncIterator[str]:
+    """Raw JSON text of the qualitative part, chunk by chunk; finish with parse_final_report()."""
+    return llm_gateway.stream(
+        "final_report",
+        model="gpt-4o",
+        response_format={"type": "json_object"},
+        messages=_final_report_messages(summary),
+        temperature=0.3,
+    )
@@ -1,9 +1,9 @@
 import json
-from openai import AsyncOpenAI
 
-from backend.config import settings
+from backend.services.llm_gateway import llm_gateway
+from backend.services.report_cache import prompt_version
 
-_client = AsyncOpenAI(api_key=settings.openai_api_key)
+MODEL = "gpt-4o"
 
 EXTRACT_SYSTEM = """You are a job requirements analyst.
 Extract the key requirements from the given job description and return ONLY valid JSON:
@@ -25,10 +25,29 @@ Given the CV sections and JD requirements, return ONLY valid JSON:
 }
 Be accurate: match_score should reflect true overlap. Return ONLY the JSON."""
 
+RECOMMEND_SYSTEM = """You are a career advisor helping a candidate tailor their CV to a job description.
+The skill overlap has already been computed. Given the CV sections, the JD requirements and
+the matched and missing skills, return ONLY valid JSON:
+{
+  "recommendations": ["specific actionable recommendations to improve the CV for this role"]
+}
+Return ONLY the JSON."""
+
+# Prompts behind a match report (requirement extraction is covered by hashing its result)
+MATCH_PROMPT_VERSION = prompt_version(1, MATCH_SYSTEM, RECOMMEND_SYSTEM)
+
+
+def _cv_text(cv_sections: dict[str, str]) -> str:
+    return "\n\n".join(
+        f"=== {name.upper()} ===\n{content}"
+        for name, content in cv_sections.items()
+    )
+
 
 async def extract_jd_requirements(jd_text: str) -> dict:
-    response = await _client.chat.completions.create(
-        model="gpt-4o",
+    content = await llm_gateway.complete(
+        "jd_extract",
+        model=MODEL,
         response_format={"type": "json_object"},
         messages=[
             {"role": "system", "content": EXTRACT_SYSTEM},
@@ -36,7 +55,7 @@ async def extract_jd_requirements(jd_text: str) -> dict:
         ],
         temperature=0.2,
     )
-    result = json.loads(response.choices[0].message.content)
+    result = json.loads(content)
     return {
         "hard_skills": result.get("hard_skills", []),
         "soft_skills": result.get("soft_skills", []),
@@ -46,14 +65,12 @@ async def extract_jd_requirements(jd_text: str) -> dict:
 
 
 async def match_cv_to_jd(cv_sections: dict[str, str], jd_requirements: dict) -> dict:
-    cv_text = "\n\n".join(
-        f"=== {name.upper()} ===\n{content}"
-        for name, content in cv_sections.items()
-    )
+    cv_text = _cv_text(cv_sections)
     jd_text = json.dumps(jd_requirements, indent=2)
 
-    response = await _client.chat.completions.create(
-        model="gpt-4o",
+    content = await llm_gateway.complete(
+        "cv_jd_match",
+        model=MODEL,
         response_format={"type": "json_object"},
         messages=[
             {"role": "system", "content": MATCH_SYSTEM},
@@ -64,10 +81,36 @@ async def match_cv_to_jd(cv_sections: dict[str, str], jd_requirements: dict) ->
         ],
         temperature=0.2,
     )
-    result = json.loads(response.choices[0].message.content)
+    result = json.loads(content)
     return {
         "match_score": int(result.get("match_score", 0)),
         "matched_skills": result.get("matched_skills", []),
         "missing_skills": result.get("missing_skills", []),
         "recommendations": result.get("recommendations", []),
     }
+
+
+async def recommend_improvements(cv_sections: dict[str, str], jd_requirements: dict, local_match: dict) -> list[str]:
+    """Recommendations only, for a match scored by skill_matcher."""
+    overlap = {
+        "matched_skills": local_match["matched_skills"],
+        "missing_skills": local_match["missing_skills"],
+    }
+    content = await llm_gateway.complete(
+        "cv_jd_recommend",
+        model=MODEL,
+        response_format={"type": "json_object"},
+        messages=[
+            {"role": "system", "content": RECOMMEND_SYSTEM},
+            {
+                "role": "user",
+                "content": (
+                    f"CV:\n{_cv_text(cv_sections)}\n\n"
+                    f"JD Requirements:\n{json.dumps(jd_requirements, indent=2)}\n\n"
+                    f"Skill overlap:\n{json.dumps(overlap, indent=2)}"
+                ),
+            },
+        ],
+        temperature=0.2,
+    )
+    return json.loads(content).get("recommendations", [])
@@ -0,0 +1,146 @@
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy import select
+
+from backend.database import ReadSessionLocal
+from backend.models.db_models import JobDescription
+from backend.services.candidate_index import SKIPPED_SECTIONS
+from backend.services.skill_matcher import GROUP_WEIGHTS, dedupe_skills, skill_terms, term_counts
+
+# Requirement groups a JD is indexed by
+INDEXED_GROUPS = ("hard_skills", "keywords")
+_LATENCY_WINDOW = 1000
+
+
+def _timestamp(value: datetime) -> float:
+    # SQLite hands back naive datetimes; they are stored in UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class JobIndex:
+    """
+    Ranks stored JDs for one CV. Each JD is a row of requirement weights over
+    terms (summing to 1), so matrix @ cv_vector is the weighted share of the
+    JD's hard skills and keywords that the CV covers. A skill that maps to
+    several words is split evenly between them. JDs are few and never change
+    once extracted, so the matrix is simply rebuilt after additions.
+    """
+
+    def __init__(self):
+        self._vocabulary: dict[str, int] = {}
+        self._rows: dict[int, tuple[dict[int, float], float]] = {}
+        self._matrix: sp.csr_matrix | None = None
+        self._jd_ids = np.zeros(0, dtype=np.int64)
+        self._created = np.zeros(0, dtype=np.float64)
+        self.searches = 0
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, jd_id: int, jd_requirements: dict, created_at: datetime) -> None:
+        groups = {g: dedupe_skills(jd_requirements.get(g) or []) for g in INDEXED_GROUPS}
+        weight_total = sum(GROUP_WEIGHTS[g] for g, skills in groups.items() if skills)
+        weights: dict[int, float] = {}
+        for group, skills in groups.items():
+            for skill in skills:
+                terms = skill_terms(skill)
+                if not terms:
+                    continue
+                share = GROUP_WEIGHTS[group] / weight_total / len(skills) / len(terms)
+                for term in terms:
+                    term_id = self._vocabulary.setdefault(term, len(self._vocabulary))
+                    weights[term_id] = weights.get(term_id, 0.0) + share
+        self._rows[jd_id] = (weights, _timestamp(created_at))
+        self._matrix = None
+
+    def _build(self) -> None:
+        rows, cols, data = [], [], []
+        jd_ids = sorted(self._rows)
+        for row, jd_id in enumerate(jd_ids):
+            weights = self._rows[jd_id][0]
+            rows.extend([row] * len(weights))
+            cols.extend(weights)
+            data.extend(weights.values())
+        self._matrix = sp.csr_matrix(
+            (np.asarray(data, dtype=np.float32), (rows, cols)),
+            shape=(len(jd_ids), len(self._vocabulary)),
+        )
+        self._jd_ids = np.asarray(jd_ids, dtype=np.int64)
+        self._created = np.asarray([self._rows[j][1] for j in jd_ids], dtype=np.float64)
+
+    def search(
+        self,
+        cv_sections: dict[str, str],
+        k: int = 10,
+        offset: int = 0,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> tuple[list[tuple[int, float]], int]:
+        """One page of (jd_id, score 0..1), best first, and the number of JDs with any overlap."""
+        started = time.perf_counter()
+        if self._matrix is None:
+            self._build()
+        terms = term_counts({n: c for n, c in cv_sections.items() if n not in SKIPPED_SECTIONS})
+        term_ids = [self._vocabulary[t] for t in terms if t in self._vocabulary]
+        cv_vector = np.zeros(len(self._vocabulary), dtype=np.float32)
+        cv_vector[term_ids] = 1.0
+        scores = self._matrix @ cv_vector
+
+        mask = scores > 0
+        if created_after is not None:
+            mask &= self._created >= _timestamp(created_after)
+        if created_before is not None:
+            mask &= self._created < _timestamp(created_before)
+        candidates = np.flatnonzero(mask)
+        total = len(candidates)
+
+        end = min(offset + k, total)
+        page: list[tuple[int, float]] = []
+        if offset < end:
+            # Sort only the first `end` plus anything tied with the last of them, so
+            # pages stay stable (ties: older JD first)
+            if end < total:
+                cutoff = -np.partition(-scores[candidates], end - 1)[end - 1]
+                candidates = candidates[scores[candidates] >= cutoff]
+            order = np.lexsort((self._jd_ids[candidates], -scores[candidates]))
+            chosen = candidates[order][offset:end]
+            page = [(int(self._jd_ids[i]), float(scores[i])) for i in chosen]
+
+        self.searches += 1
+        self._latencies.append(time.perf_counter() - started)
+        return page, total
+
+    async def load(self) -> None:
+        async with ReadSessionLocal() as db:
+            result = await db.execute(
+                select(JobDescription.id, JobDescription.extracted_requirements, JobDescription.created_at)
+                .where(JobDescription.extracted_requirements.is_not(None))
+            )
+            for jd_id, requirements, created_at in result.all():
+                self.add(jd_id, requirements, created_at)
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        return {
+            "jobs": len(self._rows),
+            "terms": len(self._vocabulary),
+            "searches": self.searches,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+        }
+
+
+job_index = JobIndex()
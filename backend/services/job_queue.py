@@ -0,0 +1,454 @@
+import asyncio
+import os
+import socket
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from backend.config import settings
+from backend.database import AsyncSessionLocal, ReadSessionLocal
+from backend.models.db_models import Job
+
+# handler(payload, db) -> result stored on the job
+Handler = Callable[[dict, AsyncSession], Awaitable[dict | None]]
+# on_failure(payload, error, db) once the job is failed or dead; on_success(payload, result) in the API process
+FailureHook = Callable[[dict, str, AsyncSession], Awaitable[None]]
+SuccessHook = Callable[[dict, dict | None], Awaitable[None]]
+
+# Higher runs first: interview turns keep a user waiting on every answer, bulk analysis can queue
+PRIORITY_INTERACTIVE = 10
+PRIORITY_NORMAL = 0
+PRIORITY_BULK = -10
+
+# failed: not worth retrying (4xx); dead: retries exhausted, kept as a dead letter
+FINISHED_STATUSES = ("succeeded", "failed", "dead")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _describe(error: Exception) -> tuple[str, bool]:
+    """Error text and whether retrying could help."""
+    if isinstance(error, HTTPException):
+        return str(error.detail), error.status_code >= 500
+    return f"{type(error).__name__}: {error}", True
+
+
+class _Kind:
+    def __init__(
+        self,
+        handler: Handler,
+        priority: int,
+        on_failure: FailureHook | None,
+        on_success: SuccessHook | None,
+        no_retry: str | None,
+    ):
+        self.handler = handler
+        self.priority = priority
+        self.on_failure = on_failure
+        self.on_success = on_success
+        self.no_retry = no_retry
+
+
+class JobQueue:
+    """
+    Runs slow work (LLM calls, text extraction) outside request handlers. Jobs
+    are rows of the jobs table; workers are asyncio tasks, in the API process
+    (JOB_WORKERS) and in `python -m backend.cli worker` processes.
+
+    A worker claims the highest-priority queued row with a conditional UPDATE
+    (skipping rows behind an unfinished job with the same serial_key) and
+    holds it under a lease that a heartbeat renews. A row whose lease ran
+    out (its worker died) is claimable again. Results and errors are written
+    only while the lease is still ours, so a worker that lost its job cannot
+    overwrite the new attempt. Failures are retried with exponential backoff;
+    after max_attempts the job is dead-lettered (status dead) and can be
+    requeued from the API. Client errors (HTTPException 4xx) fail at once.
+
+    on_success hooks keep the API process's in-memory indexes in step with
+    jobs that other processes ran: the API process follows newly succeeded
+    jobs of hooked kinds in the table.
+    """
+
+    def __init__(self):
+        self._kinds: dict[str, _Kind] = {}
+        self._workers: list[asyncio.Task] = []
+        self._follower: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._waiters: dict[int, list[asyncio.Future]] = {}
+        self._stopping = False
+        self.worker_id = ""
+        self.enqueued = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self.dead = 0
+        self.leases_lost = 0
+        self.running = 0
+
+    def handler(
+        self,
+        kind: str,
+        priority: int = PRIORITY_NORMAL,
+        on_failure: FailureHook | None = None,
+        on_success: SuccessHook | None = None,
+        no_retry: str | None = None,
+    ) -> Callable[[Handler], Handler]:
+        """
+        no_retry: why a failed job of this kind must not be requeued (its
+        on_failure discards the input); POST /api/jobs/{id}/retry answers 409 with it.
+        """
+        def register(fn: Handler) -> Handler:
+            self._kinds[kind] = _Kind(fn, priority, on_failure, on_success, no_retry)
+            return fn
+        return register
+
+    def no_retry_reason(self, kind: str) -> str | None:
+        return self._kinds[kind].no_retry if kind in self._kinds else None
+
+    async def find(self, db: AsyncSession, kind: str, idempotency_key: str) -> Job | None:
+        return await db.scalar(select(Job).where(Job.kind == kind, Job.idempotency_key == idempotency_key))
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        kind: str,
+        payload: dict,
+        idempotency_key: str | None = None,
+        priority: int | None = None,
+        serial_key: str | None = None,
+    ) -> Job:
+        """
+        Add a job and commit the session, so rows the caller added in it (e.g.
+        the pending JD) land together with the job. A repeated idempotency key
+        returns the existing job and rolls the caller's changes back.
+        """
+        if idempotency_key:
+            existing = await self.find(db, kind, idempotency_key)
+            if existing is not None:
+                await db.rollback()
+                return existing
+        if priority is None:
+            priority = self._kinds[kind].priority if kind in self._kinds else PRIORITY_NORMAL
+        job = Job(
+            kind=kind,
+            payload=payload,
+            priority=priority,
+            max_attempts=settings.job_max_attempts,
+            idempotency_key=idempotency_key,
+            serial_key=serial_key,
+        )
+        db.add(job)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Same key submitted concurrently
+            await db.rollback()
+            existing = await self.find(db, kind, idempotency_key) if idempotency_key else None
+            if existing is None:
+                raise
+            return existing
+        self.enqueued += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def requeue(self, db: AsyncSession, job: Job) -> None:
+        """Give a failed or dead job a fresh set of attempts."""
+        job.status = "queued"
+        job.attempts = 0
+        job.run_after = _now()
+        job.finished_at = None
+        job.worker_id = None
+        job.lease_expires_at = None
+        await db.commit()
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def wait(self, job_id: int, timeout: float) -> None:
+        """Return once the job finishes (in any process), or after `timeout` seconds."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        waiter = loop.create_future()
+        self._waiters.setdefault(job_id, []).append(waiter)
+        try:
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter), min(remaining, settings.job_poll_seconds))
+                    return
+                except TimeoutError:
+                    pass
+                # Finished in another process: nothing resolves the waiter, so look at the row
+                async with ReadSessionLocal() as db:
+                    status = await db.scalar(select(Job.status).where(Job.id == job_id))
+                if status is None or status in FINISHED_STATUSES:
+                    return
+        finally:
+            waiters = self._waiters.get(job_id, [])
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters:
+                self._waiters.pop(job_id, None)
+
+    def _notify(self, job_id: int) -> None:
+        for waiter in self._waiters.pop(job_id, []):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    # ── Workers ─────────────────────────────────────────────────────────────
+
+    async def start(self, workers: int, follow: bool = True) -> None:
+        """
+        Start `workers` worker tasks. With follow=True (the API process) the
+        on_success hooks also run for jobs that other processes finish.
+        """
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._workers = [asyncio.create_task(self._work()) for _ in range(workers)]
+        if follow and any(kind.on_success for kind in self._kinds.values()):
+            # Hooks are idempotent, so overlap with the startup index load is harmless
+            self._follower = asyncio.create_task(self._follow())
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """Let running jobs finish for up to `timeout`, then cancel and requeue them."""
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        tasks = self._workers + ([self._follower] if self._follower else [])
+        if self._workers:
+            await asyncio.wait(self._workers, timeout=timeout)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._follower = None
+        # Hand cancelled jobs back without counting the interrupted attempt
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.status == "running", Job.worker_id == self.worker_id)
+                .values(status="queued", attempts=Job.attempts - 1, worker_id=None, lease_expires_at=None)
+            )
+            await db.commit()
+
+    async def _work(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            job = await self._claim()
+            if job is None:
+                # Woken by enqueue(); the timeout picks up retries, expired leases and other processes' jobs
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.job_poll_seconds)
+                except TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _claim(self) -> Job | None:
+        async with AsyncSessionLocal() as db:
+            while True:
+                now = _now()
+                earlier = aliased(Job)
+                blocked = (
+                    select(earlier.id)
+                    .where(
+                        earlier.serial_key == Job.serial_key,
+                        earlier.id < Job.id,
+                        earlier.status.in_(("queued", "running")),
+                    )
+                    .exists()
+                )
+                claimable = and_(
+                    or_(
+                        and_(Job.status == "queued", Job.run_after <= now),
+                        and_(Job.status == "running", Job.lease_expires_at < now),
+                    ),
+                    or_(Job.serial_key.is_(None), ~blocked),
+                )
+                row = (await db.execute(
+                    select(Job.id, Job.status, Job.attempts, Job.max_attempts)
+                    .where(claimable)
+                    .order_by(Job.priority.desc(), Job.id)
+                    .limit(1)
+                )).first()
+                if row is None:
+                    return None
+                if row.status == "running" and row.attempts >= row.max_attempts:
+                    # Its worker died during the last attempt
+                    await self._dead_letter(db, row.id, "Worker lease expired", and_(Job.id == row.id, claimable))
+                    continue
+                claimed = await db.execute(
+                    update(Job)
+                    .where(Job.id == row.id, claimable)
+                    .values(
+                        status="running",
+                        attempts=Job.attempts + 1,
+                        worker_id=self.worker_id,
+                        lease_expires_at=now + timedelta(seconds=settings.job_lease_seconds),
+                        started_at=now,
+                    )
+                )
+                await db.commit()
+                if claimed.rowcount == 1:
+                    return await db.get(Job, row.id)
+
+    def _holding(self, job_id: int):
+        return and_(Job.id == job_id, Job.status == "running", Job.worker_id == self.worker_id)
+
+    async def _call(self, kind: _Kind, payload: dict) -> dict | None:
+        async with AsyncSessionLocal() as db:
+            return await kind.handler(payload, db)
+
+    async def _run(self, job: Job) -> None:
+        kind = self._kinds.get(job.kind)
+        self.running += 1
+        task = None
+        try:
+            if kind is None:
+                raise HTTPException(status_code=400, detail=f"Unknown job kind: {job.kind}")
+            task = asyncio.create_task(self._call(kind, job.payload))
+            while not task.done():
+                await asyncio.wait({task}, timeout=settings.job_lease_seconds / 3)
+                if not task.done() and not await self._heartbeat(job.id):
+                    # Lease expired and another worker took the job over
+                    task.cancel()
+                    self.leases_lost += 1
+                    return
+            result = task.result()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._record_failure(job, e, kind)
+        else:
+            async with AsyncSessionLocal() as db:
+                finished = await db.execute(
+                    update(Job).where(self._holding(job.id)).values(
+                        status="succeeded", result=result, error=None, finished_at=_now(), lease_expires_at=None,
+                        # Run just below when this process follows; else by the API process's follower
+                        hooks_done=self._follower is not None or kind.on_success is None,
+                    )
+                )
+                await db.commit()
+            if finished.rowcount != 1:
+                self.leases_lost += 1
+                return
+            self.succeeded += 1
+            self._notify(job.id)
+            if self._follower is not None and kind.on_success is not None:
+                await self._after_success(kind, job.payload, result)
+        finally:
+            if task is not None and not task.done():
+                task.cancel()
+            self.running -= 1
+
+    async def _heartbeat(self, job_id: int) -> bool:
+        async with AsyncSessionLocal() as db:
+            renewed = await db.execute(
+                update(Job)
+                .where(self._holding(job_id))
+                .values(lease_expires_at=_now() + timedelta(seconds=settings.job_lease_seconds))
+            )
+            await db.commit()
+        return renewed.rowcount == 1
+
+    async def _record_failure(self, job: Job, error: Exception, kind: _Kind | None) -> None:
+        message, retryable = _describe(error)
+        async with AsyncSessionLocal() as db:
+            if retryable and job.attempts < job.max_attempts:
+                delay = settings.job_retry_base_seconds * 2 ** (job.attempts - 1)
+                retried = await db.execute(
+                    update(Job).where(self._holding(job.id)).values(
+                        status="queued", error=message, run_after=_now() + timedelta(seconds=delay),
+                        worker_id=None, lease_expires_at=None,
+                    )
+                )
+                await db.commit()
+                if retried.rowcount == 1:
+                    self.retried += 1
+                return
+            if retryable:
+                await self._dead_letter(db, job.id, message, self._holding(job.id))
+                return
+            failed = await db.execute(
+                update(Job).where(self._holding(job.id)).values(
+                    status="failed", error=message, finished_at=_now(), lease_expires_at=None
+                )
+            )
+            if failed.rowcount == 1 and kind is not None and kind.on_failure is not None:
+                await kind.on_failure(job.payload, message, db)
+            await db.commit()
+        if failed.rowcount == 1:
+            self.failed += 1
+            self._notify(job.id)
+
+    async def _dead_letter(self, db: AsyncSession, job_id: int, message: str, condition) -> None:
+        dead = await db.execute(
+            update(Job).where(condition).values(
+                status="dead", error=message, finished_at=_now(), lease_expires_at=None
+            )
+        )
+        if dead.rowcount == 1:
+            job = await db.get(Job, job_id)
+            kind = self._kinds.get(job.kind)
+            if kind is not None and kind.on_failure is not None:
+                await kind.on_failure(job.payload, message, db)
+        await db.commit()
+        if dead.rowcount == 1:
+            self.dead += 1
+            self._notify(job_id)
+
+    # ── Success hooks ───────────────────────────────────────────────────────
+
+    async def _after_success(self, kind: _Kind, payload: dict, result: dict | None) -> None:
+        try:
+            await kind.on_success(payload, result)
+        except Exception:
+            # The job itself succeeded; a missed index update is repaired on the next restart
+            pass
+
+    async def _follow(self) -> None:
+        """
+        Run the hooks of jobs other processes finished. Tracked by the
+        hooks_done flag rather than by finish time, so jobs committed out of
+        order or with equal timestamps are not skipped.
+        """
+        hooked = [name for name, kind in self._kinds.items() if kind.on_success]
+        while not self._stopping:
+            await asyncio.sleep(settings.job_poll_seconds)
+            async with ReadSessionLocal() as db:
+                rows = (await db.execute(
+                    select(Job.id, Job.kind, Job.payload, Job.result)
+                    .where(Job.status == "succeeded", Job.hooks_done.is_(False), Job.kind.in_(hooked))
+                    .order_by(Job.id)
+                )).all()
+            if not rows:
+                continue
+            for row in rows:
+                await self._after_success(self._kinds[row.kind], row.payload, row.result)
+            async with AsyncSessionLocal() as db:
+                await db.execute(update(Job).where(Job.id.in_([row.id for row in rows])).values(hooks_done=True))
+                await db.commit()
+
+    def stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "workers": len(self._workers),
+            "enqueued": self.enqueued,
+            "running": self.running,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+            "dead": self.dead,
+            "leases_lost": self.leases_lost,
+        }
+
+
+job_queue = JobQueue()
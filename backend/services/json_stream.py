@@ -0,0 +1,113 @@
+import json
+from typing import Any
+
+# (kind, key, value): kind is "item" for an element of a top-level array,
+# "field" for any other top-level value once it is complete
+StreamEvent = tuple[str, str, Any]
+
+
+class JSONItemStream:
+    """
+    Incremental parser for a streamed JSON object such as
+    {"issues": [...], "tips": [...], "overall_score": 4.2}.
+
+    feed() takes raw text chunks and returns the values that became complete,
+    so each array element can be shown before the closing bracket arrives.
+    Values are only decoded once their slice is complete; anything that does
+    not decode is skipped and is still available in the full `text`.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = ""
+        self._key: str | None = None
+        self._in_array = False
+        self._value_start: int | None = None
+
+    @property
+    def text(self) -> str:
+        return self._buf
+
+    def feed(self, chunk: str) -> list[StreamEvent]:
+        self._buf += chunk
+        events: list[StreamEvent] = []
+        buf = self._buf
+        for i in range(self._pos, len(buf)):
+            c = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._close_string(i, events)
+                continue
+
+            if c.isspace():
+                continue
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                self._begin_value(i)
+            elif c in "{[":
+                if self._depth == 1 and c == "[" and self._key is not None:
+                    self._in_array = True
+                else:
+                    self._begin_value(i)
+                self._depth += 1
+            elif c in "}]":
+                if self._at_value_level() and self._value_start is not None:
+                    # Scalar directly before the closing bracket
+                    self._emit(buf[self._value_start:i], events)
+                self._depth -= 1
+                if self._depth == 1 and self._in_array:
+                    self._in_array = False
+                    self._key = None
+                elif self._at_value_level() and self._value_start is not None:
+                    self._emit(buf[self._value_start:i + 1], events)
+            elif c == ",":
+                if self._at_value_level() and self._value_start is not None:
+                    self._emit(buf[self._value_start:i], events)
+                if self._depth == 1:
+                    self._key = None
+            elif c == ":":
+                if self._depth == 1:
+                    self._key = self._last_string
+            else:
+                self._begin_value(i)
+        self._pos = len(buf)
+        return events
+
+    def _at_value_level(self) -> bool:
+        if self._key is None:
+            return False
+        return self._depth == (2 if self._in_array else 1)
+
+    def _begin_value(self, i: int) -> None:
+        if self._at_value_level() and self._value_start is None:
+            self._value_start = i
+
+    def _close_string(self, i: int, events: list[StreamEvent]) -> None:
+        if self._at_value_level() and self._value_start == self._string_start:
+            self._emit(self._buf[self._string_start:i + 1], events)
+        elif self._depth == 1:
+            try:
+                self._last_string = json.loads(self._buf[self._string_start:i + 1])
+            except ValueError:
+                self._last_string = ""
+
+    def _emit(self, raw: str, events: list[StreamEvent]) -> None:
+        self._value_start = None
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return
+        events.append(("item" if self._in_array else "field", self._key, value))
+        if not self._in_array:
+            self._key = None
@@ -0,0 +1,285 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from backend.config import settings
+
+
+def make_cache_key(
+    model: str,
+    messages: list[dict],
+    temperature: float,
+    response_format: dict | None,
+) -> str:
+    """Hash of everything that determines the completion for a given prompt."""
+    system_prompt = "\n".join(m["content"] for m in messages if m["role"] == "system")
+    user_message = "\n".join(m["content"] for m in messages if m["role"] != "system")
+    payload = json.dumps(
+        [model, system_prompt, user_message, temperature, response_format],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheBackend:
+    """Base class for response cache stores. Values are raw completion strings."""
+
+    name = "base"
+    # Backends that touch the disk; their lookups run in a thread (see get_async)
+    blocking = False
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - stored_at > self.ttl_seconds
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._set(key, value)
+
+    async def get_async(self, key: str) -> str | None:
+        if self.blocking:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def set_async(self, key: str, value: str) -> None:
+        if self.blocking:
+            await asyncio.to_thread(self.set, key, value)
+        else:
+            self.set(key, value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.name,
+                "size": self._size(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _get(self, key: str) -> str | None:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: str) -> None:
+        raise NotImplementedError
+
+    def _size(self) -> int:
+        raise NotImplementedError
+
+
+class BoundedStore(CacheBackend):
+    """
+    Disk-backed cache whose size limit is enforced in batches: counting the
+    entries is O(n), so it happens only when a running count of this
+    process's inserts passes `max_entries`, and then evicts down to
+    `max_entries - slack`, leaving room for `slack` more inserts.
+    """
+
+    blocking = True
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self.slack = max(1, max_entries // 10)
+        self._count = 0
+
+    def _inserted(self) -> None:
+        # Replacing a key counts too; the recount corrects it (and other workers' inserts)
+        self._count += 1
+        if self._count <= self.max_entries:
+            return
+        self._count = self._count_entries()
+        overflow = self._count - self.max_entries
+        if overflow > 0:
+            overflow += min(self.slack, self._count - overflow)
+            self._evict_oldest(overflow)
+            self.evictions += overflow
+            self._count -= overflow
+
+    def _size(self) -> int:
+        return self._count
+
+    def _count_entries(self) -> int:
+        raise NotImplementedError
+
+    def _evict_oldest(self, count: int) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU with TTL."""
+
+    name = "memory"
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def _get(self, key: str) -> str | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if self._expired(stored_at):
+            del self._data[key]
+            self.evictions += 1
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: str) -> None:
+        self._data[key] = (time.time(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def _size(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache(BoundedStore):
+    """Persistent cache in a standalone SQLite file, shared across workers."""
+
+    name = "sqlite"
+
+    def __init__(self, ttl_seconds: int, max_entries: int, directory: str):
+        super().__init__(ttl_seconds, max_entries)
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(Path(directory) / "llm_cache.db"), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed ON llm_cache (accessed_at)")
+        self._count = self._count_entries()
+
+    def _get(self, key: str) -> str | None:
+        row = self._conn.execute(
+            "SELECT value, stored_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, stored_at = row
+        if self._expired(stored_at):
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self.evictions += 1
+            self._count -= 1
+            return None
+        self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return value
+
+    def _set(self, key: str, value: str) -> None:
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, value, now, now),
+        )
+        self._inserted()
+
+    def _count_entries(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def _evict_oldest(self, count: int) -> None:
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN "
+            "(SELECT key FROM llm_cache ORDER BY accessed_at LIMIT ?)",
+            (count,),
+        )
+
+
+class DiskCache(BoundedStore):
+    """One file per entry under a directory; TTL is checked against the file mtime."""
+
+    name = "disk"
+
+    def __init__(self, ttl_seconds: int, max_entries: int, directory: str):
+        super().__init__(ttl_seconds, max_entries)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._count = self._count_entries()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            stored_at = path.stat().st_mtime
+            if self._expired(stored_at):
+                path.unlink(missing_ok=True)
+                self.evictions += 1
+                self._count -= 1
+                return None
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _set(self, key: str, value: str) -> None:
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(value, encoding="utf-8")
+        tmp.replace(path)
+        self._inserted()
+
+    def _count_entries(self) -> int:
+        return sum(1 for _ in self.directory.glob("*.json"))
+
+    def _evict_oldest(self, count: int) -> None:
+        entries = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for old in entries[:count]:
+            old.unlink(missing_ok=True)
+
+
+def _build_cache() -> CacheBackend | None:
+    backend = settings.llm_cache_backend.lower()
+    ttl = settings.llm_cache_ttl_seconds
+    max_entries = settings.llm_cache_max_entries
+    if backend == "memory":
+        return MemoryCache(ttl, max_entries)
+    if backend == "sqlite":
+        return SQLiteCache(ttl, max_entries, settings.llm_cache_path)
+    if backend == "disk":
+        return DiskCache(ttl, max_entries, settings.llm_cache_path)
+    if backend in ("", "none", "off"):
+        return None
+    raise ValueError(f"Unknown LLM cache backend: {settings.llm_cache_backend}")
+
+
+cache = _build_cache()
+
+
+def cache_stats() -> dict:
+    if cache is None:
+        return {"backend": "none"}
+    return cache.stats()
@@ -0,0 +1,424 @@
+import asyncio
+import random
+import time
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI
+
+from backend.config import settings
+from backend.services.llm_cache import cache, make_cache_key
+
+# Token estimate for rate limiting: ~4 characters per prompt token plus a typical JSON answer.
+# Corrected with the real usage once the response arrives.
+_CHARS_PER_TOKEN = 4
+_COMPLETION_TOKENS_ESTIMATE = 800
+
+_BACKOFF_BASE_SECONDS = 0.5
+_BACKOFF_CAP_SECONDS = 20.0
+_LATENCY_WINDOW = 1000
+
+
+class LLMDeadlineExceeded(Exception):
+    pass
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute, holding at most one minute's worth. 0 disables it."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.waited_seconds = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float, deadline: float) -> None:
+        if not self.rate:
+            return
+        amount = min(amount, self.capacity)
+        # Held while sleeping, so waiters are served in arrival order
+        async with self._lock:
+            self._refill()
+            wait = (amount - self.tokens) / self.rate
+            if wait > 0:
+                if time.monotonic() + wait > deadline:
+                    raise LLMDeadlineExceeded("Rate limit wait would exceed the request deadline")
+                self.waited_seconds += wait
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= amount
+
+    def credit(self, amount: float) -> None:
+        """Give back (or, if negative, charge) the difference between estimated and actual usage."""
+        if self.rate:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _RouteStats:
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "in_flight": self.in_flight,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        }
+
+
+class _Flight:
+    """One upstream call shared by every identical request made while it runs."""
+
+    def __init__(self):
+        self.task: asyncio.Task | None = None
+        self.waiters = 0
+        # Streams only: the text received so far, so late joiners can catch up
+        self.parts: list[str] = []
+        self._updated = asyncio.Event()
+
+    def notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def updated(self) -> None:
+        await self._updated.wait()
+
+    def leave(self) -> None:
+        # The call is cancelled only once nobody is waiting for it
+        self.waiters -= 1
+        if self.waiters == 0 and not self.task.done():
+            self.task.cancel()
+
+
+def _estimate_tokens(messages: list[dict]) -> int:
+    chars = sum(len(m["content"]) for m in messages)
+    return chars // _CHARS_PER_TOKEN + _COMPLETION_TOKENS_ESTIMATE
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    # Includes APITimeoutError
+    return isinstance(error, APIConnectionError)
+
+
+def _backoff(attempt: int, error: Exception) -> float:
+    """Full-jitter exponential backoff, but never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(_BACKOFF_CAP_SECONDS, _BACKOFF_BASE_SECONDS * 2 ** attempt))
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            delay = max(delay, float(response.headers.get("retry-after", 0)))
+        except ValueError:
+            pass
+    return delay
+
+
+class LLMGateway:
+    """
+    Single entry point for chat completions: one pooled HTTP client, a global and
+    a per-route concurrency cap, request and token rate limits, retries with
+    jittered backoff inside a per-call deadline, the response cache,
+    single-flight for identical concurrent requests, and latency / token
+    metrics per route (call site).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int,
+        max_concurrency: int,
+        route_concurrency: int,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        timeout_seconds: float,
+        deadline_seconds: float,
+        max_retries: int,
+    ):
+        self.max_connections = max_connections
+        self.route_concurrency = route_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max_retries
+        self._client: AsyncOpenAI | None = None
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._routes: dict[str, asyncio.Semaphore] = {}
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._stats: dict[str, _RouteStats] = defaultdict(_RouteStats)
+        self._flights: dict[str, _Flight] = {}
+        self._stream_flights: dict[str, _Flight] = {}
+
+    def _get_client(self) -> AsyncOpenAI:
+        if self._client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=30,
+                ),
+                timeout=httpx.Timeout(self.timeout_seconds, connect=5.0),
+            )
+            # Retries are handled here, with the deadline in mind
+            self._client = AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                base_url=settings.openai_base_url or None,
+                http_client=http_client,
+                max_retries=0,
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _slot(self, route: str):
+        if route not in self._routes:
+            self._routes[route] = asyncio.Semaphore(self.route_concurrency)
+        stats = self._stats[route]
+        async with self._routes[route], self._global:
+            stats.calls += 1
+            stats.in_flight += 1
+            started = time.perf_counter()
+            try:
+                yield stats
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.in_flight -= 1
+                stats.latencies.append(time.perf_counter() - started)
+
+    async def _create(self, stats: _RouteStats, kwargs: dict, estimate: int, deadline: float):
+        attempt = 0
+        while True:
+            await self._requests.acquire(1, deadline)
+            await self._tokens.acquire(estimate, deadline)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMDeadlineExceeded("LLM call deadline exceeded")
+            try:
+                return await self._get_client().chat.completions.create(
+                    **kwargs, timeout=min(self.timeout_seconds, remaining)
+                )
+            except (APIStatusError, APIConnectionError) as e:
+                # A rejected request does not use up the token budget
+                self._tokens.credit(estimate)
+                if getattr(e, "status_code", None) == 429:
+                    stats.rate_limited += 1
+                if not _retryable(e) or attempt >= self.max_retries:
+                    raise
+                delay = _backoff(attempt, e)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                attempt += 1
+                stats.retries += 1
+                await asyncio.sleep(delay)
+
+    def _record_usage(self, stats: _RouteStats, usage, estimate: int) -> None:
+        if usage is None:
+            return
+        stats.prompt_tokens += usage.prompt_tokens
+        stats.completion_tokens += usage.completion_tokens
+        self._tokens.credit(estimate - usage.total_tokens)
+
+    def _join(self, route: str, key: str, flights: dict[str, _Flight], start) -> _Flight:
+        """Return the in-flight call for `key`, starting start(flight) if there is none."""
+        flight = flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            flight.task = asyncio.create_task(start(flight))
+            flights[key] = flight
+
+            def done(_):
+                if flights.get(key) is flight:
+                    del flights[key]
+                flight.notify()
+
+            flight.task.add_done_callback(done)
+        else:
+            self._stats[route].coalesced += 1
+        flight.waiters += 1
+        return flight
+
+    async def complete(
+        self,
+        route: str,
+        *,
+        model: str,
+        messages: list[dict],
+        temperature: float,
+        response_format: dict | None = None,
+        deadline_seconds: float | None = None,
+    ) -> str:
+        """
+        Return the completion text, calling the API only on a cache miss.
+        Identical concurrent calls share one upstream request and its result or error.
+        """
+        key = make_cache_key(model, messages, temperature, response_format)
+        if cache is not None:
+            cached = await cache.get_async(key)
+            if cached is not None:
+                self._stats[route].cache_hits += 1
+                return cached
+
+        kwargs = {"model": model, "messages": messages, "temperature": temperature}
+        if response_format is not None:
+            kwargs["response_format"] = response_format
+        flight = self._join(
+            route, key, self._flights,
+            lambda _: self._complete_upstream(route, key, kwargs, deadline_seconds),
+        )
+        try:
+            # shield: one caller giving up does not cancel the call for the others
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.leave()
+
+    async def _complete_upstream(self, route: str, key: str, kwargs: dict, deadline_seconds: float | None) -> str:
+        estimate = _estimate_tokens(kwargs["messages"])
+        deadline = time.monotonic() + (deadline_seconds or self.deadline_seconds)
+        async with self._slot(route) as stats:
+            response = await self._create(stats, kwargs, estimate, deadline)
+            self._record_usage(stats, response.usage, estimate)
+        content = response.choices[0].message.content
+
+        if cache is not None and content:
+            await cache.set_async(key, content)
+        return content
+
+    async def stream(
+        self,
+        route: str,
+        *,
+        model: str,
+        messages: list[dict],
+        temperature: float,
+        response_format: dict | None = None,
+        deadline_seconds: float | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yield the completion text as it is generated. A cache hit is yielded as a
+        single chunk; a fully received stream is cached under the same key as
+        complete(). Only opening the stream is retried. A caller that joins an
+        identical in-flight stream gets the text received so far, then follows it.
+        """
+        key = make_cache_key(model, messages, temperature, response_format)
+        if cache is not None:
+            cached = await cache.get_async(key)
+            if cached is not None:
+                self._stats[route].cache_hits += 1
+                yield cached
+                return
+
+        kwargs = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        if response_format is not None:
+            kwargs["response_format"] = response_format
+
+        async def produce(flight: _Flight) -> None:
+            async for delta in self._stream_upstream(route, key, kwargs, deadline_seconds):
+                flight.parts.append(delta)
+                flight.notify()
+
+        flight = self._join(route, key, self._stream_flights, produce)
+        try:
+            sent = 0
+            while True:
+                while sent < len(flight.parts):
+                    yield flight.parts[sent]
+                    sent += 1
+                if flight.task.done():
+                    # Re-raises the upstream error in every follower
+                    flight.task.result()
+                    return
+                await flight.updated()
+        finally:
+            flight.leave()
+
+    async def _stream_upstream(
+        self, route: str, key: str, kwargs: dict, deadline_seconds: float | None
+    ) -> AsyncIterator[str]:
+        estimate = _estimate_tokens(kwargs["messages"])
+        deadline = time.monotonic() + (deadline_seconds or self.deadline_seconds)
+        parts: list[str] = []
+        async with self._slot(route) as stats:
+            response_stream = await self._create(stats, kwargs, estimate, deadline)
+            # Closes the connection if the stream is cancelled
+            async with response_stream:
+                async for chunk in response_stream:
+                    self._record_usage(stats, chunk.usage, estimate)
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+
+        content = "".join(parts)
+        if cache is not None and content:
+            await cache.set_async(key, content)
+
+    def stats(self) -> dict:
+        return {
+            "throttled_seconds": {
+                "requests": round(self._requests.waited_seconds, 2),
+                "tokens": round(self._tokens.waited_seconds, 2),
+            },
+            "in_flight_keys": len(self._flights) + len(self._stream_flights),
+            "routes": {route: stats.snapshot() for route, stats in sorted(self._stats.items())},
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+llm_gateway = LLMGateway(
+    max_connections=settings.llm_max_connections,
+    max_concurrency=settings.llm_max_concurrency,
+    route_concurrency=settings.llm_route_concurrency,
+    requests_per_minute=settings.llm_requests_per_minute,
+    tokens_per_minute=settings.llm_tokens_per_minute,
+    timeout_seconds=settings.llm_timeout_seconds,
+    deadline_seconds=settings.llm_deadline_seconds,
+    max_retries=settings.llm_max_retries,
+)
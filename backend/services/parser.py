@@ -1,16 +1,110 @@
+import math
 import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
 from pathlib import Path
 
+# Below this page count the cost of fanning out outweighs the parallel speed-up
+PARALLEL_MIN_PAGES = 8
+PAGES_PER_CHUNK = 4
 
-def extract_text_from_pdf(path: str) -> str:
+
+def extract_short_pdf(path: str, char_budget: int = 0) -> tuple[str | None, int]:
+    """
+    Text and page count of a PDF, read in one pass when it has fewer than
+    PARALLEL_MIN_PAGES pages; text is None for a longer one, to be split by pages.
+    """
+    import pdfplumber
+    with pdfplumber.open(path) as pdf:
+        page_count = len(pdf.pages)
+        if page_count >= PARALLEL_MIN_PAGES:
+            return None, page_count
+        text = "\n".join(take_pages(_page_texts(pdf), char_budget))
+    return normalize_text(text), page_count
+
+
+def extract_pdf_page_range(path: str, start: int, stop: int) -> list[str]:
+    import pdfplumber
+    with pdfplumber.open(path) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages[start:stop]]
+
+
+def pdf_page_chunks(page_count: int, workers: int) -> list[tuple[int, int]]:
+    """Split pages into ranges small enough to spread over workers and to stop early."""
+    chunk = max(1, min(PAGES_PER_CHUNK, math.ceil(page_count / max(workers, 1))))
+    return [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+
+
+def take_pages(pages: Iterable[str], char_budget: int = 0) -> Iterator[str]:
+    """Skip empty pages and stop once char_budget characters were yielded (0 = no limit)."""
+    total = 0
+    for text in pages:
+        if not text:
+            continue
+        yield text
+        total += len(text)
+        if char_budget and total >= char_budget:
+            return
+
+
+def _page_texts(pdf) -> Iterator[str]:
+    for page in pdf.pages:
+        yield page.extract_text() or ""
+
+
+def _iter_pdf_pages_sequential(path: str) -> Iterator[str]:
+    import pdfplumber
+    with pdfplumber.open(path) as pdf:
+        yield from _page_texts(pdf)
+
+
+def _iter_pdf_pages_parallel(path: str, executor: Executor, workers: int) -> Iterator[str]:
     import pdfplumber
-    text_parts = []
     with pdfplumber.open(path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
-    return "\n".join(text_parts)
+        page_count = len(pdf.pages)
+        if page_count < PARALLEL_MIN_PAGES:
+            yield from _page_texts(pdf)
+            return
+    futures = [
+        executor.submit(extract_pdf_page_range, path, start, stop)
+        for start, stop in pdf_page_chunks(page_count, workers)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        # Runs on early stop too: drop chunks that have not started yet
+        for future in futures:
+            future.cancel()
+
+
+def iter_pdf_pages(
+    path: str,
+    executor: Executor | None = None,
+    workers: int = 1,
+    char_budget: int = 0,
+) -> Iterator[str]:
+    """
+    Yield the text of each non-empty PDF page, in page order.
+    With an executor, page ranges are extracted in parallel on its `workers`.
+    """
+    if executor is not None:
+        pages = _iter_pdf_pages_parallel(path, executor, workers)
+    else:
+        pages = _iter_pdf_pages_sequential(path)
+    try:
+        yield from take_pages(pages, char_budget)
+    finally:
+        pages.close()
+
+
+def extract_text_from_pdf(
+    path: str,
+    executor: Executor | None = None,
+    workers: int = 1,
+    char_budget: int = 0,
+) -> str:
+    return "\n".join(iter_pdf_pages(path, executor=executor, workers=workers, char_budget=char_budget))
 
 
 def extract_text_from_txt(path: str) -> str:
@@ -36,10 +130,10 @@ def normalize_text(text: str) -> str:
     return text.strip()
 
 
-def extract_text(path: str) -> str:
+def extract_text(path: str, char_budget: int = 0) -> str:
     ext = Path(path).suffix.lower()
     if ext == ".pdf":
-        raw = extract_text_from_pdf(path)
+        raw = extract_text_from_pdf(path, char_budget=char_budget)
     elif ext == ".txt":
         raw = extract_text_from_txt(path)
     elif ext == ".docx":
@@ -0,0 +1,87 @@
+import hashlib
+import json
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.db_models import Report
+from backend.services import repository
+
+# Reports as a cache of LLM results: each cv and match report stores a
+# fingerprint of its inputs, and a request whose inputs hash the same gets the
+# stored report instead of a new LLM call. Editing or re-segmenting a CV clears
+# the fingerprints of its reports (they stay in the history).
+
+CACHED_TYPES = ("cv", "match")
+
+
+def digest(value) -> str:
+    """Stable hash of a JSON-serializable value (dict keys sorted, list order kept)."""
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def sections_hash(cv_sections: dict[str, str]) -> str:
+    # Sections go into the prompt in this order, so it is part of the input
+    return digest(list(cv_sections.items()))
+
+
+def prompt_version(revision: int, *prompts: str) -> str:
+    """
+    Version of an LLM call's prompt: editing a system prompt changes it by
+    itself; bump `revision` when message building or parsing changes.
+    """
+    return f"{revision}:{digest(prompts)[:12]}"
+
+
+def fingerprint(**inputs) -> str:
+    return digest(inputs)
+
+
+class ReportCache:
+    def __init__(self):
+        self.hits = {entity_type: 0 for entity_type in CACHED_TYPES}
+        self.misses = {entity_type: 0 for entity_type in CACHED_TYPES}
+        self.invalidated = 0
+
+    async def lookup(
+        self, db: AsyncSession, entity_type: str, entity_id: int, input_fingerprint: str, *criteria
+    ) -> Report | None:
+        """Newest report of the entity with this fingerprint. One query (ix_reports_fingerprint)."""
+        report = await repository.latest_report(
+            db, entity_type, entity_id, Report.input_fingerprint == input_fingerprint, *criteria
+        )
+        if report is None:
+            self.misses[entity_type] += 1
+        else:
+            self.hits[entity_type] += 1
+        return report
+
+    async def invalidate(self, db: AsyncSession, cv_id: int) -> int:
+        """Stop reusing the analysis and match reports of a CV; part of the caller's transaction."""
+        result = await db.execute(
+            update(Report)
+            .where(
+                Report.entity_type.in_(CACHED_TYPES),
+                Report.entity_id == cv_id,
+                Report.input_fingerprint.is_not(None),
+            )
+            .values(input_fingerprint=None)
+        )
+        self.invalidated += result.rowcount
+        return result.rowcount
+
+    def stats(self) -> dict:
+        stats = {}
+        for entity_type in CACHED_TYPES:
+            hits, misses = self.hits[entity_type], self.misses[entity_type]
+            stats[entity_type] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            }
+        stats["invalidated"] = self.invalidated
+        return stats
+
+
+report_cache = ReportCache()
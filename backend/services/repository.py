@@ -0,0 +1,116 @@
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, raiseload, selectinload
+
+from backend.models.db_models import CV, CVSection, Interview, Job, Message, Report
+from backend.utils.file_utils import delete_unless_pending
+
+# Queries shared by the API handlers, each loading what its caller needs in as
+# few round trips as possible. Relationships not loaded here raise on access
+# (raiseload) instead of issuing a query per row.
+
+async def exists(db: AsyncSession, model, row_id: int) -> bool:
+    """Primary-key check that loads no columns."""
+    return await db.scalar(select(model.id).where(model.id == row_id)) is not None
+
+
+async def release_file(db: AsyncSession, file_path: str | None) -> bool:
+    """
+    Delete a stored upload nothing refers to any more: no CV row, no queued or
+    running cv_upload job, no upload in this process between saving and
+    committing it. The only way stored uploads are deleted; returns whether it was.
+    """
+    if not file_path:
+        return False
+    if await db.scalar(select(CV.id).where(CV.file_path == file_path).limit(1)) is not None:
+        return False
+    payloads = await db.scalars(
+        select(Job.payload).where(Job.kind == "cv_upload", Job.status.in_(("queued", "running")))
+    )
+    if any(payload.get("file_path") == file_path for payload in payloads):
+        return False
+    return delete_unless_pending(file_path)
+
+
+async def cv_with_sections(
+    db: AsyncSession, cv_id: int, raw_text: bool = True, sections: bool = True
+) -> CV | None:
+    """
+    CV and its sections: two queries (selectinload), however many sections.
+    raw_text=False leaves the raw text column unread, sections=False the sections.
+    """
+    options = [raiseload("*")]
+    if sections:
+        options.append(selectinload(CV.sections))
+    if not raw_text:
+        options.append(defer(CV.raw_text, raiseload=True))
+    return await db.scalar(select(CV).where(CV.id == cv_id).options(*options))
+
+
+async def sections_by_cv(db: AsyncSession, cv_ids: Iterable[int]) -> dict[int, dict[str, str]]:
+    """
+    Section name -> content for each existing CV, {"full_cv": raw_text} for CVs
+    without sections; missing CVs are left out. One query, plus one for the
+    raw text of unsegmented CVs.
+    """
+    cv_ids = list(cv_ids)
+    sections: dict[int, dict[str, str]] = {}
+    result = await db.execute(
+        select(CVSection.cv_id, CVSection.section_name, CVSection.content).where(CVSection.cv_id.in_(cv_ids))
+    )
+    for cv_id, name, content in result.all():
+        sections.setdefault(cv_id, {})[name] = content
+    unsegmented = [cv_id for cv_id in cv_ids if cv_id not in sections]
+    if unsegmented:
+        result = await db.execute(select(CV.id, CV.raw_text).where(CV.id.in_(unsegmented)))
+        for cv_id, raw_text in result.all():
+            sections[cv_id] = {"full_cv": raw_text}
+    return sections
+
+
+async def cv_sections(db: AsyncSession, cv_id: int) -> dict[str, str] | None:
+    """Sections of one CV (raw text if unsegmented), None if there is no such CV."""
+    return (await sections_by_cv(db, [cv_id])).get(cv_id)
+
+
+async def interview_with_messages(
+    db: AsyncSession, session_id: int, last_messages: int | None = None
+) -> tuple[Interview | None, list[Message]]:
+    """
+    Interview (plan and score totals included) and its last `last_messages`
+    messages in order, all of them for None. Two queries.
+    """
+    query = select(Interview).where(Interview.id == session_id)
+    if last_messages is None:
+        interview = await db.scalar(
+            query.options(selectinload(Interview.messages), raiseload("*")).execution_options(populate_existing=True)
+        )
+        return interview, list(interview.messages) if interview else []
+
+    interview = await db.scalar(query.options(raiseload("*")))
+    if interview is None or last_messages <= 0:
+        return interview, []
+    result = await db.execute(
+        select(Message)
+        .where(Message.interview_id == session_id)
+        .order_by(Message.id.desc())
+        .limit(last_messages)
+        .execution_options(populate_existing=True)
+    )
+    return interview, list(reversed(result.scalars().all()))
+
+
+def reports_newest_first(entity_type: str, entity_id: int, *criteria):
+    """Reports of an entity, newest first: ix_reports_entity (ix_reports_match with a jd_id criterion)."""
+    return (
+        select(Report)
+        .where(Report.entity_type == entity_type, Report.entity_id == entity_id, *criteria)
+        .order_by(Report.created_at.desc(), Report.id.desc())
+    )
+
+
+async def latest_report(db: AsyncSession, entity_type: str, entity_id: int, *criteria) -> Report | None:
+    """Newest report of an entity meeting the SQL `criteria`. One query."""
+    return await db.scalar(reports_newest_first(entity_type, entity_id, *criteria).limit(1))
@@ -12,6 +12,10 @@ SECTION_PATTERNS = [
         r"(about|objective|profile|overview)(\ me)?",
         r"career\ (objective|profile|summary)",
     ]),
+    # A "Tools " header followed only by whitespace has always been filed as "other"
+    ("other", [
+        r"tools?\ (?=\s*$)",
+    ]),
     ("skills", [
         r"(technical\ |core\ |key\ )?skills?",
         r"technologies?",
@@ -54,15 +58,18 @@ SECTION_PATTERNS = [
 
 
 def _build_pattern():
-    """Build a compiled regex that matches any section header."""
-    all_keywords = []
-    for _, patterns in SECTION_PATTERNS:
-        all_keywords.extend(patterns)
-    joined = "|".join(all_keywords)
+    """
+    Build one compiled regex that matches any section header line.
+    Each canonical section is a named group, so `match.lastgroup` also classifies it.
+    """
+    groups = "|".join(
+        f"(?P<{section_name}>{'|'.join(patterns)})"
+        for section_name, patterns in SECTION_PATTERNS
+    )
     # Match a line that IS a section header: short, has one of our keywords,
     # optionally ending with colon, possibly in ALL CAPS
     return re.compile(
-        rf"^[ \t]*(?P<header>(?:{joined})[:\s]*)[ \t]*$",
+        rf"^[ \t]*(?:{groups})[:\s]*[ \t]*$",
         re.IGNORECASE | re.MULTILINE,
     )
 
@@ -70,15 +77,6 @@ def _build_pattern():
 _SECTION_RE = _build_pattern()
 
 
-def _classify_header(header_text: str) -> str:
-    text = header_text.lower().strip()
-    for section_name, patterns in SECTION_PATTERNS:
-        for pat in patterns:
-            if re.search(pat, text, re.IGNORECASE):
-                return section_name
-    return "other"
-
-
 def segment_cv(text: str) -> dict[str, str]:
     """
     Split CV text into named sections.
@@ -93,8 +91,7 @@ def segment_cv(text: str) -> dict[str, str]:
     for line in lines:
         match = _SECTION_RE.match(line)
         if match:
-            header_text = match.group("header")
-            section_name = _classify_header(header_text)
+            section_name = match.lastgroup
             current_section = section_name
             if section_name not in sections:
                 sections[section_name] = []
@@ -0,0 +1,157 @@
+import asyncio
+from collections import OrderedDict
+
+import numpy as np
+from sqlalchemy import select
+
+from backend.config import settings
+from backend.database import ReadSessionLocal
+from backend.models.db_models import CV, JobDescription
+from backend.services.candidate_index import SKIPPED_SECTIONS
+from backend.services.embeddings import Embedder, embedder
+from backend.services.repository import sections_by_cv
+from backend.services.segmenter import SECTION_PATTERNS
+from backend.services.vector_store import VectorStore
+
+# Row labels of the CV store: index into this tuple
+SECTION_LABELS = tuple(dict.fromkeys([name for name, _ in SECTION_PATTERNS] + ["other", "full_cv"]))
+SYNC_BATCH_SIZE = 256
+# Embeddings of JDs missing from the store (a read-only process opened it earlier)
+JD_CACHE_SIZE = 256
+
+
+def _section_items(cv_sections: dict[str, str]) -> list[tuple[int, str]]:
+    return [
+        (SECTION_LABELS.index(name) if name in SECTION_LABELS else SECTION_LABELS.index("other"), content)
+        for name, content in cv_sections.items()
+        if name not in SKIPPED_SECTIONS and content.strip()
+    ]
+
+
+class SemanticIndex:
+    """
+    Embeddings of every CV section and every JD text in two memory-mapped
+    VectorStores, for similarity that keyword overlap misses. A CV scores as
+    its best-matching section.
+
+    The stores are opened read-only; the API process, the only one that
+    updates them, calls open_for_writing() at startup. Workers and the CLI
+    only read them.
+    """
+
+    def __init__(self, directory: str, embedder: Embedder, nprobe: int):
+        self.directory = directory
+        self.embedder = embedder
+        self.nprobe = nprobe
+        self.writable = False
+        self._jd_vectors: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._open_stores()
+
+    def _open_stores(self) -> None:
+        read_only = not self.writable
+        dim, name = self.embedder.dim, self.embedder.name
+        self.cv_sections = VectorStore(self.directory, "cv_sections", dim, name, read_only=read_only)
+        self.jds = VectorStore(self.directory, "jds", dim, name, read_only=read_only)
+
+    def open_for_writing(self) -> None:
+        self.writable = True
+        self._open_stores()
+
+    def _append_cvs(self, items: dict[int, list[tuple[int, str]]], vectors: np.ndarray) -> None:
+        keys, labels = [], []
+        for cv_id, sections in items.items():
+            self.cv_sections.delete(cv_id)
+            keys.extend([cv_id] * len(sections))
+            labels.extend(label for label, _ in sections)
+        if keys:
+            self.cv_sections.append(keys, labels, vectors)
+
+    async def add_cvs(self, cvs: dict[int, dict[str, str]]) -> None:
+        """Embed (in a thread) and store the sections of each CV, replacing earlier vectors."""
+        items = {cv_id: _section_items(sections) for cv_id, sections in cvs.items()}
+        texts = [content for sections in items.values() for _, content in sections]
+        vectors = await asyncio.to_thread(self.embedder.embed, texts)
+        self._append_cvs(items, vectors)
+        self.cv_sections.flush()
+
+    def remove_cv(self, cv_id: int) -> None:
+        self.cv_sections.delete(cv_id)
+        # Deleted rows stay on disk until enough of them pile up
+        if self.cv_sections.dead_rows() > self.cv_sections.count // 4:
+            self.cv_sections.compact()
+        else:
+            self.cv_sections.flush()
+
+    def add_jd(self, jd_id: int, text: str) -> None:
+        self.jds.delete(jd_id)
+        self.jds.append([jd_id], [0], self.embedder.embed([text]))
+        self.jds.flush()
+
+    def jd_vector(self, jd_id: int, text: str) -> np.ndarray:
+        """The JD's stored vector, else its embedding (kept: a JD's text never changes)."""
+        self.jds.refresh()
+        stored = self.jds.get(jd_id)
+        if stored is not None:
+            return stored[0]
+        vector = self._jd_vectors.get(jd_id)
+        if vector is None:
+            vector = self._jd_vectors[jd_id] = self.embedder.embed([text])[0]
+            if len(self._jd_vectors) > JD_CACHE_SIZE:
+                self._jd_vectors.popitem(last=False)
+        else:
+            self._jd_vectors.move_to_end(jd_id)
+        return vector
+
+    def rank_cvs(self, query: np.ndarray, k: int, approximate: bool = False) -> list[tuple[int, float, str]]:
+        """(cv_id, cosine, best section) for the k CVs closest to a query vector."""
+        self.cv_sections.refresh()
+        queries = query.reshape(1, -1)
+        if approximate:
+            hits = self.cv_sections.search_approximate(queries, k, self.nprobe)[0]
+        else:
+            hits = self.cv_sections.search(queries, k)[0]
+        return [(cv_id, score, SECTION_LABELS[label]) for cv_id, score, label in hits]
+
+    def similarity(self, cv_sections: dict[str, str], jd_id: int, jd_text: str) -> float:
+        """Cosine between the JD and the CV's best-matching section."""
+        sections = _section_items(cv_sections)
+        if not sections:
+            return 0.0
+        vectors = self.embedder.embed([content for _, content in sections])
+        return float(max(0.0, (vectors @ self.jd_vector(jd_id, jd_text)).max()))
+
+    async def sync(self) -> None:
+        """Embed CVs and JDs missing from the stores (new embedder, CLI ingest) and drop deleted ones."""
+        async with ReadSessionLocal() as db:
+            cv_ids = set((await db.execute(select(CV.id))).scalars().all())
+            for cv_id in self.cv_sections.ids() - cv_ids:
+                self.cv_sections.delete(cv_id)
+            missing = sorted(cv_ids - self.cv_sections.ids())
+            for i in range(0, len(missing), SYNC_BATCH_SIZE):
+                await self.add_cvs(await sections_by_cv(db, missing[i:i + SYNC_BATCH_SIZE]))
+            self.cv_sections.compact()
+            self.cv_sections.flush()
+
+            result = await db.execute(select(JobDescription.id, JobDescription.text))
+            jds = dict(result.all())
+            for jd_id in self.jds.ids() - set(jds):
+                self.jds.delete(jd_id)
+            missing = sorted(set(jds) - self.jds.ids())
+            if missing:
+                vectors = await asyncio.to_thread(self.embedder.embed, [jds[jd_id] for jd_id in missing])
+                for jd_id, vector in zip(missing, vectors):
+                    self.jds.append([jd_id], [0], vector.reshape(1, -1))
+            self.jds.compact()
+            self.jds.flush()
+
+    def stats(self) -> dict:
+        return {
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "cvs": len(self.cv_sections),
+            "cv_section_rows": self.cv_sections.count,
+            "jds": len(self.jds),
+        }
+
+
+semantic_index = SemanticIndex(settings.embedding_dir, embedder, settings.embedding_nprobe)
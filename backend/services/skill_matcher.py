@@ -0,0 +1,205 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+# Alias → canonical skill name. Both sides are in normalized form (see normalize()).
+SKILL_ALIASES = {
+    "k8s": "kubernetes",
+    "kube": "kubernetes",
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "dotnet": ".net",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "angularjs": "angular",
+    "nextjs": "next.js",
+    "fast api": "fastapi",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "mssql": "sql server",
+    "ms sql": "sql server",
+    "elastic search": "elasticsearch",
+    "rabbit mq": "rabbitmq",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "google cloud": "gcp",
+    "microsoft azure": "azure",
+    "cicd": "ci/cd",
+    "ci cd": "ci/cd",
+    "continuous integration": "ci/cd",
+    "gh actions": "github actions",
+    "rest": "rest api",
+    "restful": "rest api",
+    "restful api": "rest api",
+    "rest apis": "rest api",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "tf": "tensorflow",
+    "oop": "object-oriented programming",
+    "object oriented programming": "object-oriented programming",
+    "tdd": "test-driven development",
+    "test driven development": "test-driven development",
+    "communication skills": "communication",
+    "problem-solving": "problem solving",
+    "team player": "teamwork",
+}
+
+# Words that carry no skill on their own in requirements like "Strong experience with Docker"
+_FILLER_WORDS = frozenset(
+    "a an and or of in on with for the to using strong solid good excellent deep "
+    "experience experienced knowledge understanding proficiency proficient familiarity "
+    "familiar skills skill ability years year plus hands-on working".split()
+)
+
+# Share of the score per requirement group; groups the JD does not have are left out
+GROUP_WEIGHTS = {"hard_skills": 0.6, "keywords": 0.25, "soft_skills": 0.15}
+MAX_NGRAM = 3
+LOCAL_RECOMMENDATIONS = 5
+
+_TOKEN_RE = re.compile(r"\.?[a-z0-9](?:[a-z0-9+#./\-]*[a-z0-9+#])?")
+_VERSION_RE = re.compile(r"^[\d.+x]+$")
+_KNOWN = frozenset(SKILL_ALIASES) | frozenset(SKILL_ALIASES.values())
+# Multi-word skill names that the candidate index keeps as a single term
+KNOWN_PHRASES = frozenset(t for t in _KNOWN if " " in t)
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().replace("_", " ").split())
+
+
+def canonical(term: str) -> str:
+    return SKILL_ALIASES.get(term, term)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase tokens; "python/django" is split unless the whole thing is a known skill (ci/cd)."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if "/" in token and token not in _KNOWN:
+            tokens.extend(part for part in token.split("/") if part)
+        else:
+            tokens.append(token)
+    return tokens
+
+
+def cv_terms(cv_sections: dict[str, str]) -> frozenset[str]:
+    """Every 1..MAX_NGRAM-gram of the CV, in canonical form. Build once per CV, match many times."""
+    terms = set()
+    for content in cv_sections.values():
+        # n-grams do not cross lines, which mostly separate unrelated items
+        for line in content.splitlines():
+            tokens = tokenize(line)
+            for n in range(1, MAX_NGRAM + 1):
+                for i in range(len(tokens) - n + 1):
+                    terms.add(canonical(" ".join(tokens[i:i + n])))
+    return frozenset(terms)
+
+
+@lru_cache(maxsize=8192)
+def _skill_forms(skill: str) -> tuple[str, str | None, tuple[str, ...]]:
+    """(full phrase, phrase without filler words, its tokens) in canonical form; JD skills repeat a lot."""
+    tokens = tokenize(skill)
+    significant = [t for t in tokens if t not in _FILLER_WORDS and not _VERSION_RE.match(t)]
+    if not significant or significant == tokens:
+        return canonical(" ".join(tokens)), None, ()
+    return canonical(" ".join(tokens)), canonical(" ".join(significant)), tuple(canonical(t) for t in significant)
+
+
+def _skill_present(skill: str, terms: frozenset[str]) -> bool:
+    phrase, core, core_tokens = _skill_forms(skill)
+    if phrase in terms:
+        return True
+    if core is None:
+        return False
+    return core in terms or all(t in terms for t in core_tokens)
+
+
+def term_counts(cv_sections: dict[str, str]) -> Counter[str]:
+    """Canonical words (minus filler words and versions) and known phrases of the CV, with counts."""
+    counts: Counter[str] = Counter()
+    for content in cv_sections.values():
+        for line in content.splitlines():
+            tokens = tokenize(line)
+            for i, token in enumerate(tokens):
+                if token not in _FILLER_WORDS and not _VERSION_RE.match(token):
+                    counts[canonical(token)] += 1
+                for n in range(2, MAX_NGRAM + 1):
+                    phrase = " ".join(tokens[i:i + n])
+                    if phrase in KNOWN_PHRASES:
+                        counts[canonical(phrase)] += 1
+    return counts
+
+
+def skill_terms(skill: str) -> tuple[str, ...]:
+    """The term_counts() terms a JD skill is looked up by: one term if possible, else its words."""
+    phrase, core, core_tokens = _skill_forms(skill)
+    if core is not None:
+        phrase = core
+    else:
+        core_tokens = tuple(canonical(t) for t in tokenize(skill))
+    if " " not in phrase or phrase in KNOWN_PHRASES:
+        return (phrase,) if phrase else ()
+    return core_tokens
+
+
+def dedupe_skills(skills: list[str]) -> list[str]:
+    seen = set()
+    unique = []
+    for skill in skills:
+        key = canonical(normalize(skill))
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(skill)
+    return unique
+
+
+def match_terms(terms: frozenset[str], jd_requirements: dict) -> dict:
+    """
+    Deterministic counterpart of match_cv_to_jd() without recommendations.
+    match_score is the weighted share of JD hard skills, keywords and soft skills found in the CV.
+    """
+    matched: list[str] = []
+    missing: list[str] = []
+    score = 0.0
+    weight_total = 0.0
+    for group, weight in GROUP_WEIGHTS.items():
+        skills = dedupe_skills(jd_requirements.get(group) or [])
+        if not skills:
+            continue
+        found = [s for s in skills if _skill_present(s, terms)]
+        score += weight * len(found) / len(skills)
+        weight_total += weight
+        if group != "keywords":
+            matched.extend(found)
+            missing.extend(s for s in skills if s not in found)
+    return {
+        "match_score": round(100 * score / weight_total) if weight_total else 0,
+        "matched_skills": dedupe_skills(matched),
+        "missing_skills": dedupe_skills(missing),
+    }
+
+
+def match_cv_locally(cv_sections: dict[str, str], jd_requirements: dict) -> dict:
+    return match_terms(cv_terms(cv_sections), jd_requirements)
+
+
+def local_recommendations(missing_skills: list[str]) -> list[str]:
+    return [
+        f"If you have experience with {skill}, add it to your CV with a concrete example."
+        for skill in missing_skills[:LOCAL_RECOMMENDATIONS]
+    ]
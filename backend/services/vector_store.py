@@ -0,0 +1,254 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+_INITIAL_CAPACITY = 1024
+# Queries scored against the whole matrix at once in exact search
+_QUERY_BATCH = 16
+# Approximate search falls back to exact below this many rows
+_MIN_ROWS_FOR_IVF = 4096
+_KMEANS_ITERATIONS = 10
+_KMEANS_SAMPLE = 20_000
+
+
+class VectorStore:
+    """
+    L2-normalized float32 vectors in a memory-mapped file, one row per item,
+    each with an int64 key and an int16 label. Several rows may share a key
+    (one per CV section); they must be appended together so they stay
+    contiguous. Deleted rows get key -1 and are dropped by compact().
+
+    Files: {name}.f32 / .keys / .labels hold `capacity` rows; {name}.json has
+    the row count, dimension and embedder name. Vectors written by another
+    embedder or dimension are discarded on open.
+
+    One process writes the files; others open them with read_only=True, which
+    never resizes them and maps them read-only. A read-only store sees the
+    rows flushed before it was opened, until refresh().
+    """
+
+    def __init__(self, directory: str, name: str, dim: int, embedder_name: str, read_only: bool = False):
+        self.dim = dim
+        self.embedder_name = embedder_name
+        self.read_only = read_only
+        directory = Path(directory)
+        if not read_only:
+            directory.mkdir(parents=True, exist_ok=True)
+        self._base = directory / name
+        self._open()
+
+    def _path(self, suffix: str) -> Path:
+        return self._base.with_suffix(suffix)
+
+    def _open(self) -> None:
+        meta = {}
+        try:
+            self._meta_mtime = self._path(".json").stat().st_mtime_ns
+            meta = json.loads(self._path(".json").read_text())
+        except FileNotFoundError:
+            self._meta_mtime = None
+        if meta.get("dim") == self.dim and meta.get("embedder") == self.embedder_name:
+            self.count, self.capacity = meta["count"], meta["capacity"]
+        else:
+            self.count, self.capacity = 0, 0 if self.read_only else _INITIAL_CAPACITY
+        if not self.read_only:
+            self._resize_files()
+        self._map()
+        self._rows: dict[int, list[int]] = {}
+        for row, key in enumerate(self.keys[:self.count].tolist()):
+            if key != -1:
+                self._rows.setdefault(key, []).append(row)
+        # First row of each run of equal keys, for per-key max scores
+        self._starts: np.ndarray | None = None
+        self._centroids: np.ndarray | None = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._trained_at = 0
+
+    def refresh(self) -> None:
+        """Re-open a read-only store if the writer has flushed since."""
+        if not self.read_only:
+            return
+        try:
+            mtime = self._path(".json").stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._meta_mtime:
+            self._open()
+
+    def _resize_files(self) -> None:
+        for suffix, itemsize in ((".f32", 4 * self.dim), (".keys", 8), (".labels", 2)):
+            path = self._path(suffix)
+            with open(path, "r+b" if path.exists() else "w+b") as f:
+                f.truncate(self.capacity * itemsize)
+
+    def _map(self) -> None:
+        if not self.capacity:
+            # Read-only store with nothing written yet (an empty file cannot be mapped)
+            self.vectors = np.zeros((0, self.dim), dtype=np.float32)
+            self.keys = np.zeros(0, dtype=np.int64)
+            self.labels = np.zeros(0, dtype=np.int16)
+            return
+        mode = "r" if self.read_only else "r+"
+        self.vectors = np.memmap(self._path(".f32"), dtype=np.float32, mode=mode, shape=(self.capacity, self.dim))
+        self.keys = np.memmap(self._path(".keys"), dtype=np.int64, mode=mode, shape=(self.capacity,))
+        self.labels = np.memmap(self._path(".labels"), dtype=np.int16, mode=mode, shape=(self.capacity,))
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self.capacity:
+            return
+        self.flush()
+        del self.vectors, self.keys, self.labels
+        self.capacity = capacity
+        self._resize_files()
+        self._map()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._rows
+
+    def ids(self) -> set[int]:
+        return set(self._rows)
+
+    def append(self, keys: list[int], labels: list[int], vectors: np.ndarray) -> None:
+        start, end = self.count, self.count + len(keys)
+        self._grow(end)
+        self.vectors[start:end] = vectors
+        self.keys[start:end] = keys
+        self.labels[start:end] = labels
+        for row, key in enumerate(keys, start):
+            self._rows.setdefault(key, []).append(row)
+        if self._centroids is not None:
+            self._assign = np.concatenate([self._assign, self._nearest_centroid(np.asarray(vectors))])
+        self.count = end
+        self._starts = None
+
+    def delete(self, key: int) -> None:
+        rows = self._rows.pop(key, None)
+        if rows:
+            self.keys[rows] = -1
+            self._starts = None
+
+    def get(self, key: int) -> np.ndarray | None:
+        rows = self._rows.get(key)
+        # A read-only store's rows may have been moved by the writer's compact()
+        if not rows or (self.keys[rows] != key).any():
+            return None
+        return np.array(self.vectors[rows])
+
+    def flush(self) -> None:
+        self.vectors.flush()
+        self.keys.flush()
+        self.labels.flush()
+        meta = {"count": self.count, "capacity": self.capacity, "dim": self.dim, "embedder": self.embedder_name}
+        tmp = self._path(".json.tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self._path(".json"))
+
+    def compact(self) -> None:
+        """Drop deleted rows, keeping the order of the rest."""
+        keep = np.flatnonzero(self.keys[:self.count] != -1)
+        if len(keep) == self.count:
+            return
+        self.vectors[:len(keep)] = self.vectors[keep]
+        self.labels[:len(keep)] = self.labels[keep]
+        self.keys[:len(keep)] = self.keys[keep]
+        self.count = len(keep)
+        self._rows = {}
+        for row, key in enumerate(self.keys[:self.count].tolist()):
+            self._rows.setdefault(key, []).append(row)
+        self._starts = None
+        self._centroids = None
+        self.flush()
+
+    def dead_rows(self) -> int:
+        return self.count - sum(len(rows) for rows in self._rows.values())
+
+    # ── Search ──────────────────────────────────────────────────────────────
+
+    def _run_starts(self, keys: np.ndarray) -> np.ndarray:
+        if not len(keys):
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+
+    def _top_groups(
+        self, scores: np.ndarray, rows: np.ndarray | None, starts: np.ndarray, k: int
+    ) -> list[tuple[int, float, int]]:
+        """Best k keys by their best row: (key, score, label of that row)."""
+        group_scores = np.maximum.reduceat(scores, starts)
+        first_rows = starts if rows is None else rows[starts]
+        group_scores[self.keys[first_rows] == -1] = -np.inf
+        k = min(k, int(np.isfinite(group_scores).sum()))
+        if not k:
+            return []
+        top = np.argpartition(-group_scores, k - 1)[:k]
+        top = top[np.argsort(-group_scores[top], kind="stable")]
+        ends = np.append(starts[1:], len(scores))
+        results = []
+        for g in top.tolist():
+            best = starts[g] + int(np.argmax(scores[starts[g]:ends[g]]))
+            row = best if rows is None else rows[best]
+            results.append((int(self.keys[row]), float(group_scores[g]), int(self.labels[row])))
+        return results
+
+    def search(self, queries: np.ndarray, k: int) -> list[list[tuple[int, float, int]]]:
+        """Exact cosine top-k keys for each query (rows of `queries`, normalized)."""
+        if not self.count:
+            return [[] for _ in range(len(queries))]
+        if self._starts is None:
+            self._starts = self._run_starts(np.asarray(self.keys[:self.count]))
+        results = []
+        for i in range(0, len(queries), _QUERY_BATCH):
+            scores = queries[i:i + _QUERY_BATCH] @ self.vectors[:self.count].T
+            results.extend(self._top_groups(row_scores, None, self._starts, k) for row_scores in scores)
+        return results
+
+    def _nearest_centroid(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def _train(self, nlist: int) -> None:
+        """Spherical k-means over a sample of the live rows; every row is assigned to a list."""
+        live = np.flatnonzero(self.keys[:self.count] != -1)
+        rng = np.random.default_rng(0)
+        sample = np.asarray(self.vectors[np.sort(rng.choice(live, min(len(live), _KMEANS_SAMPLE), replace=False))])
+        centroids = sample[rng.choice(len(sample), min(nlist, len(sample)), replace=False)]
+        for _ in range(_KMEANS_ITERATIONS):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            empty = ~np.bincount(assign, minlength=len(centroids)).astype(bool)
+            sums[empty] = centroids[empty]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+        self._centroids = centroids.astype(np.float32)
+        self._assign = np.concatenate([
+            self._nearest_centroid(np.asarray(self.vectors[i:i + 65536]))
+            for i in range(0, self.count, 65536)
+        ])
+        self._trained_at = self.count
+
+    def search_approximate(self, queries: np.ndarray, k: int, nprobe: int) -> list[list[tuple[int, float, int]]]:
+        """
+        IVF search: rows are bucketed by nearest k-means centroid (about sqrt(rows)
+        lists) and only the `nprobe` lists closest to the query are scored.
+        """
+        if self.count < _MIN_ROWS_FOR_IVF:
+            return self.search(queries, k)
+        if self._centroids is None or self.count > 2 * self._trained_at:
+            self._train(int(np.sqrt(self.count)))
+        nprobe = min(nprobe, len(self._centroids))
+        probes = np.argpartition(-(queries @ self._centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        results = []
+        for query, query_probes in zip(queries, probes):
+            rows = np.flatnonzero(np.isin(self._assign[:self.count], query_probes))
+            if not len(rows):
+                results.append([])
+                continue
+            scores = np.asarray(self.vectors[rows]) @ query
+            results.append(self._top_groups(scores, rows, self._run_starts(np.asarray(self.keys[rows])), k))
+        return results
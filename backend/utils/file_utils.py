@@ -1,6 +1,11 @@
+import asyncio
+import hashlib
 import os
-import uuid
+import tempfile
+import threading
+from collections import Counter
 from pathlib import Path
+from typing import BinaryIO
 
 from fastapi import HTTPException, UploadFile
 
@@ -12,29 +17,123 @@ ALLOWED_MIME_TYPES = {
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
 }
 ALLOWED_EXTENSIONS = {".pdf", ".txt", ".docx"}
+CHUNK_SIZE = 1024 * 1024
 
+# Stored files this process has saved but not yet recorded in a CV row or job,
+# with the number of uploads holding each; see settle_file / delete_unless_pending
+_pending: Counter[str] = Counter()
+_pending_lock = threading.Lock()
 
-def validate_file(filename: str, content_type: str, size: int) -> None:
+
+def _check_extension(filename: str) -> None:
     ext = Path(filename).suffix.lower()
     if ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}. Allowed: {ALLOWED_EXTENSIONS}")
+
+
+def validate_file_type(filename: str, content_type: str) -> None:
+    _check_extension(filename)
     if content_type not in ALLOWED_MIME_TYPES:
         raise HTTPException(status_code=400, detail=f"Invalid MIME type: {content_type}")
-    max_bytes = settings.max_file_size_mb * 1024 * 1024
-    if size > max_bytes:
+
+
+def _check_size(size: int) -> None:
+    if size > settings.max_file_size_mb * 1024 * 1024:
         raise HTTPException(status_code=400, detail=f"File too large. Max {settings.max_file_size_mb} MB allowed.")
 
 
-async def save_upload(file: UploadFile) -> str:
-    upload_dir = Path(settings.upload_dir)
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    ext = Path(file.filename).suffix.lower()
-    unique_name = f"{uuid.uuid4().hex}{ext}"
-    dest = upload_dir / unique_name
-    content = await file.read()
-    validate_file(file.filename, file.content_type, len(content))
-    dest.write_bytes(content)
-    return str(dest)
+def validate_file(filename: str, content_type: str, size: int) -> None:
+    validate_file_type(filename, content_type)
+    _check_size(size)
+
+
+class _ContentAddressedWriter:
+    """Writes chunks to a temp file in upload_dir, hashing and size-checking as it goes."""
+
+    def __init__(self, filename: str):
+        self.upload_dir = Path(settings.upload_dir)
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.ext = Path(filename).suffix.lower()
+        self.digest = hashlib.sha256()
+        self.size = 0
+        fd, self.tmp_path = tempfile.mkstemp(dir=self.upload_dir, suffix=".part")
+        self.out = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        _check_size(self.size)
+        self.digest.update(chunk)
+        self.out.write(chunk)
+
+    def commit(self) -> tuple[str, str]:
+        self.out.close()
+        content_hash = self.digest.hexdigest()
+        dest = self.upload_dir / f"{content_hash}{self.ext}"
+        # Under the lock so a concurrent delete_unless_pending cannot remove a file we just reused
+        with _pending_lock:
+            if dest.exists():
+                delete_file(self.tmp_path)
+            else:
+                os.replace(self.tmp_path, dest)
+            _pending[str(dest)] += 1
+        return str(dest), content_hash
+
+    def abort(self) -> None:
+        self.out.close()
+        delete_file(self.tmp_path)
+
+
+async def save_upload(file: UploadFile) -> tuple[str, str]:
+    """
+    Stream the upload to disk in chunks, enforcing the size limit as it goes.
+    Files are content-addressed, so identical uploads share one file on disk.
+    Returns (path, sha256 hex digest of the content). The file is held until
+    the caller calls settle_file(path), once a CV row or job references it or
+    the upload is given up.
+    """
+    validate_file_type(file.filename, file.content_type)
+    if file.size is not None:
+        _check_size(file.size)
+
+    writer = _ContentAddressedWriter(file.filename)
+    try:
+        while chunk := await file.read(CHUNK_SIZE):
+            await asyncio.to_thread(writer.write, chunk)
+        return await asyncio.to_thread(writer.commit)
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def store_file(source: BinaryIO, filename: str) -> tuple[str, str]:
+    """Synchronous counterpart of save_upload for local files and archive members."""
+    _check_extension(filename)
+
+    writer = _ContentAddressedWriter(filename)
+    try:
+        while chunk := source.read(CHUNK_SIZE):
+            writer.write(chunk)
+        return writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def settle_file(path: str) -> None:
+    """Drop one hold taken by save_upload / store_file."""
+    with _pending_lock:
+        _pending[path] -= 1
+        if _pending[path] <= 0:
+            del _pending[path]
+
+
+def delete_unless_pending(path: str) -> bool:
+    """Delete a stored file unless an upload in this process still holds it."""
+    with _pending_lock:
+        if path in _pending:
+            return False
+        delete_file(path)
+        return True
 
 
 def delete_file(path: str) -> None:
@@ -0,0 +1,40 @@
+import json
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+# Default response class of the app: orjson renders dicts several times faster
+DefaultResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+
+def dumps(value) -> str:
+    """JSON text; orjson when installed. Non-ASCII text stays as it is, not \\u-escaped."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(text: str | bytes):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def model_response(model: BaseModel, status_code: int = 200, **dump_options) -> Response:
+    """
+    Response for a model the endpoint has already validated. Returning the
+    model itself makes FastAPI dump it, validate the dump against
+    response_model again and then encode it; here it is dumped once and
+    encoded by orjson (pydantic's own JSON writer when orjson is missing).
+    """
+    if orjson is not None:
+        body = orjson.dumps(model.model_dump(mode="json", **dump_options), option=orjson.OPT_NON_STR_KEYS)
+    else:
+        body = model.model_dump_json(**dump_options)
+    return Response(body, status_code=status_code, media_type="application/json")
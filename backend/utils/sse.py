@@ -0,0 +1,28 @@
+import json
+from collections.abc import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+from backend.services.json_stream import JSONItemStream
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stop nginx-style proxies from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def stream_json_events(tokens: AsyncIterator[str], parser: JSONItemStream) -> AsyncIterator[str]:
+    """Forward model tokens and every item/field that the partial JSON already contains."""
+    async for token in tokens:
+        yield format_sse("token", {"text": token})
+        for kind, key, value in parser.feed(token):
+            yield format_sse(kind, {"key": key, "value": value})
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,89 @@
+"""
+Bulk CV ingestion throughput (CVs per second) against a per-file commit baseline.
+
+Runs against a throwaway SQLite database and upload directory.
+
+    python -m benchmarks.bench_batch_ingest [--cvs 2000] [--workers 4] [--batch-size 500]
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+_tmp = tempfile.mkdtemp(prefix="cv_bench_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_tmp}/bench.db"
+os.environ["UPLOAD_DIR"] = f"{_tmp}/uploads"
+
+from backend.database import AsyncSessionLocal, create_tables  # noqa: E402
+from backend.models.db_models import CV, CVSection  # noqa: E402
+from backend.services.batch_ingest import ingest, iter_directory  # noqa: E402
+from backend.services.extraction_pool import ExtractionPool  # noqa: E402
+from backend.services.segmenter import segment_cv  # noqa: E402
+from backend.utils.file_utils import settle_file, store_file  # noqa: E402
+
+SKILLS = ["Python", "Go", "Java", "SQL", "Docker", "Kubernetes", "AWS", "React", "FastAPI", "Kafka"]
+
+
+def write_corpus(directory: Path, count: int, seed: int) -> None:
+    rng = random.Random(seed)
+    directory.mkdir(parents=True)
+    for i in range(count):
+        lines = [f"Candidate {i}", f"candidate{i}@example.com", "", "Summary"]
+        lines.append(f"Engineer with {rng.randint(1, 15)} years of experience.")
+        lines += ["", "Skills", ", ".join(rng.sample(SKILLS, 5)), "", "Experience"]
+        lines += [f"Company {rng.randint(1, 500)}, Engineer, {2010 + j}-{2011 + j}" for j in range(rng.randint(2, 6))]
+        lines += ["", "Education", "BSc Computer Science"]
+        (directory / f"cv_{i:06d}.txt").write_text("\n".join(lines), encoding="utf-8")
+
+
+async def per_file_baseline(directory: Path, pool: ExtractionPool) -> float:
+    """What N calls to POST /api/cv/upload amount to: one extraction and one commit per CV."""
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        for path in sorted(directory.iterdir()):
+            with path.open("rb") as fh:
+                stored, content_hash = store_file(fh, path.name)
+            raw_text = await pool.extract(stored)
+            cv = CV(file_path=stored, raw_text=raw_text, content_hash=content_hash)
+            db.add(cv)
+            await db.flush()
+            for name, content in segment_cv(raw_text).items():
+                db.add(CVSection(cv_id=cv.id, section_name=name, content=content))
+            await db.commit()
+            settle_file(stored)
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cvs", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    await create_tables()
+    pool = ExtractionPool(workers=args.workers, max_queue=args.workers, timeout_seconds=60)
+    try:
+        batch_dir = Path(_tmp) / "batch"
+        write_corpus(batch_dir, args.cvs, args.seed)
+        last = {}
+        async for event in ingest(iter_directory(str(batch_dir)), pool, args.batch_size):
+            last = event
+        print(f"batch ingest : {last['ingested']} CVs in {last['elapsed_s']:.2f}s -> {last['cvs_per_s']:.1f} CVs/s")
+
+        baseline_dir = Path(_tmp) / "baseline"
+        write_corpus(baseline_dir, args.cvs, args.seed + 1)
+        elapsed = await per_file_baseline(baseline_dir, pool)
+        print(f"per-file     : {args.cvs} CVs in {elapsed:.2f}s -> {args.cvs / elapsed:.1f} CVs/s")
+    finally:
+        pool.shutdown()
+        shutil.rmtree(_tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+Top-K candidate search over a large synthetic CV corpus (GET /api/jd/{jd_id}/top-candidates).
+
+Indexes --cvs generated CVs, then times searches for random JDs and the cost of
+incremental uploads and deletes between searches.
+
+    python -m benchmarks.bench_candidate_index [--cvs 100000] [--queries 200] [--k 10] [--seed 0]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from backend.services.candidate_index import CandidateIndex
+from benchmarks.bench_skill_matcher import _cv, _jd
+
+
+def _percentiles(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    return f"p50 {statistics.median(ordered):.2f} ms  p95 {p95:.2f} ms  max {ordered[-1]:.2f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cvs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # A pool of distinct CVs, reused so generating 100k is not the bottleneck
+    pool = [_cv(rng) for _ in range(min(args.cvs, 5000))]
+    jds = [_jd(rng) for _ in range(args.queries)]
+
+    index = CandidateIndex()
+    started = time.perf_counter()
+    for cv_id in range(1, args.cvs + 1):
+        index.add(cv_id, pool[cv_id % len(pool)])
+    index.search(jds[0], args.k)
+    build = time.perf_counter() - started
+    stats = index.stats()
+    print(f"indexed {stats['documents']} CVs in {build:.1f}s ({build / args.cvs * 1000:.3f} ms each)")
+    print(f"  {stats['terms']} terms, {stats['nonzeros']} non-zeros, {stats['segments']} segment(s)")
+
+    latencies = []
+    for jd in jds:
+        started = time.perf_counter()
+        index.search(jd, args.k)
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(f"search top-{args.k}: {_percentiles(latencies)}")
+
+    latencies = []
+    next_id = args.cvs + 1
+    for jd in jds:
+        for _ in range(5):
+            index.add(next_id, pool[next_id % len(pool)])
+            index.remove(rng.randint(1, next_id))
+            next_id += 1
+        started = time.perf_counter()
+        index.search(jd, args.k)
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(f"search after 5 adds + 5 deletes each: {_percentiles(latencies)}")
+    print(f"  {index.stats()['segments']} segment(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Storage and payload size of CV text: database size with raw_text stored as
+plain text vs zlib-compressed, the cost of decompressing it on read, and
+GET /api/cv/{id} response size per field selection and encoding.
+
+Generates --cvs CVs of 1-6 KB (contacts, summary, skills, several jobs,
+projects, education), stores them through the models into two throwaway
+SQLite databases, then requests --requests of them from the app in-process.
+
+    python -m benchmarks.bench_cv_storage [--cvs 2000] [--requests 200] [--seed 0]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+_tmp = tempfile.mkdtemp(prefix="cv_bench_")
+os.environ.update({
+    "DATABASE_URL": f"sqlite+aiosqlite:///{_tmp}/compressed.db",
+    "UPLOAD_DIR": f"{_tmp}/uploads",
+    "EMBEDDING_DIR": f"{_tmp}/embeddings",
+    "LLM_CACHE_BACKEND": "none",
+    "JOB_WORKERS": "0",
+})
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+
+from backend.config import settings  # noqa: E402
+from backend.database import Base  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.models.db_models import CV, CVSection  # noqa: E402
+from backend.services.segmenter import segment_cv  # noqa: E402
+from backend.utils import compression  # noqa: E402
+from benchmarks.bench_skill_matcher import FILLER, HARD_SKILLS, SOFT_SKILLS  # noqa: E402
+
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Soylent"]
+ROLES = ["Backend Engineer", "Software Engineer", "Senior Developer", "Data Engineer", "Tech Lead"]
+
+
+def generate_cv(rng: random.Random, i: int) -> str:
+    skills = rng.sample(HARD_SKILLS, rng.randint(8, 16))
+    lines = [f"Candidate {i}", f"candidate{i}@example.com | +1 555 {i:07d} | linkedin.com/in/candidate{i}", ""]
+    lines += ["Summary", f"{rng.choice(ROLES)} with {rng.randint(2, 15)} years of experience. {FILLER}", ""]
+    lines += ["Skills", ", ".join(skills), "Soft skills: " + ", ".join(rng.sample(SOFT_SKILLS, 3)), ""]
+    lines.append("Experience")
+    year = 2024
+    for _ in range(rng.randint(2, 5)):
+        start = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(ROLES)}, {rng.choice(COMPANIES)}, {start}-{year}")
+        lines += [
+            f"- {FILLER} Used {rng.choice(skills)} and {rng.choice(skills)} to cut p95 latency by {rng.randint(10, 70)}%."
+            for _ in range(rng.randint(3, 8))
+        ]
+        year = start
+    lines += ["", "Projects"]
+    lines += [f"- Open-source {rng.choice(skills)} tool, {rng.randint(10, 900)} stars" for _ in range(rng.randint(1, 3))]
+    lines += ["", "Education", f"BSc Computer Science, University {rng.randint(1, 50)}, {year - 4}-{year}"]
+    return "\n".join(lines)
+
+
+def _fill(url: str, texts: list[str], compress: bool) -> float:
+    """Store the corpus, VACUUM; returns the database file size in bytes."""
+    settings.compress_raw_text = compress
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(CV), [{"id": i, "raw_text": text} for i, text in enumerate(texts, 1)])
+        conn.execute(insert(CVSection), [
+            {"cv_id": i, "section_name": name, "content": content}
+            for i, text in enumerate(texts, 1)
+            for name, content in segment_cv(text).items()
+        ])
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM")
+    engine.dispose()
+    return os.path.getsize(url.removeprefix("sqlite:///"))
+
+
+def _read_ms(url: str) -> float:
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        started = time.perf_counter()
+        conn.execute(select(CV.raw_text)).scalars().all()
+        elapsed = time.perf_counter() - started
+    engine.dispose()
+    return elapsed * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cvs", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [generate_cv(rng, i) for i in range(args.cvs)]
+    print(f"corpus: {args.cvs} CVs, mean {statistics.mean(len(t) for t in texts) / 1024:.1f} KB of text")
+
+    plain = _fill(f"sqlite:///{_tmp}/plain.db", texts, compress=False)
+    compressed = _fill(f"sqlite:///{_tmp}/compressed.db", texts, compress=True)
+    print(f"database size: plain {plain / 2**20:.2f} MB, raw_text compressed {compressed / 2**20:.2f} MB "
+          f"({100 * (1 - compressed / plain):.0f}% smaller)")
+    print(f"read all raw_text: plain {_read_ms(f'sqlite:///{_tmp}/plain.db'):.1f} ms, "
+          f"compressed {_read_ms(f'sqlite:///{_tmp}/compressed.db'):.1f} ms")
+
+    encodings = ["identity", "gzip"] + (["br"] if compression.brotli is not None else [])
+    selections = ["", "?fields=sections", "?fields=raw_text"]
+    sample = rng.sample(range(1, args.cvs + 1), min(args.requests, args.cvs))
+    with TestClient(app) as client:
+        print(f"\nGET /api/cv/{{id}}, mean response bytes over {len(sample)} CVs")
+        print(f"{'selection':<20}" + "".join(f"{e:>10}" for e in encodings))
+        for selection in selections:
+            sizes = []
+            for encoding in encodings:
+                total = 0
+                for cv_id in sample:
+                    response = client.get(f"/api/cv/{cv_id}{selection}", headers={"Accept-Encoding": encoding})
+                    response.raise_for_status()
+                    total += int(response.headers["content-length"])
+                sizes.append(total / len(sample))
+            print(f"{selection or '(all fields)':<20}" + "".join(f"{s:>10.0f}" for s in sizes))
+
+
+if __name__ == "__main__":
+    main()
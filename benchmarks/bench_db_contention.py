@@ -0,0 +1,131 @@
+"""
+SQLite under many parallel interview sessions: the driver-default engine
+(rollback journal, a new connection per session) against the tuned engines
+from backend.database (WAL and pragmas, pooled write and read engines).
+
+Each simulated session starts an interview and then, for every turn, reads
+the interview and its messages (as /message and /feedback do), waits out a
+fake LLM call and writes the answer, feedback and next question in one
+commit. Reports turns/s, read and write latency and "database is locked"
+errors.
+
+    python -m benchmarks.bench_db_contention [--sessions 200] [--turns 8] [--llm-ms 200] [--seed 0]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.database import Base, make_engine, sqlite_pragmas
+from backend.config import settings
+from backend.models.db_models import CV, Interview, Message
+
+
+def _percentiles(samples: list[float]) -> str:
+    if not samples:
+        return "-"
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    return f"p50 {statistics.median(ordered):.1f} ms  p95 {p95:.1f} ms"
+
+
+class _Run:
+    def __init__(self, write_sessions, read_sessions, args):
+        self.write_sessions = write_sessions
+        self.read_sessions = read_sessions
+        self.args = args
+        self.reads: list[float] = []
+        self.writes: list[float] = []
+        self.turns = 0
+        self.locked = 0
+
+    async def session(self, rng: random.Random, cv_id: int) -> None:
+        try:
+            async with self.write_sessions() as db:
+                interview = Interview(cv_id=cv_id, status="in_progress", num_questions=self.args.turns)
+                db.add(interview)
+                await db.flush()
+                db.add(Message(interview_id=interview.id, role="assistant", text="Tell me about yourself"))
+                await db.commit()
+                interview_id = interview.id
+        except OperationalError:
+            self.locked += 1
+            return
+        for turn in range(self.args.turns):
+            try:
+                started = time.perf_counter()
+                async with self.read_sessions() as db:
+                    await db.get(Interview, interview_id)
+                    (await db.execute(select(Message).where(Message.interview_id == interview_id))).scalars().all()
+                self.reads.append((time.perf_counter() - started) * 1000)
+
+                await asyncio.sleep(rng.uniform(0, 2 * self.args.llm_ms) / 1000)
+
+                started = time.perf_counter()
+                async with self.write_sessions() as db:
+                    db.add(Message(interview_id=interview_id, role="user", text=f"Answer {turn} " * 40))
+                    db.add(Message(interview_id=interview_id, role="assistant", text=f"[Feedback] Fine {turn}"))
+                    db.add(Message(interview_id=interview_id, role="assistant", text=f"Question {turn + 1}"))
+                    await db.execute(
+                        update(Interview).where(Interview.id == interview_id)
+                        .values(current_question_index=turn + 1)
+                    )
+                    await db.commit()
+                self.writes.append((time.perf_counter() - started) * 1000)
+                self.turns += 1
+            except OperationalError:
+                self.locked += 1
+
+
+async def _measure(name: str, write_engine, read_engine, args) -> None:
+    async with write_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    write_sessions = async_sessionmaker(write_engine, expire_on_commit=False)
+    async with write_sessions() as db:
+        cv = CV(raw_text="Python developer")
+        db.add(cv)
+        await db.commit()
+
+    run = _Run(write_sessions, async_sessionmaker(read_engine, expire_on_commit=False), args)
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    await asyncio.gather(*(run.session(random.Random(rng.random()), cv.id) for _ in range(args.sessions)))
+    elapsed = time.perf_counter() - started
+    print(f"{name}: {run.turns} turns in {elapsed:.1f}s ({run.turns / elapsed:.0f}/s), locked errors {run.locked}")
+    print(f"  read  {_percentiles(run.reads)}")
+    print(f"  write {_percentiles(run.writes)}")
+    await write_engine.dispose()
+    if read_engine is not write_engine:
+        await read_engine.dispose()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=8)
+    parser.add_argument("--llm-ms", type=float, default=200, help="Mean fake LLM latency between read and write")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cv_bench_") as tmp:
+        url = f"sqlite+aiosqlite:///{tmp}/default.db"
+        default_engine = create_async_engine(url)
+        await _measure("driver defaults", default_engine, default_engine, args)
+
+        url = f"sqlite+aiosqlite:///{tmp}/tuned.db"
+        await _measure(
+            f"WAL + pragmas, pools {settings.db_pool_size}+{settings.db_max_overflow} / {settings.db_read_pool_size}",
+            make_engine(url, sqlite_pragmas()),
+            make_engine(url, sqlite_pragmas(read_only=True), pool_size=settings.db_read_pool_size),
+            args,
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
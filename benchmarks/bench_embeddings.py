@@ -0,0 +1,97 @@
+"""
+Local embedding index (semantic top-candidates and /api/match semantic_score).
+
+Embeds --cvs synthetic CVs section by section into a VectorStore in a temporary
+directory, then measures embedding throughput, exact search latency for single
+and batched queries, and recall@k / latency of approximate (IVF) search for a
+few nprobe values against the exact results.
+
+    python -m benchmarks.bench_embeddings [--cvs 50000] [--queries 100] [--k 10] [--dim 512] [--seed 0]
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from backend.services.embeddings import HashingEmbedder
+from backend.services.semantic_index import _section_items
+from backend.services.vector_store import VectorStore
+from benchmarks.bench_skill_matcher import _cv, _jd
+
+
+def _percentiles(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    return f"p50 {statistics.median(ordered):.2f} ms  p95 {p95:.2f} ms"
+
+
+def _jd_text(requirements: dict) -> str:
+    return "We are hiring. Requirements: " + ", ".join(
+        requirements["hard_skills"] + requirements["keywords"] + requirements["soft_skills"]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cvs", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    embedder = HashingEmbedder(args.dim)
+    # Distinct CVs, reused so generating the corpus is not the bottleneck
+    pool = [_section_items(_cv(rng)) for _ in range(min(args.cvs, 5000))]
+    pool_vectors = []
+    started = time.perf_counter()
+    for sections in pool:
+        pool_vectors.append(embedder.embed([content for _, content in sections]))
+    elapsed = time.perf_counter() - started
+    sections_embedded = sum(len(sections) for sections in pool)
+    print(f"embedded {sections_embedded} sections in {elapsed:.1f}s ({sections_embedded / elapsed:.0f}/s)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = VectorStore(directory, "cv_sections", args.dim, embedder.name)
+        started = time.perf_counter()
+        for cv_id in range(1, args.cvs + 1):
+            sections = pool[cv_id % len(pool)]
+            store.append([cv_id] * len(sections), [label for label, _ in sections], pool_vectors[cv_id % len(pool)])
+        store.flush()
+        print(f"stored {len(store)} CVs ({store.count} rows) in {time.perf_counter() - started:.1f}s")
+
+        queries = embedder.embed([_jd_text(_jd(rng)) for _ in range(args.queries)])
+
+        latencies = []
+        exact = []
+        for query in queries:
+            started = time.perf_counter()
+            exact.append(store.search(query.reshape(1, -1), args.k)[0])
+            latencies.append((time.perf_counter() - started) * 1000)
+        print(f"exact top-{args.k}, one query at a time: {_percentiles(latencies)}")
+
+        started = time.perf_counter()
+        store.search(queries, args.k)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"exact top-{args.k}, {args.queries} queries batched: {elapsed / args.queries:.2f} ms/query")
+
+        started = time.perf_counter()
+        store.search_approximate(queries[:1], args.k, 1)
+        print(f"IVF training: {time.perf_counter() - started:.1f}s")
+        for nprobe in (1, 4, 8, 16, 32):
+            latencies = []
+            found = 0
+            for query, truth in zip(queries, exact):
+                started = time.perf_counter()
+                hits = store.search_approximate(query.reshape(1, -1), args.k, nprobe)[0]
+                latencies.append((time.perf_counter() - started) * 1000)
+                # The corpus repeats CVs, so count any hit scoring at least the exact k-th best
+                found += min(len(truth), sum(score >= truth[-1][1] - 1e-6 for _, score, _ in hits))
+            recall = found / max(1, sum(len(truth) for truth in exact))
+            print(f"approximate nprobe={nprobe:<3} recall@{args.k} {recall:.3f}  {_percentiles(latencies)}")
+
+
+if __name__ == "__main__":
+    main()
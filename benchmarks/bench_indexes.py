@@ -0,0 +1,128 @@
+"""
+Hot lookups (benchmarks.check_query_plans.HOT_QUERIES) on a large SQLite
+database before and after the model indexes are added by the startup schema
+upgrade, plus how long that upgrade takes.
+
+Fills --messages messages over --messages / 10 interviews (rows of one
+interview scattered through the table, as concurrent sessions write them),
+six sections per CV and --reports reports.
+
+    python -m benchmarks.bench_indexes [--messages 1000000] [--reports 200000] [--lookups 50] [--seed 0]
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, inspect, text
+
+from backend.database import Base, _upgrade_schema
+# Registers the tables on Base.metadata
+from backend.models import db_models  # noqa: F401
+from benchmarks.check_query_plans import HOT_QUERIES, compile_sql
+
+_BATCH = 50_000
+# Indexes this benchmark measures; dropped before the "before" run
+_NEW_INDEXES = (
+    "ix_cvs_file_path", "ix_cv_sections_cv_id", "ix_interviews_cv_id",
+    "ix_messages_interview_id_id", "ix_reports_entity", "ix_reports_interview_id",
+)
+
+
+def _fill(connection, args: argparse.Namespace, rng: random.Random) -> None:
+    interviews = max(1, args.messages // 10)
+    cvs = max(1, interviews // 2)
+    started_at = datetime(2026, 1, 1)
+    connection.exec_driver_sql("BEGIN")
+    connection.exec_driver_sql(
+        "INSERT INTO cvs (id, file_path, raw_text, created_at) VALUES (?, ?, ?, ?)",
+        [(i, f"uploads/{i}.pdf", "Python developer", started_at) for i in range(1, cvs + 1)],
+    )
+    connection.exec_driver_sql(
+        "INSERT INTO cv_sections (cv_id, section_name, content) VALUES (?, ?, ?)",
+        [(rng.randint(1, cvs), f"section{j}", "Python, SQL, Docker") for _ in range(cvs) for j in range(6)],
+    )
+    connection.exec_driver_sql(
+        "INSERT INTO interviews (id, cv_id, status, level, num_questions, current_question_index, started_at)"
+        " VALUES (?, ?, 'finished', 'junior', 5, 5, ?)",
+        [(i, rng.randint(1, cvs), started_at) for i in range(1, interviews + 1)],
+    )
+    for start in range(0, args.messages, _BATCH):
+        connection.exec_driver_sql(
+            "INSERT INTO messages (interview_id, role, text, created_at) VALUES (?, ?, ?, ?)",
+            [
+                (rng.randint(1, interviews), "user" if i % 2 else "assistant", f"Message {i} " * 6, started_at)
+                for i in range(start, min(args.messages, start + _BATCH))
+            ],
+        )
+    connection.exec_driver_sql(
+        "INSERT INTO reports (entity_type, entity_id, report_json, created_at, interview_id) VALUES (?, ?, ?, ?, ?)",
+        [
+            (
+                kind,
+                rng.randint(1, cvs),
+                '{"score": 70}',
+                started_at + timedelta(minutes=i),
+                rng.randint(1, interviews) if kind == "interview" else None,
+            )
+            for i in range(args.reports)
+            for kind in [rng.choice(("cv", "match", "interview"))]
+        ],
+    )
+    connection.exec_driver_sql("COMMIT")
+
+
+def _time_queries(connection, args: argparse.Namespace) -> dict[str, float]:
+    timings = {}
+    for name, query in HOT_QUERIES.items():
+        sql = compile_sql(query)
+        samples = []
+        for _ in range(args.lookups):
+            started = time.perf_counter()
+            connection.exec_driver_sql(sql).all()
+            samples.append((time.perf_counter() - started) * 1000)
+        timings[name] = statistics.median(samples)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--reports", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory(prefix="cv_bench_") as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(engine)
+        with engine.connect() as connection:
+            for name in _NEW_INDEXES:
+                connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            connection.commit()
+            started = time.perf_counter()
+            _fill(connection, args, rng)
+            print(f"filled {args.messages} messages, {args.reports} reports in {time.perf_counter() - started:.1f}s")
+
+            before = _time_queries(connection, args)
+            started = time.perf_counter()
+            _upgrade_schema(connection)
+            connection.commit()
+            print(f"schema upgrade (create indexes, ANALYZE): {time.perf_counter() - started:.1f}s")
+            missing = set(_NEW_INDEXES) - {
+                index["name"] for table in inspect(connection).get_table_names()
+                for index in inspect(connection).get_indexes(table)
+            }
+            assert not missing, missing
+            after = _time_queries(connection, args)
+
+    print(f"{'query':<64} {'before ms':>10} {'after ms':>10}")
+    for name in HOT_QUERIES:
+        print(f"{name:<64} {before[name]:>10.2f} {after[name]:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
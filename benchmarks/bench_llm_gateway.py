@@ -0,0 +1,121 @@
+"""
+Load test of the LLM gateway against the local fake OpenAI server.
+
+Fires N concurrent CV analyses at a fake API that rejects requests above a
+concurrency limit (429) and fails a share with 500. Compares a bare
+AsyncOpenAI client (SDK defaults: 2 retries, no concurrency cap) with
+cv_analyzer.analyze_cv going through the gateway. With --distinct N the calls
+reuse N prompts, so identical in-flight calls are coalesced (the cache is off).
+
+    python -m benchmarks.bench_llm_gateway [--calls 200] [--server-concurrency 8] [--error-rate 0.05] [--distinct 0]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port: int, args) -> subprocess.Popen:
+    proc = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.fake_openai", "--port", str(port),
+        "--latency", str(args.latency), "--max-concurrent", str(args.server_concurrency),
+        "--error-rate", str(args.error_rate),
+    ])
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/stats", timeout=0.5)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("fake OpenAI server did not start")
+
+
+def _sections(i: int) -> dict[str, str]:
+    return {"summary": f"Candidate {i}, backend engineer.", "skills": "Python, FastAPI, Docker"}
+
+
+async def _run(label: str, calls: int, call) -> None:
+    latencies: list[float] = []
+    failures: dict[str, int] = {}
+
+    async def one(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            await call(i)
+            latencies.append(time.perf_counter() - started)
+        except Exception as e:
+            failures[type(e).__name__] = failures.get(type(e).__name__, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    wall = time.perf_counter() - started
+    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) >= 2 else 0.0
+    print(
+        f"{label:>8}: ok {len(latencies)}/{calls}  failed {failures or 0}  wall {wall:.1f}s  "
+        f"p50 {statistics.median(latencies) if latencies else 0:.2f}s  p95 {p95:.2f}s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--server-concurrency", type=int, default=8)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--distinct", type=int, default=0, help="number of distinct prompts (0 = one per call)")
+    args = parser.parse_args()
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}/v1"
+    os.environ.update(
+        OPENAI_BASE_URL=base_url,
+        OPENAI_API_KEY="fake",
+        LLM_CACHE_BACKEND="none",
+        LLM_MAX_CONCURRENCY=str(args.server_concurrency),
+    )
+    proc = _start_server(port, args)
+    try:
+        from openai import AsyncOpenAI
+
+        from backend.services import cv_analyzer
+        from backend.services.llm_gateway import llm_gateway
+
+        bare = AsyncOpenAI(base_url=base_url, api_key="fake")
+
+        def prompt(i: int) -> int:
+            return i % args.distinct if args.distinct else i
+
+        async def bare_call(i: int) -> None:
+            await bare.chat.completions.create(
+                model="gpt-4o",
+                messages=cv_analyzer._build_messages(_sections(prompt(i))),
+                temperature=0.3,
+                response_format={"type": "json_object"},
+            )
+
+        await _run("bare", args.calls, bare_call)
+        await _run("gateway", args.calls, lambda i: cv_analyzer.analyze_cv(_sections(prompt(i))))
+        print("gateway route stats:", llm_gateway.stats()["routes"].get("cv_analysis"))
+        print("fake server:", httpx.get(f"http://127.0.0.1:{port}/stats").json())
+        await bare.close()
+        await llm_gateway.aclose()
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Sequential vs page-parallel PDF extraction on synthetic 1-, 10- and 50-page PDFs.
+
+    python -m benchmarks.bench_pdf_extraction [--workers 4] [--repeat 3]
+"""
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from backend.services.parser import extract_text_from_pdf
+
+LINES_PER_PAGE = 45
+LINE = "Senior Python developer, FastAPI, PostgreSQL, Docker, Kubernetes, CI/CD, 2019-2024"
+
+
+def write_synthetic_pdf(path: Path, pages: int) -> None:
+    """Minimal text-only PDF writer (Helvetica, one content stream per page)."""
+    objects: list[bytes] = []
+    page_ids = [3 + 2 * i for i in range(pages)]
+    font_id = 3 + 2 * pages
+
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode())
+    for n, pid in enumerate(page_ids):
+        lines = [f"({n + 1}.{i} {LINE}) Tj T*" for i in range(LINES_PER_PAGE)]
+        stream = ("BT /F1 9 Tf 11 TL 40 800 Td " + " ".join(lines) + " ET").encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {pid + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(bytes(out))
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=int, default=12_000, help="char budget for the early-stop run")
+    args = parser.parse_args()
+
+    executor = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"))
+    parallel = {"executor": executor, "workers": args.workers}
+
+    with executor, tempfile.TemporaryDirectory() as tmp:
+        print(f"{'pages':>5} {'sequential':>12} {'parallel':>12} {'speed-up':>9} {'budget':>12}")
+        for pages in (1, 10, 50):
+            path = str(Path(tmp) / f"cv_{pages}.pdf")
+            write_synthetic_pdf(Path(path), pages)
+
+            # Also warms up the worker processes before timing
+            assert extract_text_from_pdf(path) == extract_text_from_pdf(path, **parallel), (
+                f"parallel output differs for {pages} pages"
+            )
+
+            seq = _time(lambda: extract_text_from_pdf(path), args.repeat)
+            par = _time(lambda: extract_text_from_pdf(path, **parallel), args.repeat)
+            budget = _time(lambda: extract_text_from_pdf(path, char_budget=args.budget, **parallel), args.repeat)
+            print(f"{pages:>5} {seq * 1000:>10.1f}ms {par * 1000:>10.1f}ms {seq / par:>8.2f}x {budget * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Single-pass segmenter vs the previous two-pass implementation.
+
+First checks that both give identical output on every header the patterns can
+produce and on a corpus of generated CVs, then times both over the corpus.
+
+    python -m benchmarks.bench_segmenter [--cvs 5000] [--seed 0]
+"""
+import argparse
+import random
+import re
+import time
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from backend.services.segmenter import segment_cv
+
+
+# ── Reference: the original segment_cv (match, then re.search per pattern) ────
+
+SECTION_PATTERNS = [
+    ("contacts", [
+        r"contact(s|\ info(rmation)?)?",
+        r"personal\ (info(rmation)?|details?)",
+        r"phone|email|linkedin|github|address",
+    ]),
+    ("summary", [
+        r"(professional\ )?summary",
+        r"(about|objective|profile|overview)(\ me)?",
+        r"career\ (objective|profile|summary)",
+    ]),
+    ("skills", [
+        r"(technical\ |core\ |key\ )?skills?",
+        r"technologies?",
+        r"competenc(y|ies)",
+        r"expertise",
+        r"tools?\ (and\ technologies?)?",
+    ]),
+    ("experience", [
+        r"(work|professional|employment)\ (experience|history)",
+        r"experience",
+        r"positions?\ held",
+        r"career\ history",
+    ]),
+    ("education", [
+        r"education(al\ background)?",
+        r"academic(s|\ background)?",
+        r"degrees?",
+        r"qualifications?",
+        r"university|college|school",
+    ]),
+    ("projects", [
+        r"projects?",
+        r"portfolio",
+        r"personal\ projects?",
+        r"open[ -]source",
+    ]),
+    ("certifications", [
+        r"certifications?",
+        r"certificates?",
+        r"licenses?",
+        r"credentials?",
+        r"courses?",
+        r"training",
+    ]),
+    ("languages", [
+        r"languages?",
+        r"linguistic(s)?",
+    ]),
+]
+
+
+def _reference_pattern():
+    joined = "|".join(p for _, patterns in SECTION_PATTERNS for p in patterns)
+    return re.compile(rf"^[ \t]*(?P<header>(?:{joined})[:\s]*)[ \t]*$", re.IGNORECASE | re.MULTILINE)
+
+
+_REFERENCE_RE = _reference_pattern()
+
+
+def _reference_classify(header_text: str) -> str:
+    text = header_text.lower().strip()
+    for section_name, patterns in SECTION_PATTERNS:
+        for pat in patterns:
+            if re.search(pat, text, re.IGNORECASE):
+                return section_name
+    return "other"
+
+
+def reference_segment_cv(text: str) -> dict[str, str]:
+    sections: dict[str, list[str]] = {"contacts": []}
+    current_section = "contacts"
+    for line in text.split("\n"):
+        match = _REFERENCE_RE.match(line)
+        if match:
+            current_section = _reference_classify(match.group("header"))
+            sections.setdefault(current_section, [])
+        else:
+            sections.setdefault(current_section, []).append(line)
+    result = {}
+    for name, content_lines in sections.items():
+        content = "\n".join(content_lines).strip()
+        if content:
+            result[name] = content
+    return result
+
+
+# ── Corpus generation ───────────────────────────────────────────────────────
+
+def _expand(parsed) -> list[str]:
+    """All strings matched by a parsed regex without unbounded repeats."""
+    results = [""]
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL:
+            options = [chr(arg)]
+        elif op is sre_parse.IN:
+            options = [chr(v) for kind, v in arg if kind is sre_parse.LITERAL]
+        elif op is sre_parse.SUBPATTERN:
+            options = _expand(arg[-1])
+        elif op is sre_parse.BRANCH:
+            options = [s for branch in arg[1] for s in _expand(branch)]
+        elif op is sre_parse.MAX_REPEAT:
+            low, high, sub = arg
+            inner = _expand(sub)
+            options = []
+            for n in range(low, high + 1):
+                options.extend(_expand_times(inner, n))
+        else:
+            raise ValueError(f"unsupported regex op: {op}")
+        results = [prefix + option for prefix in results for option in options]
+    return results
+
+
+def _expand_times(inner: list[str], n: int) -> list[str]:
+    out = [""]
+    for _ in range(n):
+        out = [prefix + s for prefix in out for s in inner]
+    return out
+
+
+def all_headers() -> list[str]:
+    headers = []
+    for _, patterns in SECTION_PATTERNS:
+        for pattern in patterns:
+            for keyword in _expand(sre_parse.parse(pattern)):
+                for variant in (keyword, keyword.upper(), keyword.title()):
+                    headers.extend([variant, f"{variant}:", f"  {variant} :  ", f"\t{variant}\t"])
+                    # Near misses that must stay content lines
+                    headers.extend([f"{variant} at Acme", f"{variant}: Python"])
+    return headers
+
+
+FILLER = [
+    "Developed REST APIs with FastAPI and PostgreSQL, cutting latency by 40%",
+    "Acme Corp, Senior Engineer, 2019 - 2024",
+    "Python, Go, Docker, Kubernetes, Terraform",
+    "BSc Computer Science, State University, 2018",
+    "Led a team of 5 engineers on a data platform migration",
+    "john.doe@example.com | +1 555 0100 | linkedin.com/in/johndoe",
+    "Skills in communication and stakeholder management",
+    "Experience with AWS and GCP",
+    "",
+]
+
+
+def generate_cv(rng: random.Random, headers: list[str]) -> str:
+    lines = [rng.choice(FILLER) for _ in range(rng.randint(2, 5))]
+    for _ in range(rng.randint(3, 9)):
+        lines.append(rng.choice(headers))
+        lines.extend(rng.choice(FILLER) for _ in range(rng.randint(1, 8)))
+    return "\n".join(lines)
+
+
+# ── Main ────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cvs", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    headers = all_headers()
+    for header in headers:
+        text = f"intro\n{header}\nbody"
+        assert segment_cv(text) == reference_segment_cv(text), f"header classified differently: {header!r}"
+
+    rng = random.Random(args.seed)
+    corpus = [generate_cv(rng, headers) for _ in range(args.cvs)]
+    for text in corpus:
+        assert segment_cv(text) == reference_segment_cv(text), "segment_cv output differs from reference"
+    print(f"equivalence: OK ({len(headers)} header variants, {len(corpus)} CVs)")
+
+    lines = sum(text.count("\n") + 1 for text in corpus)
+    for name, fn in (("reference", reference_segment_cv), ("single-pass", segment_cv)):
+        started = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        elapsed = time.perf_counter() - started
+        print(f"{name:>12}: {elapsed * 1000:8.1f} ms  {len(corpus) / elapsed:9.0f} CVs/s  {lines / elapsed:10.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
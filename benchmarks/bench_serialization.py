@@ -0,0 +1,194 @@
+"""
+Serialization cost of the report-carrying endpoints, per response: decoding
+the stored JSON column, validating, and encoding the HTTP body.
+
+    before     stdlib json column, dict[str, Any] response models, FastAPI
+               validating the returned model again, JSONResponse
+    orjson     FastJSON column and typed models, returned to FastAPI as
+               before but rendered by ORJSONResponse (default response class)
+    once       FastJSON column, typed model validated once, dumped and encoded
+               by orjson (json_codec.model_response), as the endpoints do
+
+Payloads are sized like real ones (Russian-language text, a 10-question
+interview report). "once" and "orjson" bodies are checked to decode to the
+same JSON as "before".
+
+    python -m benchmarks.bench_serialization [--repeat 2000]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import BaseModel
+
+from backend.models.schemas import (
+    CVAnalysisResponse, InterviewFinishResponse, JDDetailResponse, JobResponse, MatchResponse,
+)
+from backend.utils import json_codec
+from backend.utils.json_codec import model_response
+
+_rng = random.Random(0)
+_WORDS = "опыт проект команда сервис Python FastAPI latency снизил внедрил метрики результат задача".split()
+
+
+def _sentence(words: int) -> str:
+    return " ".join(_rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+# Response models as they were, with the report payloads untyped
+class _CVAnalysisBefore(BaseModel):
+    cv_id: int
+    issues: list[str]
+    tips: list[str]
+    rewrites: list[dict[str, str]]
+
+
+class _JDDetailBefore(BaseModel):
+    jd_id: int
+    status: str
+    extracted_requirements: dict[str, Any] | None
+    created_at: datetime
+
+
+class _FinishBefore(BaseModel):
+    session_id: int
+    report: dict[str, Any]
+
+
+ANALYSIS = {
+    "issues": [_sentence(14) for _ in range(8)],
+    "tips": [_sentence(16) for _ in range(8)],
+    "rewrites": [{"original": _sentence(10), "improved": _sentence(22)} for _ in range(6)],
+}
+REQUIREMENTS = {
+    "hard_skills": ["Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "Kafka", "Redis", "REST API"],
+    "soft_skills": ["Communication", "Teamwork", "Ownership"],
+    "responsibilities": [_sentence(8) for _ in range(6)],
+    "keywords": ["backend", "microservices", "CI/CD", "agile", "highload"],
+}
+MATCH = {
+    "match_score": 72,
+    "matched_skills": REQUIREMENTS["hard_skills"][:5],
+    "missing_skills": REQUIREMENTS["hard_skills"][5:],
+    "recommendations": [_sentence(18) for _ in range(5)],
+    "mode": "full",
+    "semantic_score": 64,
+}
+REPORT = {
+    "overall_score": 3.7,
+    "criteria_scores": {"relevance": 4.1, "clarity": 3.5, "structure": 3.2, "technical_depth": 3.6, "communication": 4.0},
+    "category_scores": {f"Category {i}": round(_rng.uniform(2, 5), 1) for i in range(6)},
+    "strengths": [_sentence(14) for _ in range(4)],
+    "weaknesses": [_sentence(14) for _ in range(4)],
+    "recommendations": [_sentence(18) for _ in range(5)],
+    "improved_answers": [
+        {"question": _sentence(12), "original": _sentence(60), "improved": _sentence(90)} for _ in range(3)
+    ],
+}
+_NOW = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+# name: (stored column value, endpoint content from it, model before, model after)
+ENDPOINTS = {
+    "POST /api/cv/{id}/analyze": (
+        ANALYSIS, lambda data: {"cv_id": 1, **data}, _CVAnalysisBefore, CVAnalysisResponse,
+    ),
+    "POST /api/match": (MATCH, lambda data: data, MatchResponse, MatchResponse),
+    "GET /api/jd/{id}": (
+        REQUIREMENTS,
+        lambda data: {"jd_id": 1, "status": "ready", "extracted_requirements": data, "created_at": _NOW},
+        _JDDetailBefore, JDDetailResponse,
+    ),
+    "POST /api/interview/{id}/finish": (
+        REPORT, lambda data: {"session_id": 1, "report": data}, _FinishBefore, InterviewFinishResponse,
+    ),
+    "GET /api/jobs/{id} (report result)": (
+        {"session_id": 1, "report_id": 1, "report": REPORT},
+        lambda data: {
+            "job_id": 1, "kind": "interview_report", "status": "succeeded", "attempts": 1, "max_attempts": 3,
+            "result": data, "created_at": _NOW, "finished_at": _NOW,
+        },
+        JobResponse, JobResponse,
+    ),
+}
+
+
+async def _before(stored: str, content, model_before, field) -> bytes:
+    model = model_before(**content(json.loads(stored)))
+    body = await serialize_response(field=field, response_content=model)
+    return JSONResponse(body).body
+
+
+async def _orjson(stored: str, content, model_after, field) -> bytes:
+    model = model_after(**content(json_codec.loads(stored)))
+    body = await serialize_response(field=field, response_content=model)
+    return ORJSONResponse(body).body
+
+
+def _once(stored: str, content, model_after) -> bytes:
+    return model_response(model_after(**content(json_codec.loads(stored)))).body
+
+
+async def _time(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    if json_codec.orjson is None:
+        raise SystemExit("orjson is not installed (pip install orjson)")
+
+    print(f"{'endpoint':<36} {'KB':>5} {'before µs':>10} {'orjson µs':>10} {'once µs':>8} {'speedup':>8}")
+    for name, (payload, content, model_before, model_after) in ENDPOINTS.items():
+        stored_before = json.dumps(payload)  # what the generic JSON type wrote
+        stored = json_codec.dumps(payload)
+        field_before = create_model_field("Response", model_before, mode="serialization")
+        field_after = create_model_field("Response", model_after, mode="serialization")
+
+        async def before():
+            return await _before(stored_before, content, model_before, field_before)
+
+        async def orjson_path():
+            return await _orjson(stored, content, model_after, field_after)
+
+        async def once():
+            return _once(stored, content, model_after)
+
+        expected = json.loads(await before())
+        assert json.loads(await orjson_path()) == expected, name
+        assert json.loads(await once()) == expected, name
+
+        before_us = await _time(before, args.repeat)
+        orjson_us = await _time(orjson_path, args.repeat)
+        once_us = await _time(once, args.repeat)
+        size_kb = len(await once()) / 1024
+        print(f"{name:<36} {size_kb:>5.1f} {before_us:>10.1f} {orjson_us:>10.1f} {once_us:>8.1f} "
+              f"{before_us / once_us:>7.1f}x")
+
+    report = {"session_id": 1, "report": REPORT}
+    for label, encode, decode in (
+        ("stdlib json", json.dumps, json.loads),
+        ("json_codec", json_codec.dumps, json_codec.loads),
+    ):
+        stored = encode(report)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            decode(encode(report))
+        elapsed = (time.perf_counter() - started) / args.repeat * 1e6
+        print(f"report column write + read, {label}: {elapsed:.1f} µs, {len(stored.encode()) / 1024:.1f} KB stored")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
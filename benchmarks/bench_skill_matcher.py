@@ -0,0 +1,91 @@
+"""
+Throughput of the local skill matcher (/api/match?mode=fast).
+
+Generates CVs and JD requirement sets from a shared skill vocabulary (with
+aliases on the CV side, e.g. "k8s" for "Kubernetes") and times matching every
+JD against every CV, both from raw sections and with the CV terms prebuilt.
+
+    python -m benchmarks.bench_skill_matcher [--cvs 200] [--jds 50] [--seed 0]
+"""
+import argparse
+import random
+import time
+
+from backend.services.skill_matcher import cv_terms, match_cv_locally, match_terms
+
+HARD_SKILLS = [
+    "Python", "Go", "Java", "TypeScript", "JavaScript", "C++", "C#", "Kubernetes", "Docker",
+    "PostgreSQL", "MongoDB", "Redis", "Kafka", "RabbitMQ", "AWS", "GCP", "Azure", "Terraform",
+    "FastAPI", "Django", "React", "Node.js", "GraphQL", "REST API", "CI/CD", "Linux",
+    "Machine Learning", "scikit-learn", "TensorFlow", "Elasticsearch", "Spark", "Airflow",
+]
+CV_SPELLINGS = {
+    "Kubernetes": "k8s", "PostgreSQL": "Postgres", "Go": "golang", "Node.js": "NodeJS",
+    "CI/CD": "CICD", "Machine Learning": "ML", "scikit-learn": "sklearn", "JavaScript": "JS",
+}
+SOFT_SKILLS = ["communication", "teamwork", "ownership", "mentoring", "problem solving", "leadership"]
+FILLER = "Built and maintained services, improved latency, worked with product and design teams."
+
+
+def _cv(rng: random.Random) -> dict[str, str]:
+    skills = rng.sample(HARD_SKILLS, rng.randint(6, 14))
+    spelled = [CV_SPELLINGS.get(s, s) if rng.random() < 0.5 else s for s in skills]
+    experience = "\n".join(
+        f"- {FILLER} Used {rng.choice(spelled)} and {rng.choice(spelled)} in production."
+        for _ in range(rng.randint(5, 15))
+    )
+    return {
+        "summary": f"Engineer with {rng.randint(2, 12)} years of experience. Strong {rng.choice(SOFT_SKILLS)}.",
+        "skills": ", ".join(spelled),
+        "experience": experience,
+    }
+
+
+def _jd(rng: random.Random) -> dict:
+    return {
+        "hard_skills": [f"Experience with {s}" if rng.random() < 0.3 else s for s in rng.sample(HARD_SKILLS, 8)],
+        "soft_skills": rng.sample(SOFT_SKILLS, 3),
+        "responsibilities": ["design services", "review code"],
+        "keywords": [s.lower() for s in rng.sample(HARD_SKILLS, 5)] + ["backend"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cvs", type=int, default=200)
+    parser.add_argument("--jds", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cvs = [_cv(rng) for _ in range(args.cvs)]
+    jds = [_jd(rng) for _ in range(args.jds)]
+    pairs = args.cvs * args.jds
+
+    started = time.perf_counter()
+    for cv in cvs:
+        for jd in jds:
+            match_cv_locally(cv, jd)
+    raw = time.perf_counter() - started
+
+    started = time.perf_counter()
+    terms = [cv_terms(cv) for cv in cvs]
+    build = time.perf_counter() - started
+    started = time.perf_counter()
+    scores = [match_terms(t, jd)["match_score"] for t in terms for jd in jds]
+    prebuilt = time.perf_counter() - started
+
+    print(f"{pairs} CV x JD pairs")
+    print(f"  from sections: {pairs / raw:10.0f} matches/s  ({raw / pairs * 1000:.3f} ms each)")
+    print(f"  prebuilt terms: {pairs / prebuilt:9.0f} matches/s  (+ {build / args.cvs * 1000:.3f} ms per CV to build)")
+    print(f"  score mean {sum(scores) / len(scores):.1f}, min {min(scores)}, max {max(scores)}")
+
+    sample = match_cv_locally(
+        {"skills": "k8s, Postgres, golang, CICD"},
+        {"hard_skills": ["Kubernetes", "PostgreSQL", "Go", "CI/CD", "Rust"]},
+    )
+    print("  alias check:", sample)
+
+
+if __name__ == "__main__":
+    main()
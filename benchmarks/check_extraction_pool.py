@@ -0,0 +1,94 @@
+"""
+ExtractionPool admission check: a job that times out keeps its slot until
+the worker running it is done, and the page ranges of a long PDF take slots
+of their own, so the queue-full bound (503) still holds.
+Fails (exit code 1) otherwise.
+
+Uses a one-slot pool (workers=0: one thread, max_queue=0) whose extraction
+sleeps longer than the timeout, then a two-process pool (max_queue=1) with a
+synthetic 50-page PDF.
+
+    python -m benchmarks.check_extraction_pool
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from backend.services.extraction_pool import ExtractionPool, ExtractionQueueFull, ExtractionTimeout
+from backend.services.parser import extract_text
+from benchmarks.bench_pdf_extraction import write_synthetic_pdf
+
+SLOW_SECONDS = 1.0
+TIMEOUT_SECONDS = 0.2
+
+
+def _slow_extract(path: str) -> str:
+    time.sleep(SLOW_SECONDS)
+    return f"text of {path}"
+
+
+class SlowPool(ExtractionPool):
+    async def _extract(self, path, calls):
+        return await self._run(calls, _slow_extract, path)
+
+
+async def _outcome(pool: ExtractionPool, path: str) -> str:
+    try:
+        await pool.extract(path)
+        return "ok"
+    except ExtractionTimeout:
+        return "timeout"
+    except ExtractionQueueFull:
+        return "queue full"
+
+
+async def _timeout_steps() -> list[tuple[str, str, str]]:
+    pool = SlowPool(workers=0, max_queue=0, timeout_seconds=TIMEOUT_SECONDS)
+    steps = [
+        ("slow job", "timeout", await _outcome(pool, "a.pdf")),
+        ("next job while the timed-out one still runs", "queue full", await _outcome(pool, "b.pdf")),
+    ]
+    await asyncio.sleep(SLOW_SECONDS)
+    pool.timeout_seconds = SLOW_SECONDS * 3
+    steps.append(("next job once the worker is free", "ok", await _outcome(pool, "c.pdf")))
+    steps.append(("slots after all jobs", "0", str(pool.stats()["in_flight"])))
+    pool.shutdown()
+    return steps
+
+
+async def _page_range_steps() -> list[tuple[str, str, str]]:
+    pool = ExtractionPool(workers=2, max_queue=1, timeout_seconds=60, parallel_pages=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        long_pdf, short_pdf = Path(tmp) / "long.pdf", Path(tmp) / "short.pdf"
+        write_synthetic_pdf(long_pdf, 50)
+        write_synthetic_pdf(short_pdf, 1)
+        long_job = asyncio.ensure_future(pool.extract(str(long_pdf)))
+        while pool.stats()["in_flight"] < 2 and not long_job.done():
+            await asyncio.sleep(0.01)
+        slots = str(pool.stats()["in_flight"])
+        short_job = asyncio.ensure_future(_outcome(pool, str(short_pdf)))
+        await asyncio.sleep(0)  # let it take the last slot
+        steps = [
+            ("slots of a long PDF on two workers", "2", slots),
+            ("job beyond workers + max_queue while its pages run", "queue full", await _outcome(pool, str(short_pdf))),
+            ("job within the bound", "ok", await short_job),
+        ]
+        same = await long_job == extract_text(str(long_pdf))
+        steps.append(("long PDF text", "same as sequential", "same as sequential" if same else "differs"))
+    steps.append(("slots after all jobs", "0", str(pool.stats()["in_flight"])))
+    pool.shutdown()
+    return steps
+
+
+async def main() -> int:
+    failed = False
+    for name, expected, got in await _timeout_steps() + await _page_range_steps():
+        failed = failed or got != expected
+        print(f"{'ok  ' if got == expected else 'FAIL'} {name}: {got} (expected {expected})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,98 @@
+"""
+Query-plan regression check for the hot lookups: runs EXPLAIN QUERY PLAN for
+each against a database created from the models and fails (exit code 1) if
+any of them scans a table or sorts in a temporary B-tree instead of using an
+index.
+
+    python -m benchmarks.check_query_plans
+"""
+import sys
+from datetime import datetime
+
+from sqlalchemy import create_engine, delete, func, select, tuple_, update
+from sqlalchemy.dialects import sqlite
+
+from backend.database import Base
+from backend.models.db_models import CV, CVSection, Interview, Message, Report
+from backend.services import repository
+
+# Same filters and order as the code paths named in the key
+HOT_QUERIES = {
+    "cv sections (get_cv, analyze, match, interview start)": select(CVSection).where(CVSection.cv_id == 1),
+    "transcript (finish_interview, load_messages)": (
+        select(Message).where(Message.interview_id == 1).order_by(Message.id)
+    ),
+    "last answer before a feedback placeholder (feedback_pipeline)": (
+        select(Message)
+        .where(Message.interview_id == 1, Message.role == "user", Message.id < 100)
+        .order_by(Message.id.desc())
+        .limit(1)
+    ),
+    "reports of an entity, newest first": (
+        select(Report)
+        .where(Report.entity_type == "cv", Report.entity_id == 1)
+        .order_by(Report.created_at.desc())
+    ),
+    "report page after a cursor (GET /api/reports)": (
+        repository.reports_newest_first("cv", 1, tuple_(Report.created_at, Report.id) < (datetime(2026, 1, 1), 50))
+        .limit(21)
+    ),
+    "latest report of an entity (GET /api/reports/latest)": (
+        repository.reports_newest_first("cv", 1).limit(1)
+    ),
+    "cached analysis (analyze, report_cache.lookup)": (
+        repository.reports_newest_first("cv", 1, Report.input_fingerprint == "0" * 64).limit(1)
+    ),
+    "cached match of a CV and JD (match, report_cache.lookup)": (
+        repository.reports_newest_first("match", 1, Report.input_fingerprint == "0" * 64, Report.jd_id == 2).limit(1)
+    ),
+    "reports of an edited CV (report_cache.invalidate)": (
+        update(Report)
+        .where(
+            Report.entity_type.in_(("cv", "match")), Report.entity_id == 1, Report.input_fingerprint.is_not(None)
+        )
+        .values(input_fingerprint=None)
+    ),
+    "reports of a deleted CV (CV delete)": (
+        delete(Report).where(Report.entity_type.in_(("cv", "match")), Report.entity_id == 1)
+    ),
+    "reports of an interview": select(Report).where(Report.interview_id == 1),
+    "interviews of a CV (CV delete)": select(Interview).where(Interview.cv_id == 1),
+    "CVs sharing a stored file (repository.release_file)": (
+        select(func.count()).select_from(CV).where(CV.file_path == "uploads/a.pdf")
+    ),
+}
+
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def query_plan(connection, query) -> list[str]:
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + compile_sql(query)).all()
+    return [row[-1] for row in rows]
+
+
+def problems(plan: list[str]) -> list[str]:
+    """Full table scans and sorts the index should have made unnecessary."""
+    return [
+        step for step in plan
+        if (step.startswith("SCAN ") and "USING" not in step) or "TEMP B-TREE" in step
+    ]
+
+
+def main() -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    failed = False
+    with engine.connect() as connection:
+        for name, query in HOT_QUERIES.items():
+            plan = query_plan(connection, query)
+            bad = problems(plan)
+            failed = failed or bool(bad)
+            print(f"{'FAIL' if bad else 'ok  '} {name}: {'; '.join(plan)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
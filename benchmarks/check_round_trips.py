@@ -0,0 +1,177 @@
+"""
+Database round trips per endpoint, checked against a budget: fails (exit
+code 1) if an endpoint issues more queries than listed in BUDGETS, e.g.
+after a change brings back a query per row.
+
+Runs the app in-process against a throwaway SQLite database and the local
+fake OpenAI server, with one CV, one JD and one interview; the job queue is
+stopped after setup, so async=true requests only enqueue. Counts every
+statement sent to the database while the request is handled.
+
+    python -m benchmarks.check_round_trips [--verbose]
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+_tmp = tempfile.mkdtemp(prefix="cv_bench_")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+_port = _free_port()
+os.environ.update({
+    "DATABASE_URL": f"sqlite+aiosqlite:///{_tmp}/bench.db",
+    "UPLOAD_DIR": f"{_tmp}/uploads",
+    "EMBEDDING_DIR": f"{_tmp}/embeddings",
+    "LLM_CACHE_BACKEND": "none",
+    "OPENAI_API_KEY": "fake",
+    "OPENAI_BASE_URL": f"http://127.0.0.1:{_port}/v1",
+    "JOB_WORKERS": "1",
+    # Keep idle queue polling out of the counts
+    "JOB_POLL_SECONDS": "3600",
+})
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from backend.database import engine, read_engine  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.services.job_queue import job_queue  # noqa: E402
+
+# Queries allowed per request; the comment is what they are
+BUDGETS = {
+    "GET /api/cv/{id}": 2,                        # CV, sections (selectinload)
+    "POST /api/cv/{id}/analyze": 3,               # sections, stored report lookup, insert report
+    "POST /api/cv/{id}/analyze?async=true&reuse=false": 2,  # CV id, insert job
+    "GET /api/jd/{id}": 1,                        # status and requirements
+    "POST /api/match": 4,                         # sections, JD, stored report lookup, insert report
+    "POST /api/match?async=true&reuse=false": 3,  # CV id, JD status, insert job
+    "POST /api/cv/{id}/analyze (stored)": 2,      # sections, stored report
+    "POST /api/match (stored)": 3,                # sections, JD, stored report
+    "GET /api/reports": 1,                        # one page
+    "GET /api/reports/latest": 1,                 # latest report
+    "GET /api/reports/{id}": 1,                   # report
+    "PUT /api/cv/{id}/sections": 4,               # CV id, delete, insert sections, invalidate reports
+    "POST /api/cv/{id}/resegment": 4,             # raw text, delete, insert sections, invalidate reports
+    "POST /api/interview/start": 4,               # sections, JD, insert interview, insert question
+    "POST /api/interview/{id}/message": 9,        # interview, 3 messages, index; record_evaluation: 4
+    "POST /api/interview/{id}/message?async=true": 2,  # question index, insert job
+    "GET /api/interview/{id}": 2,                 # interview, last messages
+    "GET /api/interview/{id}/feedback": 2,        # interview, transcript (selectinload)
+    "POST /api/interview/{id}/finish": 6,         # interview, transcript, weakest, strongest, status, report
+}
+
+
+class _Counter:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+def _start_fake_openai() -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_openai", "--port", str(_port), "--latency", "0"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{_port}/stats", timeout=0.5)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("fake OpenAI server did not start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verbose", action="store_true", help="Print the statements of each request")
+    args = parser.parse_args()
+
+    server = _start_fake_openai()
+    counter = _Counter()
+    try:
+        with TestClient(app) as client:
+            cv_text = b"Jane Doe\n\nSkills\nPython, FastAPI, Docker\n\nExperience\nBackend engineer, 2019-2024\n"
+            cv_id = client.post("/api/cv/upload", files={"file": ("cv.txt", cv_text, "text/plain")}).json()["cv_id"]
+            jd_id = client.post("/api/jd?wait=10", json={"text": "Backend developer: Python, Docker"}).json()["jd_id"]
+            session_id = client.post(
+                "/api/interview/start", json={"cv_id": cv_id, "jd_id": jd_id, "num_questions": 3}
+            ).json()["session_id"]
+            client.post(f"/api/interview/{session_id}/message", json={"answer": "warm-up"})
+            # Jobs queued by the async=true requests stay queued instead of adding to the counts
+            client.portal.call(job_queue.stop, 5)
+
+            for engine_ in {engine, read_engine}:
+                event.listen(engine_.sync_engine, "before_cursor_execute", counter)
+
+            requests = {
+                "GET /api/cv/{id}": ("GET", f"/api/cv/{cv_id}", None),
+                "POST /api/cv/{id}/analyze": ("POST", f"/api/cv/{cv_id}/analyze", None),
+                "POST /api/cv/{id}/analyze?async=true&reuse=false": (
+                    "POST", f"/api/cv/{cv_id}/analyze?async=true&reuse=false", None,
+                ),
+                "GET /api/jd/{id}": ("GET", f"/api/jd/{jd_id}", None),
+                "POST /api/match": ("POST", "/api/match", {"cv_id": cv_id, "jd_id": jd_id, "mode": "fast"}),
+                "POST /api/match?async=true&reuse=false": (
+                    "POST", "/api/match?async=true&reuse=false", {"cv_id": cv_id, "jd_id": jd_id, "mode": "fast"},
+                ),
+                "POST /api/cv/{id}/analyze (stored)": ("POST", f"/api/cv/{cv_id}/analyze", None),
+                "POST /api/match (stored)": (
+                    "POST", "/api/match", {"cv_id": cv_id, "jd_id": jd_id, "mode": "fast"},
+                ),
+                "GET /api/reports": ("GET", f"/api/reports?entity_type=cv&entity_id={cv_id}", None),
+                "GET /api/reports/latest": (
+                    "GET", f"/api/reports/latest?entity_type=match&entity_id={cv_id}&jd_id={jd_id}", None,
+                ),
+                "GET /api/reports/{id}": ("GET", "/api/reports/1", None),
+                "PUT /api/cv/{id}/sections": (
+                    "PUT", f"/api/cv/{cv_id}/sections",
+                    {"sections": [{"section_name": "skills", "content": "Python, FastAPI, Docker, Kubernetes"}]},
+                ),
+                "POST /api/cv/{id}/resegment": ("POST", f"/api/cv/{cv_id}/resegment", None),
+                "POST /api/interview/start": (
+                    "POST", "/api/interview/start", {"cv_id": cv_id, "jd_id": jd_id, "num_questions": 3},
+                ),
+                "POST /api/interview/{id}/message": (
+                    "POST", f"/api/interview/{session_id}/message", {"answer": "I built REST APIs"},
+                ),
+                "POST /api/interview/{id}/message?async=true": (
+                    "POST", f"/api/interview/{session_id}/message?async=true", {"answer": "queued"},
+                ),
+                "GET /api/interview/{id}": ("GET", f"/api/interview/{session_id}?messages=5", None),
+                "GET /api/interview/{id}/feedback": ("GET", f"/api/interview/{session_id}/feedback", None),
+                "POST /api/interview/{id}/finish": ("POST", f"/api/interview/{session_id}/finish", None),
+            }
+            failed = False
+            print(f"{'endpoint':<50} {'status':>6} {'queries':>8} {'budget':>7}")
+            for name, (method, url, body) in requests.items():
+                counter.statements.clear()
+                response = client.request(method, url, json=body)
+                count = len(counter.statements)
+                over = count > BUDGETS[name] or response.status_code >= 400
+                failed = failed or over
+                print(f"{name:<50} {response.status_code:>6} {count:>8} {BUDGETS[name]:>7}{'  FAIL' if over else ''}")
+                if args.verbose:
+                    for statement in counter.statements:
+                        print("    " + " ".join(statement.split())[:150])
+    finally:
+        server.kill()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
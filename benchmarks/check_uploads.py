@@ -0,0 +1,191 @@
+"""
+Upload regression checks: runs the app in-process against a throwaway SQLite
+database and fails (exit code 1) if any check below does not hold.
+
+    python -m benchmarks.check_uploads
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+_tmp = tempfile.mkdtemp(prefix="cv_bench_")
+os.environ.update({
+    "DATABASE_URL": f"sqlite+aiosqlite:///{_tmp}/bench.db",
+    "UPLOAD_DIR": f"{_tmp}/uploads",
+    "EMBEDDING_DIR": f"{_tmp}/embeddings",
+    "LLM_CACHE_BACKEND": "none",
+    "JOB_WORKERS": "1",
+    "JOB_POLL_SECONDS": "0.1",
+})
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import select, text  # noqa: E402
+
+from backend.database import AsyncSessionLocal  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.models.db_models import CV, Job  # noqa: E402
+from backend.services import repository  # noqa: E402
+from backend.services.segmenter import segment_cv  # noqa: E402
+from backend.utils.file_utils import settle_file, store_file  # noqa: E402
+
+CV_TEXT = "Jane Doe\njane@example.com\n\nSkills\nPython, FastAPI, Docker\n\nExperience\nBackend engineer, 2019-2024\n"
+EDITED = [{"section_name": "skills", "content": "Edited by hand"}]
+NOT_A_PDF = b"%PDF-1.4 truncated"
+
+
+def _sections(client: TestClient, cv_id: int) -> dict[str, str]:
+    sections = client.get(f"/api/cv/{cv_id}?fields=sections").json()["sections"]
+    return {s["section_name"]: s["content"] for s in sections}
+
+
+def _wait_job(client: TestClient, job_id: int) -> dict:
+    for _ in range(100):
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in ("succeeded", "failed", "dead"):
+            return job
+        time.sleep(0.1)
+    raise RuntimeError(f"job {job_id} did not finish")
+
+
+def _zip(name: str, data: bytes) -> dict:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr(name, data)
+    return {"file": ("cvs.zip", archive.getvalue(), "application/zip")}
+
+
+def check_clone_ignores_edits(client: TestClient) -> str | None:
+    """A re-upload of an edited CV's file gets freshly parsed sections, on every upload path."""
+    parsed = segment_cv(CV_TEXT)
+    files = {"file": ("cv.txt", CV_TEXT.encode(), "text/plain")}
+    first = client.post("/api/cv/upload", files=files).json()["cv_id"]
+    client.put(f"/api/cv/{first}/sections", json={"sections": EDITED}).raise_for_status()
+
+    second = client.post("/api/cv/upload", files=files).json()["cv_id"]
+    job = client.post("/api/cv/upload?async=true", files=files).json()
+    third = _wait_job(client, job["job_id"])["result"]["cv_id"]
+    events = client.post("/api/cv/batch", files=_zip("cv.txt", CV_TEXT.encode()))
+    fourth = next(e["cv_id"] for e in map(json.loads, events.text.splitlines()) if e["event"] == "file")
+
+    for label, cv_id in (("upload", second), ("async upload", third), ("batch", fourth)):
+        if _sections(client, cv_id) != parsed:
+            return f"{label} cloned the edited sections of CV {first}"
+    return None
+
+
+async def _file_path(cv_id: int) -> str:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(CV.file_path).where(CV.id == cv_id))
+
+
+async def _queue_upload_job(file_path: str) -> int:
+    """A cv_upload job that stays queued (run_after in an hour)."""
+    async with AsyncSessionLocal() as db:
+        job = Job(
+            kind="cv_upload", payload={"file_path": file_path, "content_hash": ""}, max_attempts=1,
+            run_after=datetime.now(timezone.utc) + timedelta(hours=1),
+        )
+        db.add(job)
+        await db.commit()
+        return job.id
+
+
+async def _finish_job(job_id: int, file_path: str) -> bool:
+    async with AsyncSessionLocal() as db:
+        job = await db.get(Job, job_id)
+        job.status = "failed"
+        await db.commit()
+        return await repository.release_file(db, file_path)
+
+
+def check_shared_files_survive(client: TestClient) -> str | None:
+    """A stored file is deleted only once no CV, queued upload job or in-flight upload refers to it."""
+    # In-flight upload in this process: a batch whose extraction fails must leave the file alone
+    path, _ = store_file(io.BytesIO(NOT_A_PDF), "cv.pdf")
+    client.post("/api/cv/batch", files=_zip("cv.pdf", NOT_A_PDF))
+    if not os.path.exists(path):
+        return "a failed batch deleted a file another upload still holds"
+    settle_file(path)
+    client.post("/api/cv/batch", files=_zip("cv.pdf", NOT_A_PDF))
+    if os.path.exists(path):
+        return "a failed batch left a file nothing refers to"
+
+    # Queued cv_upload job: deleting the CV must leave the shared file
+    files = {"file": ("shared.txt", CV_TEXT.encode() + b"shared", "text/plain")}
+    cv_id = client.post("/api/cv/upload", files=files).json()["cv_id"]
+    path = client.portal.call(_file_path, cv_id)
+    job_id = client.portal.call(_queue_upload_job, path)
+    client.delete(f"/api/cv/{cv_id}").raise_for_status()
+    if not os.path.exists(path):
+        return "deleting a CV removed a file a queued cv_upload job refers to"
+    if not client.portal.call(_finish_job, job_id, path) or os.path.exists(path):
+        return "the file was kept after its last reference went away"
+    return None
+
+
+def check_failed_upload_not_retried(client: TestClient) -> str | None:
+    """A failed cv_upload job has lost its file, so retrying it is refused."""
+    path, _ = store_file(io.BytesIO(CV_TEXT.encode() + b"retry"), "cv.txt")
+    job_id = client.portal.call(_queue_upload_job, path)
+    settle_file(path)
+    client.portal.call(_finish_job, job_id, path)
+    response = client.post(f"/api/jobs/{job_id}/retry")
+    if response.status_code != 409:
+        return f"retrying a failed cv_upload job returned {response.status_code}, expected 409"
+    return None
+
+
+async def _reject_sections(marker: str | None) -> None:
+    """Make inserting a CV section that contains `marker` fail (None drops the trigger)."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("DROP TRIGGER IF EXISTS reject_sections"))
+        if marker:
+            await db.execute(text(
+                "CREATE TRIGGER reject_sections BEFORE INSERT ON cv_sections"
+                f" WHEN NEW.content LIKE '%{marker}%' BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+            ))
+        await db.commit()
+
+
+def check_failed_batch_releases_files(client: TestClient) -> str | None:
+    """A batch whose insert fails leaves no stored file behind."""
+    data = CV_TEXT.replace("Docker", "Docker, reject-me").encode()
+    path, _ = store_file(io.BytesIO(data), "cv.txt")
+    settle_file(path)
+    client.portal.call(_reject_sections, "reject-me")
+    try:
+        client.post("/api/cv/batch", files=_zip("cv.txt", data))
+    except Exception:
+        pass  # the stream breaks off with the error
+    finally:
+        client.portal.call(_reject_sections, None)
+    if os.path.exists(path):
+        return "a batch that failed to commit left its stored file behind"
+    return None
+
+
+CHECKS = [
+    check_clone_ignores_edits,
+    check_shared_files_survive,
+    check_failed_upload_not_retried,
+    check_failed_batch_releases_files,
+]
+
+
+def main() -> None:
+    failed = False
+    with TestClient(app) as client:
+        for check in CHECKS:
+            problem = check(client)
+            failed = failed or problem is not None
+            print(f"{'FAIL' if problem else 'ok  '} {check.__name__}" + (f": {problem}" if problem else ""))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Local stand-in for the OpenAI chat completions API, for load tests.
+
+Answers with canned JSON shaped like what each of our prompts asks for, after a
+configurable latency. It can reject requests over a concurrency limit with 429
+(plus Retry-After) and fail a share of requests with 500, like the real API
+under load. Supports stream=True.
+
+    python -m benchmarks.fake_openai [--port 8001] [--latency 1.0] [--max-concurrent 8] [--error-rate 0.02]
+
+Point the backend at it with OPENAI_BASE_URL=http://127.0.0.1:8001/v1 (any OPENAI_API_KEY).
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def canned_content(messages: list[dict]) -> str:
+    system = messages[0]["content"] if messages else ""
+    if "career coach" in system:
+        body = {
+            "issues": [f"Issue {i}: missing metrics in experience" for i in range(5)],
+            "tips": [f"Tip {i}: quantify achievements" for i in range(5)],
+            "rewrites": [{"original": "Responsible for backend", "improved": "Built APIs serving 10k RPS"}],
+        }
+    elif "requirements analyst" in system:
+        body = {
+            "hard_skills": ["Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes"],
+            "soft_skills": ["communication", "ownership"],
+            "responsibilities": ["design services", "review code"],
+            "keywords": ["backend", "api", "microservices"],
+        }
+    elif "career advisor" in system:
+        body = {
+            "match_score": random.randint(40, 95),
+            "matched_skills": ["Python", "Docker"],
+            "missing_skills": ["Kubernetes"],
+            "recommendations": ["Mention container orchestration experience"],
+        }
+    elif "preparing a structured interview" in system:
+        body = {"questions": [
+            {"text": f"Question {i}?", "type": "technical", "category": "Python"} for i in range(10)
+        ]}
+    elif "evaluating a candidate" in system:
+        body = {
+            "feedback": "Relevant answer; add a concrete example.",
+            "score": random.randint(2, 5),
+            "criteria": {"relevance": 4, "clarity": 3, "structure": 3, "technical_depth": 3, "communication": 4},
+        }
+    else:
+        body = {
+            "strengths": ["Clear communication"],
+            "weaknesses": ["Few metrics"],
+            "recommendations": ["Practice STAR answers"],
+            "improved_answers": [],
+        }
+    return json.dumps(body)
+
+
+def create_app(
+    latency: float = 1.0,
+    jitter: float = 0.3,
+    max_concurrent: int = 0,
+    error_rate: float = 0.0,
+    chunk_chars: int = 8,
+) -> FastAPI:
+    app = FastAPI()
+    state = {"in_flight": 0, "requests": 0, "rejected": 0, "errors": 0}
+
+    @app.get("/stats")
+    async def stats():
+        return state
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        state["requests"] += 1
+        if max_concurrent and state["in_flight"] >= max_concurrent:
+            state["rejected"] += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": "0.5"},
+            )
+        if random.random() < error_rate:
+            state["errors"] += 1
+            return JSONResponse({"error": {"message": "Internal error", "type": "server_error"}}, status_code=500)
+
+        content = canned_content(body.get("messages", []))
+        model = body.get("model", "gpt-4o")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        prompt_tokens = sum(len(m.get("content", "")) for m in body.get("messages", [])) // 4
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": prompt_tokens + len(content) // 4,
+        }
+        delay = max(0.0, random.gauss(latency, jitter * latency))
+
+        if body.get("stream"):
+            async def events():
+                state["in_flight"] += 1
+                try:
+                    chunks = [content[i:i + chunk_chars] for i in range(0, len(content), chunk_chars)]
+                    for text in chunks:
+                        await asyncio.sleep(delay / len(chunks))
+                        chunk = {
+                            "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                            "model": model,
+                            "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}],
+                        }
+                        yield f"data: {json.dumps(chunk)}\n\n"
+                    final = {
+                        "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                        "model": model, "choices": [], "usage": usage,
+                    }
+                    yield f"data: {json.dumps(final)}\n\n"
+                    yield "data: [DONE]\n\n"
+                finally:
+                    state["in_flight"] -= 1
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        state["in_flight"] += 1
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            state["in_flight"] -= 1
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=1.0, help="mean seconds per completion")
+    parser.add_argument("--jitter", type=float, default=0.3, help="latency stddev as a fraction of the mean")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="429 above this many in-flight requests (0 = off)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    args = parser.parse_args()
+
+    app = create_app(args.latency, args.jitter, args.max_concurrent, args.error_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
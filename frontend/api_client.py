@@ -1,4 +1,7 @@
+import json
 import os
+from collections.abc import Iterator
+
 import requests
 
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
@@ -18,14 +21,33 @@ def upload_cv(file_bytes: bytes, filename: str) -> dict:
     return resp.json()
 
 
-def get_cv(cv_id: int) -> dict:
-    resp = requests.get(_url(f"/api/cv/{cv_id}"), timeout=30)
+def get_cv(cv_id: int, fields: str | None = None) -> dict:
+    params = {"fields": fields} if fields else None
+    resp = requests.get(_url(f"/api/cv/{cv_id}"), params=params, timeout=30)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def analyze_cv(cv_id: int, reuse: bool = True) -> dict:
+    resp = requests.post(_url(f"/api/cv/{cv_id}/analyze"), params={"reuse": reuse}, timeout=60)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def analyze_cv_stream(cv_id: int, reuse: bool = True) -> Iterator[tuple[str, dict]]:
+    """Yield (event, data) pairs from /analyze/stream as the model produces them."""
+    return _stream_events(_url(f"/api/cv/{cv_id}/analyze/stream"), params={"reuse": reuse})
+
+
+def update_sections(cv_id: int, sections: dict[str, str]) -> dict:
+    payload = {"sections": [{"section_name": name, "content": content} for name, content in sections.items()]}
+    resp = requests.put(_url(f"/api/cv/{cv_id}/sections"), json=payload, timeout=30)
     resp.raise_for_status()
     return resp.json()
 
 
-def analyze_cv(cv_id: int) -> dict:
-    resp = requests.post(_url(f"/api/cv/{cv_id}/analyze"), timeout=60)
+def resegment_cv(cv_id: int) -> dict:
+    resp = requests.post(_url(f"/api/cv/{cv_id}/resegment"), timeout=30)
     resp.raise_for_status()
     return resp.json()
 
@@ -36,22 +58,56 @@ def delete_cv(cv_id: int) -> dict:
     return resp.json()
 
 
+def get_latest_report(entity_type: str, entity_id: int, jd_id: int | None = None) -> dict | None:
+    """Newest stored report of a CV or interview, None if there is none."""
+    params = {"entity_type": entity_type, "entity_id": entity_id}
+    if jd_id is not None:
+        params["jd_id"] = jd_id
+    resp = requests.get(_url("/api/reports/latest"), params=params, timeout=30)
+    if resp.status_code == 404:
+        return None
+    resp.raise_for_status()
+    return resp.json()
+
+
 def create_jd(text: str) -> dict:
-    resp = requests.post(_url("/api/jd"), json={"text": text}, timeout=60)
+    """Returns right away with status=pending; poll get_jd() for the requirements."""
+    resp = requests.post(_url("/api/jd"), json={"text": text}, timeout=30)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def get_jd(jd_id: int) -> dict:
+    resp = requests.get(_url(f"/api/jd/{jd_id}"), timeout=30)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def get_job(job_id: int, wait: float = 0) -> dict:
+    resp = requests.get(_url(f"/api/jobs/{job_id}"), params={"wait": wait}, timeout=wait + 30)
     resp.raise_for_status()
     return resp.json()
 
 
-def match_cv_jd(cv_id: int, jd_id: int) -> dict:
+def match_cv_jd(
+    cv_id: int, jd_id: int, mode: str = "full", llm_recommendations: bool = False, reuse: bool = True
+) -> dict:
     resp = requests.post(
         _url("/api/match"),
-        json={"cv_id": cv_id, "jd_id": jd_id},
+        params={"reuse": reuse},
+        json={"cv_id": cv_id, "jd_id": jd_id, "mode": mode, "llm_recommendations": llm_recommendations},
         timeout=60,
     )
     resp.raise_for_status()
     return resp.json()
 
 
+def get_top_candidates(jd_id: int, k: int = 10, method: str = "bm25") -> dict:
+    resp = requests.get(_url(f"/api/jd/{jd_id}/top-candidates"), params={"k": k, "method": method}, timeout=30)
+    resp.raise_for_status()
+    return resp.json()
+
+
 def start_interview(cv_id: int, jd_id: int | None, company_info: str | None, level: str, num_questions: int) -> dict:
     payload = {
         "cv_id": cv_id,
@@ -65,9 +121,10 @@ def start_interview(cv_id: int, jd_id: int | None, company_info: str | None, lev
     return resp.json()
 
 
-def send_interview_message(session_id: int, answer: str) -> dict:
+def send_interview_message(session_id: int, answer: str, pipelined: bool = False) -> dict:
     resp = requests.post(
         _url(f"/api/interview/{session_id}/message"),
+        params={"pipelined": "true"} if pipelined else None,
         json={"answer": answer},
         timeout=60,
     )
@@ -75,12 +132,40 @@ def send_interview_message(session_id: int, answer: str) -> dict:
     return resp.json()
 
 
+def get_interview_feedback(session_id: int, wait: float = 0) -> dict:
+    resp = requests.get(
+        _url(f"/api/interview/{session_id}/feedback"),
+        params={"wait": wait},
+        timeout=wait + 30,
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
 def finish_interview(session_id: int) -> dict:
     resp = requests.post(_url(f"/api/interview/{session_id}/finish"), timeout=90)
     resp.raise_for_status()
     return resp.json()
 
 
+def finish_interview_stream(session_id: int) -> Iterator[tuple[str, dict]]:
+    return _stream_events(_url(f"/api/interview/{session_id}/finish/stream"))
+
+
+def _stream_events(url: str, params: dict | None = None) -> Iterator[tuple[str, dict]]:
+    # The read timeout applies between chunks, not to the whole response
+    with requests.post(url, params=params, stream=True, timeout=(10, 60)) as resp:
+        resp.raise_for_status()
+        resp.encoding = "utf-8"
+        event = "message"
+        for line in resp.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                yield event, json.loads(line[len("data:"):])
+                event = "message"
+
+
 def _guess_mime(filename: str) -> str:
     ext = filename.lower().rsplit(".", 1)[-1]
     return {
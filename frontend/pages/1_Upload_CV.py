@@ -3,7 +3,7 @@ import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from frontend.api_client import upload_cv, get_cv, delete_cv
+from frontend.api_client import upload_cv, get_cv, delete_cv, resegment_cv, update_sections
 
 st.set_page_config(page_title="Upload CV", page_icon="📤", layout="wide")
 st.title("📤 Upload Your CV")
@@ -35,19 +35,29 @@ if uploaded_file is not None and "cv_id" not in st.session_state:
             cv_id = result["cv_id"]
             st.session_state["cv_id"] = cv_id
 
-            # Fetch sections
-            cv_data = get_cv(cv_id)
+            # Fetch sections; the raw text is fetched only if the user opens it
+            cv_data = get_cv(cv_id, fields="sections")
             st.session_state["cv_sections"] = cv_data["sections"]
-            st.session_state["cv_raw_text"] = cv_data["raw_text"]
 
             st.success(f"CV uploaded successfully! (ID: {cv_id})")
         except Exception as e:
             st.error(f"Upload failed: {e}")
             st.stop()
 
+
+def _sections_changed(result: dict) -> None:
+    """New sections: stored analyses no longer apply, reset the editors."""
+    st.session_state["cv_sections"] = result["sections"]
+    st.session_state.pop("cv_analysis", None)
+    for key in [k for k in st.session_state if k.startswith("section_")]:
+        del st.session_state[key]
+    st.rerun()
+
+
 # Display sections
 if "cv_sections" in st.session_state:
     sections = st.session_state["cv_sections"]
+    edited = {}
     st.markdown("---")
     st.subheader("Detected Sections")
 
@@ -71,10 +81,29 @@ if "cv_sections" in st.session_state:
             col = cols[i % 2]
             with col:
                 with st.expander(f"{icon} {section['section_name'].capitalize()}", expanded=False):
-                    st.text(section["content"])
+                    edited[section["section_name"]] = st.text_area(
+                        "Content", section["content"], key=f"section_{section['section_name']}",
+                        height=200, label_visibility="collapsed",
+                    )
+
+    save_col, resegment_col = st.columns(2)
+    unchanged = edited == {s["section_name"]: s["content"] for s in sections}
+    if save_col.button("Save section edits", disabled=unchanged):
+        try:
+            _sections_changed(update_sections(st.session_state.cv_id, edited))
+        except Exception as e:
+            st.error(f"Saving failed: {e}")
+    if resegment_col.button("Detect sections again", help="Discards manual edits"):
+        try:
+            _sections_changed(resegment_cv(st.session_state.cv_id))
+        except Exception as e:
+            st.error(f"Re-segmenting failed: {e}")
 
     st.markdown("---")
     st.info("Proceed to **CV Analysis** in the sidebar for AI feedback on your resume.")
 
     with st.expander("View raw extracted text", expanded=False):
-        st.text(st.session_state.get("cv_raw_text", ""))
+        if "cv_raw_text" not in st.session_state and st.button("Load raw text"):
+            st.session_state["cv_raw_text"] = get_cv(st.session_state.cv_id, fields="raw_text")["raw_text"]
+        if "cv_raw_text" in st.session_state:
+            st.text(st.session_state["cv_raw_text"])
@@ -3,7 +3,7 @@ import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from frontend.api_client import analyze_cv
+from frontend.api_client import analyze_cv_stream, get_latest_report
 
 st.set_page_config(page_title="CV Analysis", page_icon="🔍", layout="wide")
 st.title("🔍 CV Analysis")
@@ -14,18 +14,46 @@ if "cv_id" not in st.session_state:
 
 st.markdown(f"Analyzing CV (ID: **{st.session_state['cv_id']}**)")
 
+# Show the last analysis of this CV instead of asking for a new one
+if "cv_analysis" not in st.session_state and st.session_state.get("cv_analysis_checked") != st.session_state["cv_id"]:
+    st.session_state["cv_analysis_checked"] = st.session_state["cv_id"]
+    try:
+        latest = get_latest_report("cv", st.session_state["cv_id"])
+    except Exception:
+        latest = None
+    if latest:
+        st.session_state["cv_analysis"] = latest["report"]
+        st.caption(f"Showing the analysis from {latest['created_at'][:16].replace('T', ' ')}")
+
 if "cv_analysis" not in st.session_state:
     if st.button("Run AI Analysis", type="primary"):
-        with st.spinner("Analyzing your CV with AI... (this may take 20-40 seconds)"):
-            try:
-                result = analyze_cv(st.session_state["cv_id"])
-                st.session_state["cv_analysis"] = result
-                st.rerun()
-            except Exception as e:
-                st.error(f"Analysis failed: {e}")
+        st.caption("Results appear as the AI writes them...")
+        live_col1, live_col2 = st.columns(2)
+        boxes = {"issues": live_col1.empty(), "tips": live_col2.empty()}
+        live = {"issues": [], "tips": []}
+        try:
+            # A stored analysis of the same sections comes back at once; Re-run asks for a new one
+            reuse = st.session_state.pop("cv_analysis_reuse", True)
+            for event, data in analyze_cv_stream(st.session_state["cv_id"], reuse=reuse):
+                if event == "item" and data["key"] in live:
+                    live[data["key"]].append(data["value"])
+                    with boxes[data["key"]].container():
+                        for text in live[data["key"]]:
+                            if data["key"] == "issues":
+                                st.error(f"• {text}")
+                            else:
+                                st.success(f"• {text}")
+                elif event == "done":
+                    st.session_state["cv_analysis"] = data
+                    st.rerun()
+                elif event == "error":
+                    st.error(data["detail"])
+        except Exception as e:
+            st.error(f"Analysis failed: {e}")
 else:
     if st.button("Re-run Analysis", type="secondary"):
         del st.session_state["cv_analysis"]
+        st.session_state["cv_analysis_reuse"] = False
         st.rerun()
 
 if "cv_analysis" in st.session_state:
@@ -3,7 +3,7 @@ import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from frontend.api_client import create_jd, match_cv_jd
+from frontend.api_client import create_jd, get_jd, get_job, get_top_candidates, match_cv_jd
 
 st.set_page_config(page_title="JD Match", page_icon="🎯", layout="wide")
 st.title("🎯 Job Description Matching")
@@ -29,8 +29,14 @@ if submit_jd and jd_text.strip():
     with st.spinner("Extracting requirements from JD..."):
         try:
             jd_result = create_jd(jd_text)
-            st.session_state["jd_id"] = jd_result["jd_id"]
-            st.session_state["jd_requirements"] = jd_result["extracted_requirements"]
+            job = get_job(jd_result["job_id"], wait=25)
+            while job["status"] in ("queued", "running"):
+                job = get_job(jd_result["job_id"], wait=25)
+            if job["status"] in ("failed", "dead"):
+                raise RuntimeError(job["error"])
+            jd = get_jd(jd_result["jd_id"])
+            st.session_state["jd_id"] = jd["jd_id"]
+            st.session_state["jd_requirements"] = jd["extracted_requirements"]
             st.session_state.pop("match_result", None)
             st.rerun()
         except Exception as e:
@@ -63,10 +69,27 @@ if "jd_requirements" in st.session_state:
 
     st.markdown("---")
 
+    col_mode, col_recs = st.columns(2)
+    with col_mode:
+        mode = st.radio(
+            "Matching mode",
+            ["full", "fast"],
+            format_func=lambda m: "Full (AI)" if m == "full" else "Fast (local skill matching)",
+            horizontal=True,
+        )
+    with col_recs:
+        llm_recommendations = st.checkbox(
+            "AI recommendations", value=True, disabled=mode == "full",
+            help="Fast mode only: generate the recommendations with AI instead of templates",
+        )
+
     if st.button("Run CV vs JD Match", type="primary"):
         with st.spinner("Comparing your CV to the job description..."):
             try:
-                match = match_cv_jd(st.session_state["cv_id"], st.session_state["jd_id"])
+                match = match_cv_jd(
+                    st.session_state["cv_id"], st.session_state["jd_id"],
+                    mode=mode, llm_recommendations=mode == "fast" and llm_recommendations,
+                )
                 st.session_state["match_result"] = match
                 st.rerun()
             except Exception as e:
@@ -96,6 +119,8 @@ if "match_result" in st.session_state:
             st.warning("Moderate match. Consider adding missing skills.")
         else:
             st.error("Low match. Significant gaps found — see recommendations below.")
+        if match.get("semantic_score") is not None:
+            st.caption(f"Semantic similarity to the job text: {match['semantic_score']}%")
 
     col1, col2 = st.columns(2)
     with col1:
@@ -119,3 +144,26 @@ if "match_result" in st.session_state:
 
     st.markdown("---")
     st.info("Proceed to **Interview** to practice a mock interview for this role.")
+
+if "jd_id" in st.session_state:
+    with st.expander("🏆 Top stored CVs for this job"):
+        k = st.slider("Candidates", 5, 50, 10, step=5)
+        method = st.radio(
+            "Ranking",
+            ["bm25", "semantic"],
+            format_func=lambda m: "Skill keywords (BM25)" if m == "bm25" else "Semantic similarity",
+            horizontal=True,
+        )
+        if st.button("Rank stored CVs"):
+            try:
+                ranking = get_top_candidates(st.session_state["jd_id"], k, method)
+                st.caption(f"{ranking['indexed_cvs']} CVs ranked in {ranking['took_ms']} ms")
+                for i, candidate in enumerate(ranking["candidates"], 1):
+                    section = f" · {candidate['best_section']}" if candidate.get("best_section") else ""
+                    st.markdown(
+                        f"**{i}. CV #{candidate['cv_id']}** — score {candidate['score']:.2f}{section}  \n"
+                        f"✅ {', '.join(candidate['matched_skills']) or '—'}  \n"
+                        f"❌ {', '.join(candidate['missing_skills']) or '—'}"
+                    )
+            except Exception as e:
+                st.error(f"Ranking failed: {e}")
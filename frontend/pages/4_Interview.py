@@ -3,7 +3,12 @@ import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from frontend.api_client import start_interview, send_interview_message, finish_interview
+from frontend.api_client import (
+    start_interview,
+    send_interview_message,
+    get_interview_feedback,
+    finish_interview_stream,
+)
 
 st.set_page_config(page_title="Interview", page_icon="🎤", layout="wide")
 st.title("🎤 Mock Interview Practice")
@@ -41,6 +46,14 @@ def _render_final_report(report: dict):
                 st.metric(label, f"{score}/5")
                 st.progress(score / 5)
 
+    categories = report.get("category_scores", {})
+    if categories:
+        st.subheader("Scores by Category")
+        cols = st.columns(min(len(categories), 5))
+        for i, (category, score) in enumerate(categories.items()):
+            with cols[i % len(cols)]:
+                st.metric(category, f"{score}/5")
+
     col1, col2 = st.columns(2)
     with col1:
         strengths = report.get("strengths", [])
@@ -145,12 +158,29 @@ st.markdown(f"**Question {q_num} of {total_q}**")
 progress_pct = (q_num - 1) / total_q if total_q > 0 else 0
 st.progress(progress_pct)
 
+# Fill in feedback that was still being evaluated on the last rerun
+if any(msg.get("pending") for msg in messages):
+    try:
+        ready = {
+            item["message_id"]: item["feedback"]
+            for item in get_interview_feedback(session_id)["items"]
+            if not item["pending"]
+        }
+        for msg in messages:
+            if msg.get("pending") and msg["message_id"] in ready:
+                msg["content"] = f"[Feedback] {ready[msg['message_id']]}"
+                msg["pending"] = False
+    except Exception:
+        pass
+
 # Display chat history
 for msg in messages:
     with st.chat_message(msg["role"]):
         content = msg["content"]
         # Distinguish feedback from questions
-        if content.startswith("[Feedback]"):
+        if msg.get("pending"):
+            st.markdown("*Evaluating your answer...*")
+        elif content.startswith("[Feedback]"):
             st.markdown(f"*{content.replace('[Feedback] ', '')}*")
         else:
             st.markdown(content)
@@ -164,12 +194,17 @@ if not is_last:
         messages.append({"role": "user", "content": answer})
         st.session_state["interview_messages"] = messages
 
-        with st.spinner("Getting feedback..."):
+        with st.spinner("Sending your answer..."):
             try:
-                resp = send_interview_message(session_id, answer)
+                # Feedback is evaluated in the background and picked up on a later rerun
+                resp = send_interview_message(session_id, answer, pipelined=True)
 
-                feedback = resp["feedback"]
-                messages.append({"role": "assistant", "content": f"[Feedback] {feedback}"})
+                messages.append({
+                    "role": "assistant",
+                    "content": "[Feedback] ",
+                    "message_id": resp["feedback_message_id"],
+                    "pending": True,
+                })
 
                 if resp["is_last"]:
                     st.session_state["interview_is_last"] = True
@@ -186,12 +221,33 @@ if not is_last:
                 st.error(f"Error: {e}")
 else:
     st.success("All questions answered! Click below to get your final report.")
+    if any(msg.get("pending") for msg in messages) and st.button("Refresh feedback"):
+        st.rerun()
     if st.button("Get Final Report", type="primary"):
-        with st.spinner("Generating your final interview report..."):
-            try:
-                result = finish_interview(session_id)
-                st.session_state["final_report"] = result["report"]
-                st.session_state["interview_finished"] = True
-                st.rerun()
-            except Exception as e:
-                st.error(f"Failed to generate report: {e}")
+        st.caption("Generating your final interview report...")
+        preview = st.empty()
+        partial: dict = {}
+        try:
+            for event, data in finish_interview_stream(session_id):
+                if event == "done":
+                    st.session_state["final_report"] = data["report"]
+                    st.session_state["interview_finished"] = True
+                    st.rerun()
+                elif event == "error":
+                    st.error(data["detail"])
+                elif event in ("field", "item"):
+                    if event == "field":
+                        partial[data["key"]] = data["value"]
+                    else:
+                        partial.setdefault(data["key"], []).append(data["value"])
+                    with preview.container():
+                        if "overall_score" in partial:
+                            st.metric("Overall score", f"{float(partial['overall_score']):.1f} / 5.0")
+                        for s in partial.get("strengths", []):
+                            st.success(f"• {s}")
+                        for w in partial.get("weaknesses", []):
+                            st.warning(f"• {w}")
+                        for rec in partial.get("recommendations", []):
+                            st.info(f"→ {rec}")
+        except Exception as e:
+            st.error(f"Failed to generate report: {e}")